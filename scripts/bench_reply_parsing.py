@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark parsing of chat-completions replies into ``TriageOutput``.
+
+Compares the previous reply path (``json.loads`` of the whole response, dict lookup,
+regex / ``find``-``rfind`` extraction, then validation) with the current one (a small
+pydantic envelope validated from the response bytes, a balanced-brace scan, and the
+object slice validated directly).
+
+Usage:
+    python scripts/bench_reply_parsing.py
+    python scripts/bench_reply_parsing.py --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from triage_assistant.adapters.chat_completions import (
+    get_chat_completion_content,
+    json_object_spans,
+)
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.schema import TriageOutput
+
+_RESULT = {"type": "bug", "priority": "p1", "labels": ["crash"], "rationale": "Crash on save."}
+
+
+def _legacy_extract(text: str) -> str:
+    fenced = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
+    if fenced:
+        return fenced.group(1)
+    start = text.find("{")
+    end = text.rfind("}")
+    return text[start : end + 1]
+
+
+def _legacy(body: bytes) -> TriageOutput:
+    content = get_chat_completion_content(json.loads(body))
+    return TriageOutput.model_validate_json(_legacy_extract(content))
+
+
+def _current(adapter: OpenAICompatibleAdapter) -> Callable[[bytes], TriageOutput]:
+    def parse(body: bytes) -> TriageOutput:
+        return adapter._parse_content(adapter._reply_content(body))
+
+    return parse
+
+
+def _response(content: str, *, padding: int = 0) -> bytes:
+    data: dict[str, Any] = {
+        "id": "chatcmpl-1",
+        "model": "m",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+    if padding:
+        # Providers attach logprobs / filter results that the adapters never read.
+        data["choices"][0]["logprobs"] = {"content": [{"token": "x", "logprob": -0.1}] * padding}
+    return json.dumps(data).encode()
+
+
+def _cases() -> dict[str, bytes]:
+    result = json.dumps(_RESULT)
+    long_rationale = json.dumps({**_RESULT, "rationale": "Stack trace: " + "frame; " * 20_000})
+    commentary = "Let me think about this issue step by step. " * 2_000
+    return {
+        "plain object": _response(result),
+        "fenced object": _response(f"```json\n{result}\n```"),
+        "long rationale (160 KB)": _response(f"```json\n{long_rationale}\n```"),
+        "long commentary before fence": _response(f"{commentary}\n```json\n{result}\n```"),
+        "large envelope (logprobs)": _response(result, padding=5_000),
+    }
+
+
+def _time(parse: Callable[[bytes], TriageOutput], body: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(body)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    current = _current(OpenAICompatibleAdapter(base_url="http://unused", api_key="k", model="m"))
+    print(f"{'case':32} {'legacy':>12} {'current':>12} {'speedup':>8}")
+    for name, body in _cases().items():
+        assert _legacy(body) == current(body)
+        old = _time(_legacy, body, args.repeat)
+        new = _time(current, body, args.repeat)
+        print(f"{name:32} {old * 1e6:10.1f}us {new * 1e6:10.1f}us {old / new:7.1f}x")
+    # Sanity check: the scanner finds the same object as the legacy extractor.
+    assert next(json_object_spans(json.dumps(_RESULT))) == (0, len(json.dumps(_RESULT)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
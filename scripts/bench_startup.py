@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark CLI cold start with ``python -X importtime`` and enforce a budget.
+
+Runs ``triage-assistant triage --adapter dummy`` (and ``schema``) in fresh interpreters
+and reports the import time the package adds on top of a bare interpreter, using the
+median of several runs. Fails when the dummy path exceeds ``--budget-ms`` or imports a
+module it should not need (httpx, rich, sqlite3, the hosted adapters).
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 9 --budget-ms 250 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Modules the offline path must not import: they only matter for hosted adapters,
+# the response cache or error rendering.
+FORBIDDEN = (
+    "httpx",
+    "rich",
+    "sqlite3",
+    "triage_assistant.adapters.chat_completions",
+    "triage_assistant.adapters.github_models",
+    "triage_assistant.adapters.foundry",
+    "triage_assistant.adapters.openai_compatible",
+    "triage_assistant.server",
+)
+
+_RUN_CLI = (
+    "import sys; from triage_assistant.cli import app; "
+    "sys.argv = ['triage-assistant', *sys.argv[1:]]; app()"
+)
+SCENARIOS = {
+    "triage --adapter dummy": ["triage", "--title", "Crash on save", "--adapter", "dummy"],
+    "schema": ["schema", "--no-pretty"],
+}
+
+
+def import_times(args: list[str]) -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for one fresh interpreter."""
+    code = _RUN_CLI if args else "pass"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"Command failed ({proc.returncode}): {args}\n{proc.stderr}")
+    times: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def added_ms(times: dict[str, tuple[int, int]], baseline: set[str]) -> float:
+    return sum(s for name, (s, _) in times.items() if name not in baseline) / 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=250.0,
+        help="Max median import time the dummy triage path may add to a bare interpreter.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports.")
+    args = parser.parse_args()
+
+    baseline = set(import_times([]))
+    failures: list[str] = []
+    for label, cli_args in SCENARIOS.items():
+        runs = [import_times(cli_args) for _ in range(args.runs)]
+        median = statistics.median(added_ms(times, baseline) for times in runs)
+        print(f"{label:28} {median:8.1f} ms added import time (median of {args.runs})")
+
+        last = runs[-1]
+        slowest = sorted(
+            (item for item in last.items() if item[0] not in baseline),
+            key=lambda item: item[1][0],
+            reverse=True,
+        )
+        for name, (self_us, _) in slowest[: args.top]:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+        unexpected = sorted(
+            {name for name in last if name in FORBIDDEN}
+            | {name.split(".")[0] for name in last if name.split(".")[0] in FORBIDDEN}
+        )
+        if unexpected:
+            failures.append(f"{label}: imported {', '.join(unexpected)}")
+        if label.endswith("dummy") and median > args.budget_ms:
+            failures.append(f"{label}: {median:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""Minimal HTTP/1.1 plumbing for the bundled asyncio servers (``serve`` and the mock provider).
+
+Only what those servers need: one request at a time per keep-alive connection, bodies
+sized by ``Content-Length`` (no chunked requests) and JSON responses. Anything fancier
+belongs behind a real web server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Content Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """A request that cannot be served; answered with ``status`` and the connection closed."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+async def read_request(reader: asyncio.StreamReader, *, max_body: int) -> Request | None:
+    """Read the next request, or return ``None`` once the client has gone away.
+
+    Raises:
+        HttpError: If the request is malformed or its body is larger than ``max_body``.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError as e:
+        raise HttpError(400, "Request headers are too large.") from e
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError as e:
+        raise HttpError(400, "Malformed request line.") from e
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(400, "Chunked request bodies are not supported; send Content-Length.")
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError as e:
+        raise HttpError(400, "Invalid Content-Length.") from e
+    if length < 0 or length > max_body:
+        raise HttpError(413, f"Request body is larger than {max_body} bytes.")
+    try:
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+    return Request(method.upper(), target.split("?", 1)[0], headers, body)
+
+
+def response_head(
+    status: int,
+    *,
+    content_type: str = "application/json",
+    length: int | None = None,
+    headers: dict[str, str] | None = None,
+) -> bytes:
+    """Status line and headers; ``length=None`` announces a chunked body."""
+    reason = _REASONS.get(status, "Server Error" if status >= 500 else "Error")
+    lines = [f"HTTP/1.1 {status} {reason}", f"Content-Type: {content_type}"]
+    if length is None:
+        lines.append("Transfer-Encoding: chunked")
+    else:
+        lines.append(f"Content-Length: {length}")
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    headers: dict[str, str] | None = None,
+) -> None:
+    writer.write(response_head(status, length=len(body), headers=headers) + body)
+    await writer.drain()
+
+
+def json_bytes(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def error_body(message: str, *, kind: str | None = None) -> bytes:
+    error: dict[str, str] = {"message": message}
+    if kind is not None:
+        error["type"] = kind
+    return json_bytes({"error": error})
@@ -7,18 +7,84 @@ The workshop encourages using:
 - Microsoft Foundry (Azure AI inference endpoints)
 
 A deterministic offline baseline (DummyAdapter) is included for tests and bootstrapping.
+
+The names below are imported on first access, so ``import triage_assistant.adapters.dummy``
+does not pull in httpx and the hosted adapters. See ``registry.py`` for selecting adapters
+by name.
 """
 
-from .chat_completions import ChatCompletionsError
-from .dummy import DummyAdapter
-from .foundry import FoundryModelInferenceAdapter
-from .github_models import GitHubModelsAdapter
-from .openai_compatible import OpenAICompatibleAdapter
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import CachedAdapter, ResponseCache
+    from .cascade import CascadeAdapter
+    from .chat_completions import RetryPolicy
+    from .dummy import DummyAdapter, TriageColumns
+    from .errors import ChatCompletionsError
+    from .failover import CircuitBreaker, FailoverAdapter
+    from .foundry import FoundryModelInferenceAdapter
+    from .github_models import GitHubModelsAdapter
+    from .hedging import HedgedAdapter
+    from .limiter import AdaptiveLimiter
+    from .openai_compatible import OpenAICompatibleAdapter
+    from .rules import RulesError, RuleSet, RulesFile, ScanWindow, load_rules
+
+_EXPORTS = {
+    "AdaptiveLimiter": "limiter",
+    "CachedAdapter": "cache",
+    "CascadeAdapter": "cascade",
+    "ChatCompletionsError": "errors",
+    "CircuitBreaker": "failover",
+    "DummyAdapter": "dummy",
+    "FailoverAdapter": "failover",
+    "FoundryModelInferenceAdapter": "foundry",
+    "GitHubModelsAdapter": "github_models",
+    "HedgedAdapter": "hedging",
+    "OpenAICompatibleAdapter": "openai_compatible",
+    "ResponseCache": "cache",
+    "RetryPolicy": "chat_completions",
+    "RuleSet": "rules",
+    "RulesError": "rules",
+    "RulesFile": "rules",
+    "ScanWindow": "rules",
+    "TriageColumns": "dummy",
+    "load_rules": "rules",
+}
 
 __all__ = [
+    "AdaptiveLimiter",
+    "CachedAdapter",
+    "CascadeAdapter",
     "ChatCompletionsError",
+    "CircuitBreaker",
     "DummyAdapter",
+    "FailoverAdapter",
     "FoundryModelInferenceAdapter",
     "GitHubModelsAdapter",
+    "HedgedAdapter",
     "OpenAICompatibleAdapter",
+    "ResponseCache",
+    "RetryPolicy",
+    "RuleSet",
+    "RulesError",
+    "RulesFile",
+    "ScanWindow",
+    "TriageColumns",
+    "load_rules",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
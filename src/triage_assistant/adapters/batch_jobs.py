@@ -0,0 +1,246 @@
+"""Offline batch jobs through the OpenAI Batch API (``/v1/files`` and ``/v1/batches``).
+
+For large re-triage runs where latency does not matter, a batch job is cheaper and does
+not count against the synchronous rate limits:
+
+1. every issue becomes one line of a JSONL file of chat-completions requests
+2. the file is uploaded to ``/v1/files`` and a ``/v1/batches`` job is created for it
+3. the job is polled with exponential backoff until it reaches a final state
+4. the output and error files are streamed back line by line; each reply is validated
+   against ``TriageOutput``
+
+Issues without a valid result (failed requests, invalid replies, an expired or failed
+job) are resubmitted in a new, smaller job, up to ``max_resubmits`` times.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from ..schema import TriageOutput
+from .chat_completions import ChatCompletionsError, get_chat_completion_content
+
+if TYPE_CHECKING:
+    from .openai_compatible import OpenAICompatibleAdapter
+
+_ENDPOINT = "/v1/chat/completions"
+_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+_ID_PREFIX = "issue-"
+
+
+class BatchJobError(ChatCompletionsError):
+    """Raised when some issues have no valid result after every resubmission.
+
+    ``results`` holds the issues that did succeed (by input index); ``failed`` maps each
+    remaining index to the last error reported for it.
+    """
+
+    def __init__(
+        self, message: str, *, results: dict[int, TriageOutput], failed: dict[int, str]
+    ) -> None:
+        super().__init__(message)
+        self.results = results
+        self.failed = failed
+
+
+def run_batch_job(
+    adapter: OpenAICompatibleAdapter,
+    issues: Sequence[tuple[str, str]],
+    *,
+    poll_interval_s: float = 5.0,
+    max_poll_interval_s: float = 60.0,
+    max_wait_s: float = 24 * 3600.0,
+    max_resubmits: int = 2,
+    completion_window: str = "24h",
+) -> list[TriageOutput]:
+    """Triage ``(title, body)`` pairs with provider batch jobs; results keep input order.
+
+    Raises:
+        BatchJobError: If some issues still have no valid result after ``max_resubmits``
+            additional jobs, or a job does not finish within ``max_wait_s``.
+        ChatCompletionsError: If the files or batches API cannot be reached.
+    """
+    job = _BatchJob(
+        adapter,
+        poll_interval_s=poll_interval_s,
+        max_poll_interval_s=max_poll_interval_s,
+        max_wait_s=max_wait_s,
+        completion_window=completion_window,
+    )
+    results: dict[int, TriageOutput] = {}
+    errors: dict[int, str] = {}
+    pending = list(range(len(issues)))
+    for _ in range(max_resubmits + 1):
+        if not pending:
+            break
+        try:
+            got, errors = job.run(issues, pending)
+        except BatchJobError as e:
+            # A job timed out: keep what earlier jobs finished.
+            e.results.update(results)
+            e.failed.update({index: str(e) for index in pending})
+            raise
+        results.update(got)
+        pending = [index for index in pending if index not in got]
+    if pending:
+        failed = {index: errors.get(index, "no result returned") for index in pending}
+        raise BatchJobError(
+            f"{len(pending)} of {len(issues)} issues have no valid result after "
+            f"{max_resubmits} resubmission(s); first failure: {failed[pending[0]]}",
+            results=results,
+            failed=failed,
+        )
+    return [results[index] for index in range(len(issues))]
+
+
+class _BatchJob:
+    def __init__(
+        self,
+        adapter: OpenAICompatibleAdapter,
+        *,
+        poll_interval_s: float,
+        max_poll_interval_s: float,
+        max_wait_s: float,
+        completion_window: str,
+    ) -> None:
+        self.adapter = adapter
+        self.base = adapter.base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {adapter.api_key}"}
+        self.poll_interval_s = poll_interval_s
+        self.max_poll_interval_s = max(poll_interval_s, max_poll_interval_s)
+        self.max_wait_s = max_wait_s
+        self.completion_window = completion_window
+
+    def run(
+        self, issues: Sequence[tuple[str, str]], indexes: list[int]
+    ) -> tuple[dict[int, TriageOutput], dict[int, str]]:
+        """Submit one job for ``indexes``; returns valid results and errors by index."""
+        content = b"".join(self._request_line(index, *issues[index]) for index in indexes)
+        uploaded = self._call(
+            "POST",
+            "/v1/files",
+            files={"file": ("triage-batch.jsonl", content, "application/jsonl")},
+            data={"purpose": "batch"},
+        )
+        batch = self._call(
+            "POST",
+            "/v1/batches",
+            json={
+                "input_file_id": uploaded["id"],
+                "endpoint": _ENDPOINT,
+                "completion_window": self.completion_window,
+            },
+        )
+        batch = self._wait(batch)
+
+        wanted = set(indexes)
+        results: dict[int, TriageOutput] = {}
+        errors: dict[int, str] = {}
+        for key in ("output_file_id", "error_file_id"):
+            file_id = batch.get(key)
+            if not file_id:
+                continue
+            for line in self._file_lines(file_id):
+                index, result = self._parse_line(line)
+                if index not in wanted:
+                    continue
+                if isinstance(result, TriageOutput):
+                    results[index] = result
+                else:
+                    errors[index] = result
+        if batch.get("status") != "completed":
+            reason = f"batch {batch.get('id')} ended as {batch.get('status')!r}"
+            for index in wanted - results.keys():
+                errors.setdefault(index, reason)
+        return results, errors
+
+    def _request_line(self, index: int, title: str, body: str) -> bytes:
+        # The body is the adapter's pre-encoded chat-completions payload (compacted
+        # prompt, model, sampling settings), spliced in without re-encoding.
+        payload = self.adapter._triage_request(title=title, body=body)["content"]
+        custom_id = json.dumps(f"{_ID_PREFIX}{index}").encode()
+        return b"".join(
+            (
+                b'{"custom_id":',
+                custom_id,
+                b',"method":"POST","url":"',
+                _ENDPOINT.encode(),
+                b'","body":',
+                payload,
+                b"}\n",
+            )
+        )
+
+    def _wait(self, batch: dict[str, Any]) -> dict[str, Any]:
+        deadline = time.monotonic() + self.max_wait_s
+        delay = self.poll_interval_s
+        while batch.get("status") not in _FINAL_STATUSES:
+            if time.monotonic() + delay > deadline:
+                self._cancel(batch["id"])
+                raise BatchJobError(
+                    f"Batch {batch['id']} did not finish within {self.max_wait_s:g}s "
+                    f"(status: {batch.get('status')!r}); it has been cancelled.",
+                    results={},
+                    failed={},
+                )
+            time.sleep(delay)
+            delay = min(self.max_poll_interval_s, delay * 2)
+            batch = self._call("GET", f"/v1/batches/{batch['id']}")
+        return batch
+
+    def _cancel(self, batch_id: str) -> None:
+        try:
+            self._call("POST", f"/v1/batches/{batch_id}/cancel")
+        except ChatCompletionsError:
+            pass  # best effort; the job expires on its own
+
+    def _parse_line(self, line: str) -> tuple[int | None, TriageOutput | str]:
+        try:
+            record = json.loads(line)
+            index = int(str(record["custom_id"]).removeprefix(_ID_PREFIX))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None, "unreadable result line"
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            error = record.get("error") or (response.get("body") or {}).get("error")
+            return index, f"HTTP {response.get('status_code')}: {error}"
+        try:
+            content = get_chat_completion_content(response.get("body") or {})
+            return index, self.adapter._parse_content(content)
+        except ChatCompletionsError as e:
+            return index, str(e)
+
+    def _file_lines(self, file_id: str) -> Iterator[str]:
+        # Output files can be large: stream them rather than loading them whole.
+        request = {"url": f"{self.base}/v1/files/{file_id}/content", "headers": self.headers}
+        try:
+            resp = self.adapter._post(request, stream=True, method="GET")
+            try:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if line.strip():
+                        yield line
+            finally:
+                resp.close()
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            raise self.adapter._error(e) from e
+
+    def _call(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        # Same retries and rate limiting as triage requests, so one 429 or 5xx while
+        # polling does not fail the whole job. Uploads and job creation are billed side
+        # effects: they are only re-sent when the provider certainly did not act on them.
+        request = {"url": self.base + path, "headers": self.headers, **kwargs}
+        try:
+            resp = self.adapter._post(request, method=method, idempotent=method == "GET")
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPStatusError, httpx.RequestError, json.JSONDecodeError) as e:
+            raise self.adapter._error(e) from e
+        if not isinstance(data, dict):
+            raise ChatCompletionsError(f"Unexpected response from {path}.")
+        return data
@@ -0,0 +1,357 @@
+"""Persistent response cache for hosted adapters.
+
+Re-running ``eval`` over the same dataset sends the same prompts again. ``CachedAdapter``
+stores each validated ``TriageOutput`` in a SQLite file, keyed by a hash of everything
+that determines the answer (provider, endpoint, model, prompt text, temperature, seed
+and JSON mode), so identical calls skip the network entirely.
+
+The database runs in WAL mode, so several processes (parallel ``eval`` runs, workers)
+can read and write it at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from ..schema import TriageOutput
+from ..triage import aclose_adapter, atriage_with, close_adapter
+from .packing import (
+    DEFAULT_MAX_PACK_SIZE,
+    DEFAULT_PACK_TOKENS,
+    PackingAdapter,
+    results_or_raise,
+)
+
+# Wait this long for another process's write lock before giving up.
+_BUSY_TIMEOUT_MS = 5000
+# The entry count is tracked in memory and recounted after this many inserts, to pick up
+# rows written by other processes.
+_RECOUNT_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    output TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+@runtime_checkable
+class CacheableAdapter(Protocol):
+    """An adapter that can name its requests with a stable cache key."""
+
+    def triage(self, *, title: str, body: str) -> TriageOutput: ...
+
+    def cache_key(self, *, title: str, body: str) -> str: ...
+
+
+class ResponseCache:
+    """A SQLite table of triage results with a TTL and least-recently-used eviction.
+
+    Args:
+        path: Database file; created (with parent directories) on first use.
+        ttl_s: Entries older than this are treated as missing; ``None`` keeps them forever.
+        max_entries: When exceeded, the least recently read entries are dropped.
+
+    Each thread gets its own connection. Pickling keeps only the settings, so a copy in
+    another process opens its own connection to the same file.
+
+    Rows are counted once and then tracked in memory, so an insert does not scan the
+    table. Rows written by other processes are picked up by a recount every
+    ``_RECOUNT_EVERY`` inserts.
+    """
+
+    def __init__(
+        self, path: Path, *, ttl_s: float | None = 7 * 24 * 3600, max_entries: int = 100_000
+    ) -> None:
+        if ttl_s is not None and ttl_s <= 0:
+            raise ValueError("ttl_s must be > 0 (or None for no expiry).")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._size_lock = threading.Lock()
+        self._size: int | None = None
+        self._inserts = 0
+
+    @staticmethod
+    def from_env(path: Path) -> ResponseCache:
+        """Open ``path`` with the TTL and size limits from the environment.
+
+        - TRIAGE_CACHE_TTL_S (float, default: 7 days; 0 keeps entries forever)
+        - TRIAGE_CACHE_MAX_ENTRIES (int, default: 100000)
+        """
+        kwargs: dict[str, Any] = {}
+        raw_ttl = os.getenv("TRIAGE_CACHE_TTL_S", "").strip()
+        if raw_ttl:
+            try:
+                ttl = float(raw_ttl)
+            except ValueError:
+                pass
+            else:
+                kwargs["ttl_s"] = ttl if ttl > 0 else None
+        raw_max = os.getenv("TRIAGE_CACHE_MAX_ENTRIES", "").strip()
+        if raw_max:
+            try:
+                kwargs["max_entries"] = int(raw_max)
+            except ValueError:
+                pass
+        return ResponseCache(path, **kwargs)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self.path, "ttl_s": self.ttl_s, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"], ttl_s=state["ttl_s"], max_entries=state["max_entries"])  # type: ignore[misc]
+
+    def get(self, key: str) -> TriageOutput | None:
+        conn = self._connection()
+        row = conn.execute("SELECT output, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        output, created = row
+        now = time.time()
+        if self.ttl_s is not None and now - created > self.ttl_s:
+            with conn:
+                deleted = conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+            with self._size_lock:
+                if self._size is not None:
+                    self._size = max(0, self._size - deleted)
+            return None
+        with conn:
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return TriageOutput.model_validate_json(output)
+
+    def put(self, key: str, output: TriageOutput) -> None:
+        conn = self._connection()
+        now = time.time()
+        row = (output.model_dump_json(), now, now, key)
+        with conn:
+            updated = conn.execute(
+                "UPDATE responses SET output = ?, created = ?, accessed = ? WHERE key = ?", row
+            ).rowcount
+            if updated:
+                return
+            conn.execute(
+                "INSERT INTO responses (output, created, accessed, key) VALUES (?, ?, ?, ?)", row
+            )
+            excess = self._excess_after_insert(conn)
+            if excess:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM responses")
+        with self._size_lock:
+            self._size = 0
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _excess_after_insert(self, conn: sqlite3.Connection) -> int:
+        """Count one inserted row and return how many rows to evict for it."""
+        with self._size_lock:
+            self._inserts += 1
+            if self._size is None or self._inserts % _RECOUNT_EVERY == 0:
+                (self._size,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            else:
+                self._size += 1
+            excess = max(0, self._size - self.max_entries)
+            self._size -= excess
+            return excess
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT_MS / 1000)
+            conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+
+@dataclass(frozen=True)
+class CachedAdapter:
+    """Serve repeated triage calls of a hosted adapter from a :class:`ResponseCache`.
+
+    With ``refresh=True`` cached entries are ignored but fresh results are still stored,
+    which bypasses stale answers without losing the cache.
+    """
+
+    inner: CacheableAdapter
+    cache: ResponseCache
+    refresh: bool = False
+
+    def close(self) -> None:
+        """Close ``inner`` and this thread's cache connection."""
+        close_adapter(self.inner)
+        self.cache.close()
+
+    async def aclose(self) -> None:
+        """Close ``inner``'s async connections of the running event loop."""
+        await aclose_adapter(self.inner)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        key = self.inner.cache_key(title=title, body=body)
+        if not self.refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        result = self.inner.triage(title=title, body=body)
+        self.cache.put(key, result)
+        return result
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        """Async counterpart of :meth:`triage`; SQLite I/O runs in a worker thread."""
+        key = self.inner.cache_key(title=title, body=body)
+        if not self.refresh:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+        result = await atriage_with(self.inner, title=title, body=body)
+        await asyncio.to_thread(self.cache.put, key, result)
+        return result
+
+    def triage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+    ) -> list[TriageOutput]:
+        """Serve cached issues, then triage the rest with the inner adapter's packing."""
+        keys, results, misses = self._lookup_many(issues)
+        if misses:
+            pending = [issues[i] for i in misses]
+            if isinstance(self.inner, PackingAdapter):
+                fresh = self.inner.triage_batch(
+                    pending, token_budget=token_budget, max_pack_size=max_pack_size
+                )
+            else:
+                fresh = [self.inner.triage(title=title, body=body) for title, body in pending]
+            self._store_many(keys, results, misses, fresh)
+        return [results[i] for i in range(len(issues))]
+
+    async def atriage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        concurrency: int | None = None,
+    ) -> list[TriageOutput]:
+        """Async counterpart of :meth:`triage_batch`."""
+        outcomes = await self.atriage_batch_outcomes(
+            issues, token_budget=token_budget, max_pack_size=max_pack_size, concurrency=concurrency
+        )
+        return results_or_raise(outcomes)
+
+    async def atriage_batch_outcomes(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        concurrency: int | None = None,
+    ) -> list[TriageOutput | Exception]:
+        """Like :meth:`atriage_batch`, but each issue's failure is returned in its place.
+
+        Only successful results are stored.
+        """
+        keys, results, misses = await asyncio.to_thread(self._lookup_many, issues)
+        outcomes: dict[int, TriageOutput | Exception] = dict(results)
+        if misses:
+            pending = [issues[i] for i in misses]
+            fresh: list[TriageOutput | Exception]
+            inner_outcomes = getattr(self.inner, "atriage_batch_outcomes", None)
+            if inner_outcomes is not None:
+                fresh = await inner_outcomes(
+                    pending,
+                    token_budget=token_budget,
+                    max_pack_size=max_pack_size,
+                    concurrency=concurrency,
+                )
+            elif isinstance(self.inner, PackingAdapter):
+                fresh = list(
+                    await self.inner.atriage_batch(
+                        pending,
+                        token_budget=token_budget,
+                        max_pack_size=max_pack_size,
+                        concurrency=concurrency,
+                    )
+                )
+            else:
+                fresh = []
+                for title, body in pending:
+                    try:
+                        fresh.append(await atriage_with(self.inner, title=title, body=body))
+                    except Exception as e:
+                        fresh.append(e)
+            stored = [
+                (index, outcome)
+                for index, outcome in zip(misses, fresh, strict=True)
+                if isinstance(outcome, TriageOutput)
+            ]
+            await asyncio.to_thread(
+                self._store_many,
+                keys,
+                results,
+                [index for index, _ in stored],
+                [outcome for _, outcome in stored],
+            )
+            outcomes.update(zip(misses, fresh, strict=True))
+        return [outcomes[i] for i in range(len(issues))]
+
+    def _lookup_many(
+        self, issues: Sequence[tuple[str, str]]
+    ) -> tuple[list[str], dict[int, TriageOutput], list[int]]:
+        keys = [self.inner.cache_key(title=title, body=body) for title, body in issues]
+        results: dict[int, TriageOutput] = {}
+        misses: list[int] = []
+        for index, key in enumerate(keys):
+            cached = None if self.refresh else self.cache.get(key)
+            if cached is None:
+                misses.append(index)
+            else:
+                results[index] = cached
+        return keys, results, misses
+
+    def _store_many(
+        self,
+        keys: list[str],
+        results: dict[int, TriageOutput],
+        misses: list[int],
+        fresh: list[TriageOutput],
+    ) -> None:
+        for index, result in zip(misses, fresh, strict=True):
+            self.cache.put(keys[index], result)
+            results[index] = result
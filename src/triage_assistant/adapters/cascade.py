@@ -0,0 +1,113 @@
+"""Confidence-gated cascade: offline rules first, a hosted model only when unsure.
+
+Most issues are obvious (a crash report, a typo, "add support for X") and the offline
+rules classify them as well as a model would, in microseconds. A
+:class:`CascadeAdapter` asks the rules first and returns their result when its
+confidence reaches a threshold; only the remaining issues are escalated to the hosted
+adapter.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from ..schema import TriageOutput
+from ..triage import aclose_adapter, atriage_with, close_adapter
+from .dummy import DummyAdapter
+
+
+class _Adapter(Protocol):
+    def triage(self, *, title: str, body: str) -> TriageOutput: ...
+
+
+class _PathCounts:
+    """How many calls each path of one ``CascadeAdapter`` answered."""
+
+    def __init__(self) -> None:
+        self.rules = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[_PathCounts], tuple[()]]:
+        return _PathCounts, ()
+
+    def record(self, *, escalated: bool) -> None:
+        with self._lock:
+            if escalated:
+                self.escalated += 1
+            else:
+                self.rules += 1
+
+
+@dataclass(frozen=True)
+class CascadeAdapter:
+    """Answer from the offline rules when they are confident, else ask ``fallback``.
+
+    Args:
+        fallback: The adapter low-confidence issues are escalated to (usually hosted).
+        rules: The offline adapter tried first.
+        threshold: Rule results with a confidence at or above this are returned as is
+            (see ``DummyAdapter.triage_with_confidence``). ``0`` never escalates, above
+            ``1`` always does.
+
+    Errors from ``fallback`` are not caught; wrap it in a ``FailoverAdapter`` ending in
+    ``dummy`` to fall back to the rule result instead.
+
+    Environment variables supported by ``from_env()``:
+
+    - TRIAGE_CASCADE_THRESHOLD (float, default: 0.8)
+    """
+
+    fallback: _Adapter
+    rules: DummyAdapter = field(default_factory=DummyAdapter)
+    threshold: float = 0.8
+    _counts: _PathCounts = field(default_factory=_PathCounts, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.threshold < 0:
+            raise ValueError("threshold must be >= 0.")
+
+    @staticmethod
+    def from_env(fallback: _Adapter, rules: DummyAdapter | None = None) -> CascadeAdapter:
+        rules = rules or DummyAdapter.from_env()
+        raw = os.getenv("TRIAGE_CASCADE_THRESHOLD", "").strip()
+        if raw:
+            try:
+                return CascadeAdapter(fallback=fallback, rules=rules, threshold=float(raw))
+            except ValueError:
+                pass
+        return CascadeAdapter(fallback=fallback, rules=rules)
+
+    @property
+    def path_counts(self) -> dict[str, int]:
+        """Calls answered by each path so far: ``{"rules": n, "escalated": m}``."""
+        return {"rules": self._counts.rules, "escalated": self._counts.escalated}
+
+    def close(self) -> None:
+        """Close ``fallback``."""
+        close_adapter(self.fallback)
+
+    async def aclose(self) -> None:
+        """Close ``fallback``'s async connections of the running event loop."""
+        await aclose_adapter(self.fallback)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        result = self._confident(title=title, body=body)
+        if result is not None:
+            return result
+        return self.fallback.triage(title=title, body=body)
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        result = self._confident(title=title, body=body)
+        if result is not None:
+            return result
+        return await atriage_with(self.fallback, title=title, body=body)
+
+    def _confident(self, *, title: str, body: str) -> TriageOutput | None:
+        result, confidence = self.rules.triage_with_confidence(title=title, body=body)
+        escalate = confidence < self.threshold
+        self._counts.record(escalated=escalate)
+        return None if escalate else result
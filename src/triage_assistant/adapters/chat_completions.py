@@ -1,31 +1,1140 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
 import re
-from typing import Any
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from types import TracebackType
+from typing import Any, ClassVar, Self, TypeVar
 
+import httpx
+from pydantic import BaseModel, ValidationError
 
-class ChatCompletionsError(RuntimeError):
-    """Raised when a chat-completions based adapter cannot produce a valid result."""
+from ..schema import TriageOutput
+from .compaction import compact_body
+from .errors import ChatCompletionsError as ChatCompletionsError  # re-exported
+from .limiter import AdaptiveLimiter, parse_duration
+from .packing import (
+    DEFAULT_MAX_PACK_SIZE,
+    DEFAULT_PACK_TOKENS,
+    PACK_SYSTEM_PROMPT,
+    pack_prompt,
+    parse_pack,
+    plan_packs,
+    results_or_raise,
+)
+from .tokens import estimate_request_tokens
+
+SYSTEM_PROMPT = (
+    "You are a GitHub issue triage assistant. "
+    "Return ONLY a JSON object that matches the schema. "
+    "Do not wrap the JSON in markdown. "
+    "The JSON must include: type, priority, labels, rationale. "
+    "type is one of: bug, feature, docs, question. "
+    "priority is one of: p0, p1, p2. "
+    "labels is an array of strings. "
+    "rationale is a short string."
+)
+
+
+class ClientPool:
+    """Lazily created HTTP clients shared by every call of one adapter instance.
+
+    Reusing one client keeps TCP/TLS connections alive between requests instead of
+    paying the handshake per issue. ``httpx.Client`` is safe to use from several
+    threads; creation and closing are guarded by a lock here.
+
+    Async connections belong to the event loop that opened them, so there is one
+    ``httpx.AsyncClient`` per running loop.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[ClientPool], tuple[()]]:
+        # Connections cannot cross process boundaries; a copy starts with an empty pool.
+        return ClientPool, ()
+
+    def get(
+        self,
+        *,
+        timeout_s: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        http2: bool,
+    ) -> httpx.Client:
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                self._client = _open_client(
+                    httpx.Client,
+                    timeout_s=timeout_s,
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    http2=http2,
+                )
+            return self._client
+
+    def get_async(
+        self,
+        *,
+        timeout_s: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        http2: bool,
+    ) -> httpx.AsyncClient:
+        """Return the async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = _open_client(
+                    httpx.AsyncClient,
+                    timeout_s=timeout_s,
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    http2=http2,
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def close(self) -> None:
+        """Close the sync client. Async clients must be closed with :meth:`aclose`."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_ClientT = TypeVar("_ClientT", httpx.Client, httpx.AsyncClient)
+
+
+def _open_client(
+    client_type: type[_ClientT],
+    *,
+    timeout_s: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    http2: bool,
+) -> _ClientT:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+    try:
+        return client_type(timeout=timeout_s, limits=limits, http2=http2)
+    except ImportError as e:
+        raise ChatCompletionsError(
+            "HTTP/2 was requested but the 'h2' package is not installed. "
+            "Install it with `pip install 'httpx[http2]'` or unset TRIAGE_HTTP2."
+        ) from e
+
+
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# ``x-ratelimit-reset`` values above this are Unix timestamps, not a number of seconds.
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long hosted adapters wait before re-sending a failed request.
+
+    Retries happen on network errors and on the statuses in ``retry_statuses`` (rate
+    limiting and transient server errors). A wait the provider asks for through
+    ``Retry-After`` (or ``retry-after-ms`` / ``x-ratelimit-reset*``) is honored as long
+    as it is at most ``max_delay_s``; otherwise the delay is exponential backoff with
+    full jitter: a random value between 0 and ``min(max_delay_s, base_delay_s * 2**n)``.
+
+    ``budget_s`` caps the total time spent waiting for one call, so a burst of 429s
+    cannot stall a batch indefinitely. ``max_retries=0`` disables retries.
+
+    Every attempt replays the exact same request. Triage calls have no side effects, so
+    re-sending them after a timeout is safe; requests that do have side effects (batch
+    file uploads and job creation) are only re-sent when the provider certainly did not
+    act on them, see ``_post(idempotent=False)``.
+    """
+
+    max_retries: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 30.0
+    budget_s: float = 60.0
+    retry_statuses: frozenset[int] = _RETRY_STATUSES
+
+    def __post_init__(self) -> None:
+        if self.max_retries < 0:
+            raise ValueError("max_retries must be >= 0.")
+        if self.base_delay_s < 0 or self.max_delay_s < 0 or self.budget_s < 0:
+            raise ValueError("Retry delays and budget must be >= 0.")
+
+    def next_delay(
+        self, retry: int, waited_s: float, response: httpx.Response | None = None
+    ) -> float | None:
+        """Seconds to wait before retry number ``retry`` (starting at 0), or ``None`` to give up.
+
+        ``waited_s`` is the time already spent waiting for this call; ``response`` is the
+        failed response (``None`` after a network error).
+        """
+        if retry >= self.max_retries:
+            return None
+        hinted = _server_delay(response.headers) if response is not None else None
+        if hinted is not None:
+            if hinted > self.max_delay_s:
+                return None
+            delay = hinted
+        else:
+            delay = random.uniform(0.0, min(self.max_delay_s, self.base_delay_s * 2**retry))
+        if waited_s + delay > self.budget_s:
+            return None
+        return delay
+
+    def should_retry(self, response: httpx.Response) -> bool:
+        return response.status_code in self.retry_statuses
+
+
+def _rejected_with_hint(response: httpx.Response) -> bool:
+    """A 429 with a wait hint: the provider turned the request away without acting on it."""
+    return response.status_code == 429 and _server_delay(response.headers) is not None
+
+
+def _server_delay(headers: httpx.Headers) -> float | None:
+    """Wait time requested by the provider, if any."""
+    raw = headers.get("retry-after-ms")
+    if raw:
+        try:
+            return max(0.0, float(raw) / 1000)
+        except ValueError:
+            pass
+
+    raw = headers.get("retry-after")
+    if raw:
+        try:
+            return max(0.0, float(raw))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(raw)
+            except (TypeError, ValueError):
+                when = None
+            if when is not None:
+                return max(0.0, when.timestamp() - time.time())
+
+    raw = headers.get("x-ratelimit-reset")
+    if raw:
+        try:
+            value = float(raw)
+        except ValueError:
+            pass
+        else:
+            if value > _EPOCH_THRESHOLD:
+                value -= time.time()
+            return max(0.0, value)
+
+    # Separate request/token windows: the longer reset is the one that unblocks us.
+    durations = [
+        parse_duration(headers[name])
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if name in headers
+    ]
+    found = [d for d in durations if d is not None]
+    return max(found) if found else None
+
+
+class PooledClientMixin:
+    """Chat-completions transport shared by the hosted adapters.
+
+    Adapters using this mixin are dataclasses with ``timeout_s``, ``max_connections``,
+    ``max_keepalive_connections``, ``http2``, ``stream``, ``body_token_budget``,
+    ``retry``, ``limiter``, a ``_pool: ClientPool`` and a ``_ttft`` (see
+    :func:`ttft_window`) field. They can be closed explicitly (``close()`` / ``await aclose()``) or used as
+    sync or async context managers; a closed adapter reopens its pool on the next call.
+
+    An adapter only describes its endpoint: ``_build_request`` (URL, headers, payload
+    settings), ``_error`` and the ``_provider_name`` / ``_error_type`` used in messages.
+    The static part of each request, including the encoded system message, is rendered
+    once per adapter instance (see :class:`RequestTemplate`); a call only encodes its
+    user message.
+    """
+
+    _provider_name: ClassVar[str] = "Provider"
+    _error_type: ClassVar[type[ChatCompletionsError]] = ChatCompletionsError
+
+    timeout_s: float
+    max_connections: int
+    max_keepalive_connections: int
+    http2: bool
+    stream: bool
+    body_token_budget: int | None
+    retry: RetryPolicy
+    limiter: AdaptiveLimiter
+    _pool: ClientPool
+    _ttft: deque[float]
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._pool.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    async def aclose(self) -> None:
+        """Close pooled async connections of the running event loop."""
+        await self._pool.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    @property
+    def recent_ttft_s(self) -> list[float]:
+        """Time to first token of recent streamed calls, oldest first (``stream=True`` only)."""
+        return list(self._ttft)
+
+    def cache_key(self, *, title: str, body: str) -> str:
+        """Stable hash of everything that decides the answer for this issue.
+
+        Covers the provider, endpoint, model, prompt text and sampling settings
+        (temperature, seed, JSON mode) but not credentials. See ``CachedAdapter``.
+        """
+        request = self._triage_request(title=title, body=body)
+        material = {
+            "provider": type(self).__name__,
+            "url": request["url"],
+            "params": request.get("params"),
+            "payload": json.loads(request["content"]),
+        }
+        encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def triage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+    ) -> list[TriageOutput]:
+        """Triage ``(title, body)`` pairs, packing several issues into each request.
+
+        Packs are sized to ``token_budget`` (see ``packing.plan_packs``). Every result is
+        validated against ``TriageOutput``; issues whose result is missing or invalid, or
+        whose pack request failed, are re-requested individually with :meth:`triage`.
+        Results keep input order.
+        """
+        issues = self._compact_issues(issues)
+        results: dict[int, TriageOutput] = {}
+        for pack in plan_packs(issues, token_budget=token_budget, max_pack_size=max_pack_size):
+            if len(pack) > 1:
+                try:
+                    results.update(self._triage_pack(issues, pack))
+                except ChatCompletionsError:
+                    pass  # each issue of the pack is retried on its own below
+            for index in pack:
+                if index not in results:
+                    title, body = issues[index]
+                    results[index] = self.triage(title=title, body=body)
+        return [results[i] for i in range(len(issues))]
+
+    async def atriage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        concurrency: int | None = None,
+    ) -> list[TriageOutput]:
+        """Async counterpart of :meth:`triage_batch`; packs are sent concurrently.
+
+        ``concurrency`` caps the requests in flight (packs and single retries alike);
+        ``None`` sends them all at once.
+        """
+        outcomes = await self.atriage_batch_outcomes(
+            issues, token_budget=token_budget, max_pack_size=max_pack_size, concurrency=concurrency
+        )
+        return results_or_raise(outcomes)
+
+    async def atriage_batch_outcomes(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        concurrency: int | None = None,
+    ) -> list[TriageOutput | Exception]:
+        """Like :meth:`atriage_batch`, but each issue's failure is returned in its place."""
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be >= 1.")
+        slots = asyncio.Semaphore(concurrency) if concurrency else contextlib.nullcontext()
+
+        async def single(index: int) -> TriageOutput:
+            async with slots:
+                return await self.atriage(title=issues[index][0], body=issues[index][1])
+
+        async def run(pack: list[int]) -> dict[int, TriageOutput | Exception]:
+            got: dict[int, TriageOutput | Exception] = {}
+            if len(pack) > 1:
+                try:
+                    async with slots:
+                        got.update(await self._atriage_pack(issues, pack))
+                except ChatCompletionsError:
+                    pass  # each issue of the pack is retried on its own below
+            missing = [index for index in pack if index not in got]
+            redone = await asyncio.gather(*(single(i) for i in missing), return_exceptions=True)
+            for index, outcome in zip(missing, redone, strict=True):
+                if not isinstance(outcome, TriageOutput | Exception):
+                    raise outcome  # cancellation and other BaseExceptions
+                got[index] = outcome
+            return got
+
+        issues = self._compact_issues(issues)
+        packs = plan_packs(issues, token_budget=token_budget, max_pack_size=max_pack_size)
+        outcomes: dict[int, TriageOutput | Exception] = {}
+        for got in await asyncio.gather(*(run(pack) for pack in packs)):
+            outcomes.update(got)
+        return [outcomes[i] for i in range(len(issues))]
+
+    def _triage_pack(
+        self, issues: Sequence[tuple[str, str]], pack: list[int]
+    ) -> dict[int, TriageOutput]:
+        request = self._template(PACK_SYSTEM_PROMPT).render(_pack_prompt(issues, pack))
+        try:
+            resp = self._post(request)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPStatusError, httpx.RequestError, json.JSONDecodeError) as e:
+            raise self._error(e) from e
+        return _unpack(data, pack)
+
+    async def _atriage_pack(
+        self, issues: Sequence[tuple[str, str]], pack: list[int]
+    ) -> dict[int, TriageOutput]:
+        request = self._template(PACK_SYSTEM_PROMPT).render(_pack_prompt(issues, pack))
+        try:
+            resp = await self._apost(request)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPStatusError, httpx.RequestError, json.JSONDecodeError) as e:
+            raise self._error(e) from e
+        return _unpack(data, pack)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        request = self._triage_request(title=title, body=body, stream=self.stream)
+        if self.stream:
+            return self._parse_content(self._stream_content(request))
+        try:
+            resp = self._post(request)
+            resp.raise_for_status()
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            raise self._error(e) from e
+        return self._parse_content(self._reply_content(resp.content))
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        """Async counterpart of :meth:`triage`, built on ``httpx.AsyncClient``."""
+        request = self._triage_request(title=title, body=body, stream=self.stream)
+        if self.stream:
+            return self._parse_content(await self._astream_content(request))
+        try:
+            resp = await self._apost(request)
+            resp.raise_for_status()
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            raise self._error(e) from e
+        return self._parse_content(self._reply_content(resp.content))
+
+    def _reply_content(self, body: bytes) -> str:
+        """Assistant text of a chat-completions response body."""
+        try:
+            completion = _ChatCompletion.model_validate_json(body)
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise self._error(e) from e
+            raise ChatCompletionsError(f"Unexpected response structure: {e}") from e
+        if not completion.choices:
+            raise ChatCompletionsError("Unexpected response structure: no choices.")
+        return _text_content(completion.choices[0].message.content)
+
+    def _parse_content(self, content: str) -> TriageOutput:
+        """The first JSON object in ``content`` that is a valid ``TriageOutput``.
+
+        Each balanced ``{...}`` slice of the reply goes straight to pydantic's JSON
+        validator; no intermediate dict is built.
+        """
+        # Fast path: the reply is one object, possibly fenced or with commentary around
+        # it. If the slice from the first "{" to the last "}" validates, it is exactly
+        # the first balanced object.
+        start, end = content.find("{"), content.rfind("}") + 1
+        if 0 <= start < end:
+            try:
+                return TriageOutput.model_validate_json(content[start:end])
+            except ValidationError:
+                pass
+        first_error: ValidationError | None = None
+        for start, end in json_object_spans(content):
+            try:
+                return TriageOutput.model_validate_json(content[start:end])
+            except ValidationError as e:
+                first_error = first_error or e
+        if first_error is None:
+            raise ChatCompletionsError("Model response did not contain a JSON object.")
+        raise self._error_type(
+            f"{self._provider_name} output failed schema validation: {first_error}"
+        ) from first_error
+
+    def _triage_request(self, *, title: str, body: str, stream: bool = False) -> dict[str, Any]:
+        prompt = triage_prompt(title=title, body=self._compact(body))
+        return self._template(SYSTEM_PROMPT, stream=stream).render(prompt)
+
+    @cached_property
+    def _templates(self) -> dict[tuple[str, bool], RequestTemplate]:
+        return {}
+
+    def _template(self, system_prompt: str, *, stream: bool = False) -> RequestTemplate:
+        # Racing threads may both render a template; either copy is fine to keep.
+        key = (system_prompt, stream)
+        template = self._templates.get(key)
+        if template is None:
+            template = RequestTemplate.from_request(
+                self._build_request(RequestTemplate.SLOT), system_prompt, stream=stream
+            )
+            self._templates[key] = template
+        return template
+
+    def _compact(self, body: str) -> str:
+        """``body`` shrunk to ``body_token_budget`` tokens; ``None`` or 0 disables this."""
+        if not self.body_token_budget:
+            return body
+        return compact_body(body.strip(), self.body_token_budget)
+
+    def _compact_issues(self, issues: Sequence[tuple[str, str]]) -> list[tuple[str, str]]:
+        # Compacted before packs are planned, so pack sizes reflect what is sent.
+        # Compaction is idempotent: a single-issue retry sends the same body.
+        return [(title, self._compact(body)) for title, body in issues]
+
+    def _stream_content(self, request: dict[str, Any]) -> str:
+        """Send a ``stream: true`` request; the reply text, cut at the first valid result."""
+        started = time.monotonic()
+        stream = ChatCompletionStream(accept=_is_triage_json, started=started)
+        try:
+            resp = self._post(request, stream=True)
+            try:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if stream.feed(line):
+                        break
+            finally:
+                resp.close()
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            raise self._error(e) from e
+        return self._finish_stream(stream)
+
+    async def _astream_content(self, request: dict[str, Any]) -> str:
+        """Async counterpart of :meth:`_stream_content`."""
+        started = time.monotonic()
+        stream = ChatCompletionStream(accept=_is_triage_json, started=started)
+        try:
+            resp = await self._apost(request, stream=True)
+            try:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if stream.feed(line):
+                        break
+            finally:
+                await resp.aclose()
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            raise self._error(e) from e
+        return self._finish_stream(stream)
+
+    def _finish_stream(self, stream: ChatCompletionStream) -> str:
+        result = stream.result()
+        if result.ttft_s is not None:
+            self._ttft.append(result.ttft_s)
+        return result.content
+
+    # Implemented by each adapter.
+
+    def _build_request(self, messages: list[dict[str, str]]) -> dict[str, Any]:
+        """``client.post`` keyword arguments (``url``, ``headers``, ``json``, ``params``)."""
+        raise NotImplementedError
+
+    def _error(self, exc: Exception) -> ChatCompletionsError:
+        raise NotImplementedError
+
+    def _client(self) -> httpx.Client:
+        return self._pool.get(
+            timeout_s=self.timeout_s,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            http2=self.http2,
+        )
+
+    def _async_client(self) -> httpx.AsyncClient:
+        return self._pool.get_async(
+            timeout_s=self.timeout_s,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            http2=self.http2,
+        )
+
+    def _post(
+        self,
+        request: dict[str, Any],
+        *,
+        stream: bool = False,
+        method: str = "POST",
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """Send ``request`` (``client.post`` keyword arguments), retrying per ``self.retry``.
+
+        Every attempt goes through ``self.limiter``. Returns the last response, which may
+        still be an error status once retries are exhausted; network errors are
+        re-raised when no retry is left.
+
+        With ``stream=True`` the body is not read: the caller must close the response.
+        The limiter slot is released once the headers arrive. ``method`` lets other
+        endpoints of the provider (such as the batch API) share the same retries.
+
+        With ``idempotent=False`` a request is only re-sent when it never reached the
+        provider (a connect error) or was turned away with a 429 and a retry hint, so a
+        timeout or 5xx after the provider acted on it cannot duplicate the side effect.
+        """
+        client = self._client()
+        limiter = self.limiter
+        metered = limiter.meters_tokens and "content" in request
+        cost = estimate_request_tokens(request["content"]) if metered else 0
+        waited = 0.0
+        retry = 0
+        while True:
+            started = limiter.acquire(cost)
+            try:
+                if stream:
+                    resp = client.send(client.build_request(method, **request), stream=True)
+                elif method == "POST":
+                    resp = client.post(**request)
+                else:
+                    resp = client.request(method, **request)
+            except httpx.TransportError as e:
+                limiter.observe(started, None)
+                if not idempotent and not isinstance(e, httpx.ConnectError):
+                    raise
+                delay = self.retry.next_delay(retry, waited)
+                if delay is None:
+                    raise
+            else:
+                limiter.observe(started, resp)
+                if not self.retry.should_retry(resp):
+                    return resp
+                if not idempotent and not _rejected_with_hint(resp):
+                    return resp
+                delay = self.retry.next_delay(retry, waited, resp)
+                if delay is None:
+                    return resp
+                resp.close()
+            finally:
+                limiter.release()
+            time.sleep(delay)
+            waited += delay
+            retry += 1
+
+    async def _apost(self, request: dict[str, Any], *, stream: bool = False) -> httpx.Response:
+        """Async counterpart of :meth:`_post`."""
+        client = self._async_client()
+        limiter = self.limiter
+        cost = estimate_request_tokens(request["content"]) if limiter.meters_tokens else 0
+        waited = 0.0
+        retry = 0
+        while True:
+            started = await limiter.aacquire(cost)
+            try:
+                if stream:
+                    built = client.build_request("POST", **request)
+                    resp = await client.send(built, stream=True)
+                else:
+                    resp = await client.post(**request)
+            except httpx.TransportError:
+                limiter.observe(started, None)
+                delay = self.retry.next_delay(retry, waited)
+                if delay is None:
+                    raise
+            else:
+                limiter.observe(started, resp)
+                if not self.retry.should_retry(resp):
+                    return resp
+                delay = self.retry.next_delay(retry, waited, resp)
+                if delay is None:
+                    return resp
+                await resp.aclose()
+            finally:
+                limiter.release()
+            await asyncio.sleep(delay)
+            waited += delay
+            retry += 1
+
+
+_TTFT_WINDOW = 256
+
+
+def ttft_window() -> deque[float]:
+    """Empty buffer of recent time-to-first-token samples (an adapter's ``_ttft`` field)."""
+    return deque(maxlen=_TTFT_WINDOW)
+
+
+@dataclass(frozen=True)
+class StreamedCompletion:
+    """Assistant text assembled from a streamed chat completion.
+
+    ``ttft_s`` is the time from ``started`` to the first content delta (``None`` if no
+    start time was given or no content arrived); ``total_s`` is the time until the stream
+    was finished or abandoned. ``early`` is true when reading stopped at an accepted JSON
+    object before the server finished the stream.
+    """
+
+    content: str
+    ttft_s: float | None
+    total_s: float | None
+    early: bool
+
+
+class ChatCompletionStream:
+    """Incremental parser for server-sent events of a ``stream: true`` chat completion.
+
+    Feed it the lines of the response body; :meth:`feed` returns true once nothing more is
+    needed: after ``data: [DONE]``, or as soon as the content holds a balanced JSON object
+    that ``accept`` returns true for. The streaming counterpart of
+    :func:`get_chat_completion_content`.
+
+    Raises:
+        ChatCompletionsError: On an error event, a malformed event or empty content.
+    """
+
+    def __init__(
+        self,
+        *,
+        accept: Callable[[str], bool] | None = None,
+        started: float | None = None,
+    ) -> None:
+        self._accept = accept
+        self._started = started
+        self._parts: list[str] = []
+        self._data: list[str] = []
+        self._scanner = _JsonObjectScanner()
+        self._ttft: float | None = None
+        self._early = False
+        self.done = False
+
+    def feed(self, line: str) -> bool:
+        """Process one line of the event stream; returns true when the stream can be closed."""
+        if self.done:
+            return True
+        if not line:
+            self._dispatch()
+        elif line.startswith("data:"):
+            data = line[5:]
+            self._data.append(data[1:] if data.startswith(" ") else data)
+        # Other fields (event:, id:, retry:) and ":" comments carry nothing we need.
+        return self.done
+
+    def result(self) -> StreamedCompletion:
+        self._dispatch()
+        content = "".join(self._parts)
+        if not content.strip():
+            raise ChatCompletionsError("Provider returned empty content.")
+        total = None if self._started is None else time.monotonic() - self._started
+        return StreamedCompletion(
+            content=content, ttft_s=self._ttft, total_s=total, early=self._early
+        )
+
+    def _dispatch(self) -> None:
+        if not self._data or self.done:
+            self._data.clear()
+            return
+        data = "\n".join(self._data)
+        self._data.clear()
+        if data.strip() == "[DONE]":
+            self.done = True
+            return
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ChatCompletionsError("Provider sent a malformed stream event.") from e
+        if not isinstance(event, dict):
+            raise ChatCompletionsError("Provider sent a malformed stream event.")
+        if "error" in event:
+            raise ChatCompletionsError(f"Provider reported an error mid-stream: {event['error']}")
+        # Some providers open with an event without choices (e.g. content filter results).
+        choices = event.get("choices")
+        if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+            return
+        delta = choices[0].get("delta")
+        content = delta.get("content") if isinstance(delta, dict) else None
+        if not isinstance(content, str) or not content:
+            return
+        if self._ttft is None and self._started is not None:
+            self._ttft = time.monotonic() - self._started
+        self._parts.append(content)
+        if self._accept is None:
+            return
+        for candidate in self._scanner.feed(content):
+            if self._accept(candidate):
+                self._early = True
+                self.done = True
+                return
+
+
+def get_streamed_chat_completion_content(
+    lines: Iterable[str],
+    *,
+    accept: Callable[[str], bool] | None = None,
+    started: float | None = None,
+) -> StreamedCompletion:
+    """Assemble assistant text from the lines of a streamed chat-completions response.
+
+    Stops reading ``lines`` as soon as ``accept`` returns true for a complete JSON
+    object in the content (see :class:`ChatCompletionStream`).
+    """
+    stream = ChatCompletionStream(accept=accept, started=started)
+    for line in lines:
+        if stream.feed(line):
+            break
+    return stream.result()
+
+
+_JSON_SPECIAL = re.compile(r'[{}"\\]')
+# Inside an object only braces and string openings matter; see _object_spans.
+_JSON_TOKEN = re.compile(r'[{}"]')
+_JSON_TOKEN_BYTES = re.compile(rb'[{}"]')
+
+
+class _JsonObjectScanner:
+    """Finds balanced top-level ``{...}`` objects in text that arrives in pieces.
+
+    Braces inside JSON strings (with escapes) are ignored; text between objects, such as
+    code fences or commentary, is skipped.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        # Position of the character escaped by the last backslash seen in a string.
+        self._escaped_at = -1
+        self._start = 0
+
+    def feed(self, text: str) -> list[str]:
+        """Append ``text``; returns the objects completed by it, in order."""
+        base = self._length
+        self._chunks.append(text)
+        self._length += len(text)
+        found: list[str] = []
+        for match in _JSON_SPECIAL.finditer(text):
+            ch = match.group()
+            pos = base + match.start()
+            if self._in_string:
+                if pos == self._escaped_at:
+                    continue
+                if ch == "\\":
+                    self._escaped_at = pos + 1
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = self._depth > 0
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = pos
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    found.append("".join(self._chunks)[self._start : pos + 1])
+        return found
+
+
+def _is_triage_json(text: str) -> bool:
+    try:
+        TriageOutput.model_validate_json(text)
+    except ValidationError:
+        return False
+    return True
+
+
+def triage_messages(*, title: str, body: str) -> list[dict[str, str]]:
+    """Chat messages asking for the triage of one issue."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": triage_prompt(title=title, body=body)},
+    ]
+
+
+def triage_prompt(*, title: str, body: str) -> str:
+    """The user message of :func:`triage_messages`."""
+    return (
+        f"Triage the following GitHub issue.\n\nTitle: {title.strip()}\n\nBody:\n{body.strip()}\n"
+    )
+
+
+def _pack_prompt(issues: Sequence[tuple[str, str]], pack: list[int]) -> str:
+    # Ids are positions within the pack ("1", "2", ...): short and unambiguous.
+    return pack_prompt([(str(n), *issues[index]) for n, index in enumerate(pack, 1)])
+
+
+def _encode_json(value: Any) -> bytes:
+    # The same encoding httpx uses for ``json=`` request bodies.
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode(
+        "utf-8"
+    )
+
+
+@dataclass(frozen=True)
+class RequestTemplate:
+    """A chat-completions request with everything but the user message pre-encoded.
+
+    Built once per adapter, system prompt and stream setting from the adapter's
+    ``_build_request``. :meth:`render` splices the encoded user message between
+    ``prefix`` (payload up to and including the system message) and ``suffix``, and
+    returns ``client.post`` keyword arguments with a ready ``content`` body.
+    """
+
+    # Stand-in messages, located in the encoded payload and replaced by the real ones.
+    SLOT: ClassVar[list[dict[str, str]]] = [{"role": "\x00slot\x00", "content": ""}]
+
+    url: str
+    headers: dict[str, str]
+    params: dict[str, str] | None
+    prefix: bytes
+    suffix: bytes
+
+    @classmethod
+    def from_request(
+        cls, request: dict[str, Any], system_prompt: str, *, stream: bool = False
+    ) -> RequestTemplate:
+        payload = dict(request["json"])
+        if stream:
+            payload["stream"] = True
+        encoded = _encode_json(payload)
+        before, slot, after = encoded.partition(_encode_json(cls.SLOT))
+        if not slot:
+            raise ValueError("_build_request() must send the given messages unchanged.")
+        system = _encode_json({"role": "system", "content": system_prompt})
+        headers = dict(request.get("headers") or {})
+        if not any(name.lower() == "content-type" for name in headers):
+            headers["Content-Type"] = "application/json"
+        return cls(
+            url=request["url"],
+            headers=headers,
+            params=request.get("params"),
+            prefix=before + b"[" + system + b',{"role":"user","content":',
+            suffix=b"}]" + after,
+        )
+
+    def render(self, user_prompt: str) -> dict[str, Any]:
+        """``client.post`` keyword arguments for one request."""
+        content = b"".join((self.prefix, _encode_json(user_prompt), self.suffix))
+        request: dict[str, Any] = {"url": self.url, "headers": self.headers, "content": content}
+        if self.params is not None:
+            request["params"] = self.params
+        return request
+
+
+def _unpack(data: dict[str, Any], pack: list[int]) -> dict[int, TriageOutput]:
+    try:
+        content = get_chat_completion_content(data)
+    except ChatCompletionsError:
+        return {}
+    parsed = parse_pack(content)
+    return {index: parsed[str(n)] for n, index in enumerate(pack, 1) if str(n) in parsed}
+
+
+def http_settings_from_env() -> dict[str, Any]:
+    """Read the knobs shared by the hosted adapters' ``from_env()``.
+
+    - TRIAGE_HTTP_MAX_CONNECTIONS (int, default: 100)
+    - TRIAGE_HTTP_MAX_KEEPALIVE (int, default: 20)
+    - TRIAGE_HTTP2 (true/false, default: false; requires the ``h2`` package)
+    - TRIAGE_STREAM (true/false, default: false; stream replies, see ``ChatCompletionStream``)
+    - TRIAGE_MAX_RETRIES (int, default: 3; 0 disables retries)
+    - TRIAGE_RETRY_BUDGET_S (float, default: 60; total seconds spent waiting per call)
+    - TRIAGE_RATE_LIMIT_RPM / TRIAGE_RATE_LIMIT_TPM (float; requests/tokens per minute)
+    - TRIAGE_MAX_CONCURRENCY (int, default: 64; ceiling for adaptive concurrency)
+    - TRIAGE_BODY_TOKEN_BUDGET (int, default: unset; compact bodies above this many tokens)
+    """
+    settings: dict[str, Any] = {}
+    for env_name, key in (
+        ("TRIAGE_HTTP_MAX_CONNECTIONS", "max_connections"),
+        ("TRIAGE_HTTP_MAX_KEEPALIVE", "max_keepalive_connections"),
+    ):
+        raw = os.getenv(env_name, "").strip()
+        if raw:
+            try:
+                settings[key] = int(raw)
+            except ValueError:
+                pass
+    raw = os.getenv("TRIAGE_BODY_TOKEN_BUDGET", "").strip()
+    if raw:
+        try:
+            settings["body_token_budget"] = max(0, int(raw)) or None
+        except ValueError:
+            pass
+    for env_name, key in (("TRIAGE_HTTP2", "http2"), ("TRIAGE_STREAM", "stream")):
+        raw_flag = os.getenv(env_name)
+        if raw_flag is not None:
+            settings[key] = raw_flag.strip().lower() in {"1", "true", "yes", "on"}
+
+    retry: dict[str, Any] = {}
+    for env_name, key, convert in (
+        ("TRIAGE_MAX_RETRIES", "max_retries", int),
+        ("TRIAGE_RETRY_BUDGET_S", "budget_s", float),
+    ):
+        raw = os.getenv(env_name, "").strip()
+        if raw:
+            try:
+                retry[key] = convert(raw)
+            except ValueError:
+                pass
+    if retry:
+        settings["retry"] = RetryPolicy(**retry)
+
+    limits: dict[str, Any] = {}
+    for env_name, key, convert in (
+        ("TRIAGE_RATE_LIMIT_RPM", "requests_per_minute", float),
+        ("TRIAGE_RATE_LIMIT_TPM", "tokens_per_minute", float),
+        ("TRIAGE_MAX_CONCURRENCY", "max_concurrency", int),
+    ):
+        raw = os.getenv(env_name, "").strip()
+        if raw:
+            try:
+                limits[key] = convert(raw)
+            except ValueError:
+                pass
+    if "max_concurrency" in limits:
+        limits["initial_concurrency"] = min(4, max(1, limits["max_concurrency"]))
+    if limits:
+        settings["limiter"] = AdaptiveLimiter(**limits)
+    return settings
+
+
+def json_object_spans(text: str | bytes) -> Iterator[tuple[int, int]]:
+    """``(start, end)`` of each balanced top-level ``{...}`` in ``text``, in order.
+
+    A single pass that understands JSON strings and escapes, so braces inside string
+    values do not count; text between objects (code fences, commentary) is skipped and an
+    unterminated object yields nothing. Works on ``str`` and on raw ``bytes`` alike, and
+    ``text[start:end]`` can be handed directly to ``model_validate_json``.
+    """
+    if isinstance(text, bytes):
+        return _object_spans(text, _JSON_TOKEN_BYTES, b"{", b'"', b"\\")
+    return _object_spans(text, _JSON_TOKEN, "{", '"', "\\")
+
+
+def _object_spans(
+    text: Any, token: re.Pattern[Any], open_: Any, quote: Any, backslash: Any
+) -> Iterator[tuple[int, int]]:
+    # Skipping uses find() (memchr) rather than a regex character class, which Python
+    # evaluates one character at a time: text outside objects and inside strings, where
+    # long replies spend nearly all their length, is passed over at C speed.
+    start = text.find(open_)
+    while start != -1:
+        depth = 0
+        pos = start
+        while True:
+            match = token.search(text, pos)
+            if match is None:
+                return
+            pos = match.start()
+            ch = match.group()
+            if ch == quote:
+                pos = _string_end(text, pos, quote, backslash)
+                if pos == -1:
+                    return
+            elif ch == open_:
+                depth += 1
+                pos += 1
+            else:
+                depth -= 1
+                pos += 1
+                if depth == 0:
+                    break
+        yield start, pos
+        start = text.find(open_, pos)
+
+
+def _string_end(text: Any, pos: int, quote: Any, backslash: Any) -> int:
+    """Index just past the string starting at ``pos``, or -1 if it is unterminated."""
+    while True:
+        pos = text.find(quote, pos + 1)
+        if pos == -1:
+            return -1
+        escapes = pos
+        while text[escapes - 1 : escapes] == backslash:
+            escapes -= 1
+        if (pos - escapes) % 2 == 0:
+            return pos + 1
 
 
 def extract_json_object(text: str) -> str:
     """Extract the first JSON object from a string.
 
     Many model providers wrap JSON in code fences or add commentary.
-    This helper tries to recover the first ``{...}`` block.
+    This helper returns the first balanced ``{...}`` block (see :func:`json_object_spans`).
 
     Raises:
         ChatCompletionsError: If extraction fails.
     """
-    fenced = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
-    if fenced:
-        return fenced.group(1)
+    for start, end in json_object_spans(text):
+        return text[start:end]
+    raise ChatCompletionsError("Model response did not contain a JSON object.")
+
+
+class _ChatMessage(BaseModel):
+    content: str | list[Any] | None = None
 
-    start = text.find("{")
-    end = text.rfind("}")
-    if start == -1 or end == -1 or end <= start:
-        raise ChatCompletionsError("Model response did not contain a JSON object.")
-    return text[start : end + 1]
+
+class _ChatChoice(BaseModel):
+    message: _ChatMessage
+
+
+class _ChatCompletion(BaseModel):
+    """The only part of a chat-completions response the adapters read."""
+
+    choices: list[_ChatChoice]
 
 
 def get_chat_completion_content(data: dict[str, Any]) -> str:
@@ -44,7 +1153,10 @@ def get_chat_completion_content(data: dict[str, Any]) -> str:
         content = message["content"]
     except Exception as e:  # pragma: no cover
         raise ChatCompletionsError(f"Unexpected response structure: {e}") from e
+    return _text_content(content)
+
 
+def _text_content(content: Any) -> str:
     # Some APIs may return content as a list of parts; attempt a best-effort
     # flattening into a single string.
     if isinstance(content, list):
@@ -0,0 +1,164 @@
+"""Token-budgeted compaction of issue bodies before they are sent to a model.
+
+Issue bodies often carry pasted logs and stack traces thousands of lines long, while
+most of the triage signal sits in the first and last few hundred lines. Prompt size
+drives both latency and cost, so a body over its token budget is shrunk in stages, each
+applied only while the body is still too large:
+
+1. runs of repeated lines (or repeated groups of up to four lines, such as recursive
+   stack frames) collapse to one copy and a marker; numbers are ignored when comparing,
+   so log lines differing only in timestamps or ids count as repeats
+2. long stack traces keep their first and last frames
+3. long fenced code blocks past the budget are replaced by a marker
+4. the head and tail of what is left are kept, with a marker in between
+
+Bodies within the budget are returned unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+
+from .tokens import CHARS_PER_TOKEN, estimate_tokens
+
+_MIN_REPEATS = 3
+_MAX_PERIOD = 4
+_NUMBER = re.compile(r"\d+")
+
+# A stack frame in Python, Java/JS/.NET, gdb/Rust or "file.ext:line" form.
+_FRAME = re.compile(
+    r'^\s*(?:File ".*", line \d+|at (?:\S+ \(.*\)|[\w$.<>/]+\(.*\)|\S+:\d+)'
+    r"|#\d+\s|\d+:\s+0x|\S+\.[A-Za-z]{1,4}:\d+)"
+)
+_TRACE_MIN_LINES = 30
+_TRACE_HEAD = 8
+_TRACE_TAIL = 12
+
+_FENCE = "```"
+_LONG_CODE_BLOCK_LINES = 20
+
+_HEAD_SHARE = 0.6
+# Room kept for the head/tail marker.
+_MARKER_RESERVE_CHARS = 64
+
+
+def compact_body(body: str, token_budget: int) -> str:
+    """Shrink ``body`` to about ``token_budget`` tokens, keeping the most useful parts."""
+    if token_budget < 1:
+        raise ValueError("token_budget must be >= 1.")
+    if estimate_tokens(body) <= token_budget:
+        return body
+
+    lines = body.splitlines()
+    lines = _collapse_repeats(lines)
+    if _fits(lines, token_budget):
+        return "\n".join(lines)
+    lines = _trim_traces(lines)
+    if _fits(lines, token_budget):
+        return "\n".join(lines)
+    lines = _drop_code_blocks(lines, token_budget)
+    if _fits(lines, token_budget):
+        return "\n".join(lines)
+    return _head_and_tail("\n".join(lines), token_budget)
+
+
+def _tokens(lines: list[str]) -> int:
+    return estimate_tokens("\n".join(lines))
+
+
+def _fits(lines: list[str], token_budget: int) -> bool:
+    return _tokens(lines) <= token_budget
+
+
+def _collapse_repeats(lines: list[str]) -> list[str]:
+    keys = [_NUMBER.sub("0", line.strip()) for line in lines]
+    out: list[str] = []
+    i, n = 0, len(lines)
+    while i < n:
+        best_reps, best_period = 1, 1
+        for period in range(1, _MAX_PERIOD + 1):
+            block = keys[i : i + period]
+            reps = 1
+            while keys[i + reps * period : i + (reps + 1) * period] == block:
+                reps += 1
+            if reps >= _MIN_REPEATS and reps * period > best_reps * best_period:
+                best_reps, best_period = reps, period
+        if best_reps == 1:
+            out.append(lines[i])
+            i += 1
+            continue
+        out.extend(lines[i : i + best_period])
+        if any(keys[i : i + best_period]):
+            what = "line" if best_period == 1 else f"{best_period} lines"
+            out.append(f"[... previous {what} repeated {best_reps - 1} more times ...]")
+        i += best_reps * best_period
+    return out
+
+
+def _trim_traces(lines: list[str]) -> list[str]:
+    out: list[str] = []
+    i, n = 0, len(lines)
+    while i < n:
+        if not _FRAME.match(lines[i]):
+            out.append(lines[i])
+            i += 1
+            continue
+        # A trace: frame lines plus the indented source lines between them.
+        j = i + 1
+        while j < n and (
+            _FRAME.match(lines[j]) or (lines[j][:1] in (" ", "\t") and lines[j].strip())
+        ):
+            j += 1
+        trace = lines[i:j]
+        if len(trace) > _TRACE_MIN_LINES:
+            omitted = len(trace) - _TRACE_HEAD - _TRACE_TAIL
+            out.extend(trace[:_TRACE_HEAD])
+            out.append(f"[... {omitted} stack trace lines omitted ...]")
+            out.extend(trace[-_TRACE_TAIL:])
+        else:
+            out.extend(trace)
+        i = j
+    return out
+
+
+def _drop_code_blocks(lines: list[str], token_budget: int) -> list[str]:
+    out: list[str] = []
+    used = 0
+    i, n = 0, len(lines)
+    while i < n:
+        if not lines[i].lstrip().startswith(_FENCE):
+            out.append(lines[i])
+            used += _tokens([lines[i]])
+            i += 1
+            continue
+        end = i + 1
+        while end < n and not lines[end].lstrip().startswith(_FENCE):
+            end += 1
+        block = lines[i : end + 1]
+        cost = _tokens(block)
+        inner = len(block) - 2
+        if inner > _LONG_CODE_BLOCK_LINES and used + cost > token_budget:
+            block = [f"[... code block of {inner} lines omitted ...]"]
+            cost = _tokens(block)
+        out.extend(block)
+        used += cost
+        i = end + 1
+    return out
+
+
+def _head_and_tail(text: str, token_budget: int) -> str:
+    limit = token_budget * CHARS_PER_TOKEN - _MARKER_RESERVE_CHARS
+    if limit <= 0:
+        return text[: token_budget * CHARS_PER_TOKEN]
+    head_end = int(limit * _HEAD_SHARE)
+    tail_start = len(text) - (limit - head_end)
+    # Cut at line boundaries when one is reasonably close.
+    newline = text.rfind("\n", 0, head_end)
+    if newline > head_end // 2:
+        head_end = newline
+    newline = text.find("\n", tail_start, len(text))
+    if newline != -1 and newline - tail_start < (len(text) - tail_start) // 2:
+        tail_start = newline + 1
+    omitted = text.count("\n", head_end, tail_start)
+    marker = f"\n[... {omitted} lines omitted ...]\n"
+    return text[:head_end] + marker + text[tail_start:]
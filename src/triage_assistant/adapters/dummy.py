@@ -1,81 +1,13 @@
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
-
-from ..schema import IssueType, Priority, TriageOutput
-
-_BUG_HINTS = [
-    "bug",
-    "crash",
-    "crashes",
-    "exception",
-    "traceback",
-    "stack trace",
-    "segfault",
-    "panic",
-    "error",
-    "fails",
-    "failure",
-    "broken",
-    "doesn't work",
-    "does not work",
-    "regression",
-]
-
-_DOCS_HINTS = [
-    "docs",
-    "documentation",
-    "readme",
-    "typo",
-    "spelling",
-    "grammar",
-    "example is wrong",
-]
-
-_QUESTION_HINTS = [
-    "how do i",
-    "how to",
-    "is it possible",
-    "can i",
-    "question",
-    "help",
-]
-
-_SEVERITY_HINTS_P0 = [
-    "security",
-    "vulnerability",
-    "data loss",
-    "lost data",
-    "rce",
-    "remote code execution",
-    "crash on startup",
-    "cannot start",
-    "unusable",
-    "blocks",
-    "blocking",
-    "urgent",
-    "p0",
-]
-
-_REPRO_MARKERS = [
-    "steps to reproduce",
-    "reproduce",
-    "repro",
-    "minimal reproduction",
-    "mre",
-]
-
-
-def _contains_any(text: str, needles: list[str]) -> bool:
-    return any(n in text for n in needles)
-
-
-def _has_repro(body_lower: str) -> bool:
-    if _contains_any(body_lower, _REPRO_MARKERS):
-        return True
-    # A tiny heuristic: numbered steps are often reproduction steps.
-    return bool(re.search(r"\n\s*\d+\.", body_lower))
+import os
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..schema import TriageOutput
+from .rules import RuleSet, RulesFile, ScanWindow, default_rules
 
 
 @dataclass(frozen=True)
@@ -87,118 +19,129 @@ class DummyAdapter:
     - stable behavior for tests and for workshop bootstrapping
 
     It is intentionally *simple* and therefore imperfect.
+
+    The keywords and decision order live in a rules file (see ``rules.py``). By default
+    the built-in ``default_rules.toml`` is used.
+
+    Environment variables supported by ``from_env()``:
+
+    - TRIAGE_RULES_FILE (optional; a TOML/JSON rules file, reloaded when it changes)
+    - TRIAGE_RULES_CACHE_DIR (optional; where compiled rules files are cached)
+    - TRIAGE_SCAN_CHUNK_CHARS (optional; scan bodies in chunks of this many characters)
+    - TRIAGE_SCAN_HEAD_CHARS / TRIAGE_SCAN_TAIL_CHARS (optional; only scan the start/end)
+
+    Set ``scan_window`` to bound memory on very large bodies (see ``ScanWindow``).
     """
 
-    def triage(self, *, title: str, body: str) -> TriageOutput:
-        title = title.strip()
-        body = body.strip()
+    rules: RuleSet | RulesFile = field(default_factory=default_rules)
+    scan_window: ScanWindow | None = None
+
+    @staticmethod
+    def from_env() -> DummyAdapter:
+        rules: RuleSet | RulesFile = default_rules()
+        rules_file = os.getenv("TRIAGE_RULES_FILE", "").strip()
+        if rules_file:
+            cache_dir = os.getenv("TRIAGE_RULES_CACHE_DIR", "").strip()
+            rules = RulesFile(Path(rules_file), cache_dir=Path(cache_dir) if cache_dir else None)
+
+        scan_window: ScanWindow | None = None
+        chunk_chars = _get_int_env("TRIAGE_SCAN_CHUNK_CHARS")
+        head_chars = _get_int_env("TRIAGE_SCAN_HEAD_CHARS")
+        tail_chars = _get_int_env("TRIAGE_SCAN_TAIL_CHARS")
+        if chunk_chars is not None or head_chars is not None or tail_chars is not None:
+            scan_window = ScanWindow(
+                chunk_chars=chunk_chars or ScanWindow.chunk_chars,
+                head_chars=head_chars,
+                tail_chars=tail_chars,
+            )
+
+        return DummyAdapter(rules=rules, scan_window=scan_window)
 
-        combined_lower = f"{title}\n{body}".casefold()
-        title_lower = title.casefold()
-        body_lower = body.casefold()
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        rules = self.rules.current()
+        return rules.decode(*rules.classify(title=title, body=body, window=self.scan_window))
 
-        issue_type = self._classify_type(title_lower=title_lower, body_lower=body_lower)
-        priority = self._classify_priority(issue_type=issue_type, combined_lower=combined_lower)
+    def triage_with_confidence(self, *, title: str, body: str) -> tuple[TriageOutput, float]:
+        """Return :meth:`triage`'s result and a 0-1 confidence score for its type.
 
-        labels = self._suggest_labels(
-            issue_type=issue_type,
-            priority=priority,
-            title_lower=title_lower,
-            body_lower=body_lower,
+        See ``RuleSet.classify_with_confidence`` for how the score is derived.
+        """
+        rules = self.rules.current()
+        decision, confidence = rules.classify_with_confidence(
+            title=title, body=body, window=self.scan_window
         )
+        return rules.decode(*decision), confidence
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        """Async wrapper around :meth:`triage`; rule evaluation never blocks on I/O."""
+        return self.triage(title=title, body=body)
+
+    def triage_many(self, titles: Iterable[str], bodies: Iterable[str]) -> TriageColumns:
+        """Triage a batch of issues given as parallel title/body columns.
+
+        Any iterable of strings works as a column (lists, NumPy string arrays, ...).
+        Results come back as compact integer columns instead of one ``TriageOutput``
+        per issue, which skips model validation and rationale formatting for the
+        whole batch. ``TriageColumns.output(i)`` decodes a row into exactly what
+        :meth:`triage` returns for the same input.
+
+        The whole batch is classified with one rule set, even if the rules file is
+        reloaded meanwhile.
+
+        Raises:
+            ValueError: If the columns have different lengths.
+        """
+        rules = self.rules.current()
+        types = array("B")
+        priorities = array("B")
+        labels = array("Q")  # rules.MAX_LABELS bits
+        classify = rules.classify
+        window = self.scan_window
+        for title, body in zip(titles, bodies, strict=True):
+            type_code, priority_code, label_mask = classify(title=title, body=body, window=window)
+            types.append(type_code)
+            priorities.append(priority_code)
+            labels.append(label_mask)
+        return TriageColumns(types=types, priorities=priorities, labels=labels, rules=rules)
+
+
+@dataclass(frozen=True)
+class TriageColumns:
+    """Columnar results of :meth:`DummyAdapter.triage_many`.
+
+    - ``types``: one code per issue, an index into ``rules.TYPES``
+    - ``priorities``: one code per issue, an index into ``rules.PRIORITIES``
+    - ``labels``: one 64-bit mask per issue; bit ``i`` set means ``label_names[i]`` applies
+
+    The columns are ``array.array`` instances, so they support the buffer protocol
+    (for example ``numpy.frombuffer(cols.types, dtype=numpy.uint8)`` without a copy).
+    """
+
+    types: array[int]
+    priorities: array[int]
+    labels: array[int]
+    rules: RuleSet = field(repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @property
+    def label_names(self) -> tuple[str, ...]:
+        return self.rules.labels
+
+    def output(self, index: int) -> TriageOutput:
+        """Decode one row into the ``TriageOutput`` that ``DummyAdapter.triage`` returns."""
+        return self.rules.decode(self.types[index], self.priorities[index], self.labels[index])
+
+    def outputs(self) -> list[TriageOutput]:
+        return [self.output(i) for i in range(len(self))]
 
-        rationale = self._build_rationale(
-            issue_type=issue_type,
-            priority=priority,
-            title=title,
-            body=body,
-        )
 
-        return TriageOutput(type=issue_type, priority=priority, labels=labels, rationale=rationale)
-
-    def _classify_type(self, *, title_lower: str, body_lower: str) -> IssueType:
-        # Docs first: docs issues often include "README", "docs", etc.
-        if _contains_any(title_lower, _DOCS_HINTS) or _contains_any(body_lower, _DOCS_HINTS):
-            return IssueType.docs
-
-        # Explicit questions: prefer "question" when the user is asking how/what.
-        if _contains_any(title_lower, _QUESTION_HINTS) or _contains_any(
-            body_lower, _QUESTION_HINTS
-        ):
-            # If the text also clearly signals a bug, treat it as a bug.
-            if _contains_any(title_lower, _BUG_HINTS) or _contains_any(body_lower, _BUG_HINTS):
-                return IssueType.bug
-            return IssueType.question
-
-        # Bug signals
-        if _contains_any(title_lower, _BUG_HINTS) or _contains_any(body_lower, _BUG_HINTS):
-            return IssueType.bug
-
-        # Default
-        return IssueType.feature
-
-    def _classify_priority(self, *, issue_type: IssueType, combined_lower: str) -> Priority:
-        if _contains_any(combined_lower, _SEVERITY_HINTS_P0):
-            return Priority.p0
-
-        if issue_type == IssueType.bug:
-            return Priority.p1
-
-        # Docs and questions are usually not urgent by default.
-        return Priority.p2
-
-    def _suggest_labels(
-        self,
-        *,
-        issue_type: IssueType,
-        priority: Priority,
-        title_lower: str,
-        body_lower: str,
-    ) -> list[str]:
-        labels: list[str] = []
-        labels.append(issue_type.value)
-        labels.append(priority.value)
-
-        if issue_type == IssueType.bug:
-            if not _has_repro(body_lower):
-                labels.append("needs-repro")
-            if "version" not in body_lower and "commit" not in body_lower:
-                labels.append("needs-env-info")
-
-        if issue_type == IssueType.question:
-            if len(body_lower) < 120:
-                labels.append("needs-info")
-
-        if issue_type == IssueType.docs:
-            if _contains_any(body_lower, ["typo", "spelling", "grammar"]):
-                labels.append("good-first-issue")
-
-        if issue_type == IssueType.feature:
-            if (
-                _contains_any(title_lower, ["support", "add", "implement"])
-                and priority == Priority.p2
-            ):
-                labels.append("enhancement")
-
-        return labels
-
-    def _build_rationale(
-        self,
-        *,
-        issue_type: IssueType,
-        priority: Priority,
-        title: str,
-        body: str,
-    ) -> str:
-        # Keep it short and stable.
-        parts: list[str] = []
-        parts.append(f"Classified as '{issue_type.value}' based on the title/body wording.")
-        if priority == Priority.p0:
-            parts.append("Marked p0 due to severe/urgent keywords.")
-        elif priority == Priority.p1:
-            parts.append("Marked p1 because bug reports are typically high priority.")
-        else:
-            parts.append("Marked p2 as default for non-urgent items.")
-        if issue_type == IssueType.bug and not _has_repro(body.casefold()):
-            parts.append("No clear reproduction steps were detected.")
-        return " ".join(parts)
+def _get_int_env(name: str) -> int | None:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
@@ -0,0 +1,7 @@
+"""Adapter errors, kept free of HTTP imports so callers can catch them cheaply."""
+
+from __future__ import annotations
+
+
+class ChatCompletionsError(RuntimeError):
+    """Raised when a chat-completions based adapter cannot produce a valid result."""
@@ -0,0 +1,235 @@
+"""Provider failover with per-provider circuit breakers.
+
+A :class:`FailoverAdapter` tries an ordered chain of adapters (for example GitHub Models,
+then Foundry, then the offline rules) and returns the first result. Each provider has a
+:class:`CircuitBreaker`: after a run of consecutive failures the provider is skipped
+outright instead of making every call wait out its timeout, and a single probe call is
+let through on a back-off schedule to find out whether it has recovered.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from ..schema import TriageOutput
+from ..triage import aclose_adapter, atriage_with, close_adapter
+from .errors import ChatCompletionsError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class _Adapter(Protocol):
+    def triage(self, *, title: str, body: str) -> TriageOutput: ...
+
+
+class CircuitBreaker:
+    """Tracks the health of one provider.
+
+    - closed: calls go through; ``failure_threshold`` consecutive failures open it
+    - open: calls are refused until ``reset_timeout_s`` has passed
+    - half-open: one probe call goes through; success closes the breaker, failure opens
+      it again for twice as long (up to ``max_reset_timeout_s``)
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout_s: float = 30.0,
+        max_reset_timeout_s: float = 300.0,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1.")
+        if reset_timeout_s <= 0 or max_reset_timeout_s < reset_timeout_s:
+            raise ValueError("Expected 0 < reset_timeout_s <= max_reset_timeout_s.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.max_reset_timeout_s = max_reset_timeout_s
+        self._state = CLOSED
+        self._failures = 0
+        self._timeout = reset_timeout_s
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # A copy starts closed: health is observed per process.
+        return _new_breaker, (
+            self.failure_threshold,
+            self.reset_timeout_s,
+            self.max_reset_timeout_s,
+        )
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now. Admits at most one probe at a time."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._timeout = self.reset_timeout_s
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout_s)
+                self._open()
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def abandon(self) -> None:
+        """The call was cancelled: neither success nor failure. A probe is retried soon."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = OPEN
+                self._retry_at = time.monotonic()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._retry_at = time.monotonic() + self._timeout
+
+
+def _new_breaker(
+    failure_threshold: int, reset_timeout_s: float, max_reset_timeout_s: float
+) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=failure_threshold,
+        reset_timeout_s=reset_timeout_s,
+        max_reset_timeout_s=max_reset_timeout_s,
+    )
+
+
+@dataclass(frozen=True)
+class FailoverAdapter:
+    """Try an ordered chain of adapters, routing around providers that are down.
+
+    Any exception from a provider counts as a failure and the next provider is tried.
+    When every provider fails (or is skipped by an open breaker), a
+    ``ChatCompletionsError`` describing each provider is raised.
+
+    Hosted adapters retry throttled requests before failing; lower TRIAGE_MAX_RETRIES
+    or TRIAGE_RETRY_BUDGET_S to fail over sooner.
+
+    Environment variables supported by ``from_env()``:
+
+    - TRIAGE_BREAKER_FAILURES (int, default: 3; consecutive failures that open a breaker)
+    - TRIAGE_BREAKER_RESET_S (float, default: 30; first wait before probing again)
+    """
+
+    adapters: tuple[_Adapter, ...]
+    failure_threshold: int = 3
+    reset_timeout_s: float = 30.0
+    _breakers: tuple[CircuitBreaker, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.adapters:
+            raise ValueError("FailoverAdapter needs at least one adapter.")
+        object.__setattr__(self, "adapters", tuple(self.adapters))
+        breakers = tuple(
+            CircuitBreaker(
+                failure_threshold=self.failure_threshold,
+                reset_timeout_s=self.reset_timeout_s,
+                max_reset_timeout_s=max(self.reset_timeout_s, 300.0),
+            )
+            for _ in self.adapters
+        )
+        object.__setattr__(self, "_breakers", breakers)
+
+    @staticmethod
+    def from_env(adapters: Sequence[_Adapter]) -> FailoverAdapter:
+        settings: dict[str, Any] = {}
+        for env_name, key, convert in (
+            ("TRIAGE_BREAKER_FAILURES", "failure_threshold", int),
+            ("TRIAGE_BREAKER_RESET_S", "reset_timeout_s", float),
+        ):
+            raw = os.getenv(env_name, "").strip()
+            if raw:
+                try:
+                    settings[key] = convert(raw)
+                except ValueError:
+                    pass
+        return FailoverAdapter(adapters=tuple(adapters), **settings)
+
+    @property
+    def breaker_states(self) -> list[tuple[str, str]]:
+        """``(adapter class name, breaker state)`` for each provider, in chain order."""
+        return [
+            (type(adapter).__name__, breaker.state)
+            for adapter, breaker in zip(self.adapters, self._breakers, strict=True)
+        ]
+
+    def close(self) -> None:
+        """Close every provider in the chain."""
+        for adapter in self.adapters:
+            close_adapter(adapter)
+
+    async def aclose(self) -> None:
+        """Close every provider's async connections of the running event loop."""
+        for adapter in self.adapters:
+            await aclose_adapter(adapter)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        errors: list[tuple[_Adapter, Exception]] = []
+        for adapter, breaker in zip(self.adapters, self._breakers, strict=True):
+            if not breaker.allow():
+                continue
+            try:
+                result = adapter.triage(title=title, body=body)
+            except Exception as e:
+                breaker.record_failure()
+                errors.append((adapter, e))
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+            breaker.record_success()
+            return result
+        raise self._exhausted(errors)
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        errors: list[tuple[_Adapter, Exception]] = []
+        for adapter, breaker in zip(self.adapters, self._breakers, strict=True):
+            if not breaker.allow():
+                continue
+            try:
+                result = await atriage_with(adapter, title=title, body=body)
+            except Exception as e:
+                breaker.record_failure()
+                errors.append((adapter, e))
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+            breaker.record_success()
+            return result
+        raise self._exhausted(errors)
+
+    def _exhausted(self, errors: list[tuple[_Adapter, Exception]]) -> ChatCompletionsError:
+        failed = {id(adapter) for adapter, _ in errors}
+        skipped = [type(a).__name__ for a in self.adapters if id(a) not in failed]
+        parts = [f"{type(adapter).__name__}: {e}" for adapter, e in errors]
+        if skipped:
+            parts.append(f"circuit open for {', '.join(skipped)}")
+        error = ChatCompletionsError("All providers failed. " + "; ".join(parts))
+        if errors:
+            error.__cause__ = errors[-1][1]
+        return error
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-import json
 import os
-from dataclasses import dataclass
-from typing import Any
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
 
 import httpx
 
-from ..schema import TriageOutput
-from .chat_completions import ChatCompletionsError, extract_json_object, get_chat_completion_content
+from .chat_completions import (
+    ChatCompletionsError,
+    ClientPool,
+    PooledClientMixin,
+    RetryPolicy,
+    http_settings_from_env,
+    ttft_window,
+)
+from .limiter import AdaptiveLimiter
 
 
 @dataclass(frozen=True)
-class FoundryModelInferenceAdapter:
+class FoundryModelInferenceAdapter(PooledClientMixin):
     """Adapter that calls the Azure AI Model Inference API via a Microsoft Foundry endpoint.
 
     This adapter targets the **Azure AI inference endpoint** described in Microsoft Foundry
@@ -32,12 +39,26 @@ class FoundryModelInferenceAdapter:
     - TRIAGE_TEMPERATURE (float)
     - TRIAGE_SEED (int)
     - TRIAGE_JSON_MODE (true/false)
+    - TRIAGE_HTTP_MAX_CONNECTIONS / TRIAGE_HTTP_MAX_KEEPALIVE (connection pool limits)
+    - TRIAGE_HTTP2 (true/false; requires the ``h2`` package)
+    - TRIAGE_MAX_RETRIES / TRIAGE_RETRY_BUDGET_S (retries on 429/5xx, see ``RetryPolicy``)
+    - TRIAGE_RATE_LIMIT_RPM / TRIAGE_RATE_LIMIT_TPM / TRIAGE_MAX_CONCURRENCY (see
+      ``AdaptiveLimiter``)
+    - TRIAGE_STREAM (true/false, default: false; stream the reply and stop reading at the
+      first schema-valid JSON object)
+    - TRIAGE_BODY_TOKEN_BUDGET (int, default: unset, sending bodies as they are; compact
+      bodies above this many tokens, see ``compaction.compact_body``)
+
+    Connections are pooled per adapter instance and kept alive between calls. Call
+    ``close()`` (or use the adapter as a context manager) when done.
 
     Notes:
     - A "model" in requests usually refers to the **deployment name** in your Foundry resource.
     - This adapter validates the model output against ``TriageOutput``.
     """
 
+    _provider_name: ClassVar[str] = "Foundry"
+
     endpoint: str
     api_key: str
     model: str
@@ -46,6 +67,15 @@ class FoundryModelInferenceAdapter:
     temperature: float = 0.2
     json_mode: bool = True
     seed: int | None = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    http2: bool = False
+    stream: bool = False
+    body_token_budget: int | None = None
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    limiter: AdaptiveLimiter = field(default_factory=AdaptiveLimiter, repr=False, compare=False)
+    _pool: ClientPool = field(default_factory=ClientPool, init=False, repr=False, compare=False)
+    _ttft: deque[float] = field(default_factory=ttft_window, init=False, repr=False, compare=False)
 
     @staticmethod
     def from_env() -> FoundryModelInferenceAdapter:
@@ -77,31 +107,12 @@ class FoundryModelInferenceAdapter:
             temperature=temperature,
             seed=seed,
             json_mode=json_mode,
+            **http_settings_from_env(),
         )
 
-    def triage(self, *, title: str, body: str) -> TriageOutput:
-        system_prompt = (
-            "You are a GitHub issue triage assistant. "
-            "Return ONLY a JSON object that matches the schema. "
-            "Do not wrap the JSON in markdown. "
-            "The JSON must include: type, priority, labels, rationale. "
-            "type is one of: bug, feature, docs, question. "
-            "priority is one of: p0, p1, p2. "
-            "labels is an array of strings. "
-            "rationale is a short string."
-        )
-
-        user_prompt = (
-            "Triage the following GitHub issue.\n\n"
-            f"Title: {title.strip()}\n\n"
-            f"Body:\n{body.strip()}\n"
-        )
-
+    def _build_request(self, messages: list[dict[str, str]]) -> dict[str, Any]:
         payload: dict[str, Any] = {
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            "messages": messages,
             "model": self.model,
             "temperature": self.temperature,
         }
@@ -120,37 +131,27 @@ class FoundryModelInferenceAdapter:
         url = self._build_url()
         params = {"api-version": self.api_version}
 
-        try:
-            with httpx.Client(timeout=self.timeout_s) as client:
-                resp = client.post(url, headers=headers, params=params, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-        except httpx.HTTPStatusError as e:
-            raise ChatCompletionsError(
+        return {"url": url, "headers": headers, "params": params, "json": payload}
+
+    def _error(self, exc: Exception) -> ChatCompletionsError:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return ChatCompletionsError(
                 _format_foundry_http_status_error(
-                    status_code=e.response.status_code,
-                    reason=e.response.reason_phrase,
+                    status_code=exc.response.status_code,
+                    reason=exc.response.reason_phrase,
                     endpoint=self.endpoint,
                     model=self.model,
                     api_version=self.api_version,
                 )
-            ) from e
-        except httpx.RequestError as e:
-            raise ChatCompletionsError(
-                _format_foundry_request_error(exc=e, endpoint=self.endpoint)
-            ) from e
-        except json.JSONDecodeError as e:
-            raise ChatCompletionsError(
-                "Foundry returned a non-JSON response. "
-                "Verify TRIAGE_FOUNDRY_ENDPOINT, TRIAGE_FOUNDRY_MODEL, and TRIAGE_FOUNDRY_API_VERSION."
-            ) from e
-
-        content = get_chat_completion_content(data)
-        json_text = extract_json_object(content)
-        try:
-            return TriageOutput.model_validate_json(json_text)
-        except Exception as e:  # pragma: no cover
-            raise ChatCompletionsError(f"Foundry output failed schema validation: {e}") from e
+            )
+        if isinstance(exc, httpx.RequestError):
+            return ChatCompletionsError(
+                _format_foundry_request_error(exc=exc, endpoint=self.endpoint)
+            )
+        return ChatCompletionsError(
+            "Foundry returned a non-JSON response. "
+            "Verify TRIAGE_FOUNDRY_ENDPOINT, TRIAGE_FOUNDRY_MODEL, and TRIAGE_FOUNDRY_API_VERSION."
+        )
 
     def _build_url(self) -> str:
         base = self.endpoint.rstrip("/")
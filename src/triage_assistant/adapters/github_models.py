@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-import json
 import os
-from dataclasses import dataclass
-from typing import Any
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
 
 import httpx
 
-from ..schema import TriageOutput
-from .chat_completions import ChatCompletionsError, extract_json_object, get_chat_completion_content
+from .chat_completions import (
+    ChatCompletionsError,
+    ClientPool,
+    PooledClientMixin,
+    RetryPolicy,
+    http_settings_from_env,
+    ttft_window,
+)
+from .limiter import AdaptiveLimiter
 
 
 @dataclass(frozen=True)
-class GitHubModelsAdapter:
+class GitHubModelsAdapter(PooledClientMixin):
     """Adapter that calls the GitHub Models inference REST API.
 
     Environment variables supported by ``from_env()``:
@@ -28,12 +35,26 @@ class GitHubModelsAdapter:
     - TRIAGE_TEMPERATURE (float)
     - TRIAGE_SEED (int)
     - TRIAGE_JSON_MODE (true/false)
+    - TRIAGE_HTTP_MAX_CONNECTIONS / TRIAGE_HTTP_MAX_KEEPALIVE (connection pool limits)
+    - TRIAGE_HTTP2 (true/false; requires the ``h2`` package)
+    - TRIAGE_MAX_RETRIES / TRIAGE_RETRY_BUDGET_S (retries on 429/5xx, see ``RetryPolicy``)
+    - TRIAGE_RATE_LIMIT_RPM / TRIAGE_RATE_LIMIT_TPM / TRIAGE_MAX_CONCURRENCY (see
+      ``AdaptiveLimiter``)
+    - TRIAGE_STREAM (true/false, default: false; stream the reply and stop reading at the
+      first schema-valid JSON object)
+    - TRIAGE_BODY_TOKEN_BUDGET (int, default: unset, sending bodies as they are; compact
+      bodies above this many tokens, see ``compaction.compact_body``)
+
+    Connections are pooled per adapter instance and kept alive between calls. Call
+    ``close()`` (or use the adapter as a context manager) when done.
 
     Notes:
     - This adapter is intentionally thin: it validates the final JSON against
       ``TriageOutput`` so the CLI always emits schema-valid JSON.
     """
 
+    _provider_name: ClassVar[str] = "GitHub Models"
+
     token: str
     model: str = "openai/gpt-4.1"
     org: str | None = None
@@ -43,6 +64,15 @@ class GitHubModelsAdapter:
     temperature: float = 0.2
     json_mode: bool = True
     seed: int | None = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    http2: bool = False
+    stream: bool = False
+    body_token_budget: int | None = None
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    limiter: AdaptiveLimiter = field(default_factory=AdaptiveLimiter, repr=False, compare=False)
+    _pool: ClientPool = field(default_factory=ClientPool, init=False, repr=False, compare=False)
+    _ttft: deque[float] = field(default_factory=ttft_window, init=False, repr=False, compare=False)
 
     @staticmethod
     def from_env() -> GitHubModelsAdapter:
@@ -68,32 +98,13 @@ class GitHubModelsAdapter:
             temperature=temperature,
             seed=seed,
             json_mode=json_mode,
+            **http_settings_from_env(),
         )
 
-    def triage(self, *, title: str, body: str) -> TriageOutput:
-        system_prompt = (
-            "You are a GitHub issue triage assistant. "
-            "Return ONLY a JSON object that matches the schema. "
-            "Do not wrap the JSON in markdown. "
-            "The JSON must include: type, priority, labels, rationale. "
-            "type is one of: bug, feature, docs, question. "
-            "priority is one of: p0, p1, p2. "
-            "labels is an array of strings. "
-            "rationale is a short string."
-        )
-
-        user_prompt = (
-            "Triage the following GitHub issue.\n\n"
-            f"Title: {title.strip()}\n\n"
-            f"Body:\n{body.strip()}\n"
-        )
-
+    def _build_request(self, messages: list[dict[str, str]]) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            "messages": messages,
             "temperature": self.temperature,
         }
 
@@ -110,39 +121,29 @@ class GitHubModelsAdapter:
             "Content-Type": "application/json",
         }
 
-        try:
-            with httpx.Client(timeout=self.timeout_s) as client:
-                resp = client.post(self._build_url(), headers=headers, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-        except httpx.HTTPStatusError as e:
-            raise ChatCompletionsError(
+        return {"url": self._build_url(), "headers": headers, "json": payload}
+
+    def _error(self, exc: Exception) -> ChatCompletionsError:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return ChatCompletionsError(
                 _format_github_models_http_status_error(
-                    status_code=e.response.status_code,
-                    reason=e.response.reason_phrase,
+                    status_code=exc.response.status_code,
+                    reason=exc.response.reason_phrase,
                     model=self.model,
                     org=self.org,
                 )
-            ) from e
-        except httpx.RequestError as e:
-            raise ChatCompletionsError(
+            )
+        if isinstance(exc, httpx.RequestError):
+            return ChatCompletionsError(
                 _format_github_models_request_error(
-                    exc=e,
+                    exc=exc,
                     base_url=self.base_url,
                 )
-            ) from e
-        except json.JSONDecodeError as e:
-            raise ChatCompletionsError(
-                "GitHub Models returned a non-JSON response. "
-                "If this persists, verify TRIAGE_GITHUB_BASE_URL and TRIAGE_GITHUB_MODEL."
-            ) from e
-
-        content = get_chat_completion_content(data)
-        json_text = extract_json_object(content)
-        try:
-            return TriageOutput.model_validate_json(json_text)
-        except Exception as e:  # pragma: no cover
-            raise ChatCompletionsError(f"GitHub Models output failed schema validation: {e}") from e
+            )
+        return ChatCompletionsError(
+            "GitHub Models returned a non-JSON response. "
+            "If this persists, verify TRIAGE_GITHUB_BASE_URL and TRIAGE_GITHUB_MODEL."
+        )
 
     def _build_url(self) -> str:
         base = self.base_url.rstrip("/")
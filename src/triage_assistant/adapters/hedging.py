@@ -0,0 +1,225 @@
+"""Hedged requests: cut tail latency by racing a late request against a duplicate.
+
+Most provider responses arrive quickly, but the slowest few dominate p99. A
+:class:`HedgedAdapter` learns the latency distribution of recent calls; when a call runs
+past the chosen percentile, it sends a duplicate (to the same adapter or a secondary
+provider) and returns whichever schema-valid result arrives first. A credit budget caps
+the fraction of calls that may be hedged, so hedging cannot double quota use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from ..schema import TriageOutput
+from ..triage import aclose_adapter, atriage_with, close_adapter
+
+# Recent latencies used to estimate the hedge deadline.
+_LATENCY_WINDOW = 256
+# Below this many samples the percentile is too noisy; ``initial_delay_s`` is used.
+_MIN_SAMPLES = 20
+# Hedge credits saved up at most, i.e. the largest burst of back-to-back hedges.
+_MAX_CREDITS = 10.0
+
+
+class _Adapter(Protocol):
+    def triage(self, *, title: str, body: str) -> TriageOutput: ...
+
+
+class _HedgeState:
+    """Latency window and hedge credits of one ``HedgedAdapter``."""
+
+    def __init__(self) -> None:
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._credits = 0.0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[_HedgeState], tuple[()]]:
+        return _HedgeState, ()
+
+    def latencies(self) -> list[float]:
+        with self._lock:
+            return list(self._latencies)
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def earn(self, max_rate: float) -> None:
+        """Every call, fast or slow, earns ``max_rate`` hedge credits."""
+        with self._lock:
+            self._credits = min(_MAX_CREDITS, self._credits + max_rate)
+
+    def try_hedge(self) -> bool:
+        """Spend a hedge credit if one is available."""
+        with self._lock:
+            if self._credits < 1.0:
+                return False
+            self._credits -= 1.0
+            self.hedges += 1
+            return True
+
+
+@dataclass(frozen=True)
+class HedgedAdapter:
+    """Send a duplicate request when the first one is slower than usual.
+
+    Args:
+        primary: The adapter every call goes to first.
+        secondary: Where the duplicate goes; ``None`` sends it to ``primary`` again.
+        percentile: The hedge deadline is this percentile of recent call latencies.
+        initial_delay_s: The deadline until enough latencies have been observed.
+        max_hedge_rate: At most this fraction of calls is hedged (0.1 = 10%).
+
+    The first successful result wins. If one request fails, the other is still awaited;
+    the call only fails when both do (with the primary's error). With ``atriage`` the
+    losing request is cancelled. ``triage`` runs each request in a thread of its own, so a
+    hedge never waits behind other calls' requests; a request already in progress cannot
+    be interrupted, so the loser finishes in the background and its result is discarded.
+
+    Environment variables supported by ``from_env()``:
+
+    - TRIAGE_HEDGE_PERCENTILE (float, default: 0.95)
+    - TRIAGE_HEDGE_INITIAL_DELAY_S (float, default: 2.0)
+    - TRIAGE_HEDGE_MAX_RATE (float, default: 0.1)
+    """
+
+    primary: _Adapter
+    secondary: _Adapter | None = None
+    percentile: float = 0.95
+    initial_delay_s: float = 2.0
+    max_hedge_rate: float = 0.1
+    _state: _HedgeState = field(default_factory=_HedgeState, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        if not 0 <= self.max_hedge_rate <= 1:
+            raise ValueError("max_hedge_rate must be between 0 and 1.")
+        if self.initial_delay_s < 0:
+            raise ValueError("initial_delay_s must be >= 0.")
+
+    @staticmethod
+    def from_env(primary: _Adapter, secondary: _Adapter | None = None) -> HedgedAdapter:
+        settings: dict[str, Any] = {}
+        for env_name, key in (
+            ("TRIAGE_HEDGE_PERCENTILE", "percentile"),
+            ("TRIAGE_HEDGE_INITIAL_DELAY_S", "initial_delay_s"),
+            ("TRIAGE_HEDGE_MAX_RATE", "max_hedge_rate"),
+        ):
+            raw = os.getenv(env_name, "").strip()
+            if raw:
+                try:
+                    settings[key] = float(raw)
+                except ValueError:
+                    pass
+        return HedgedAdapter(primary=primary, secondary=secondary, **settings)
+
+    @property
+    def hedge_count(self) -> int:
+        """How many calls have sent a duplicate request so far."""
+        return self._state.hedges
+
+    def close(self) -> None:
+        """Close ``primary`` and ``secondary``."""
+        for adapter in self._adapters():
+            close_adapter(adapter)
+
+    async def aclose(self) -> None:
+        """Close both adapters' async connections of the running event loop."""
+        for adapter in self._adapters():
+            await aclose_adapter(adapter)
+
+    def _adapters(self) -> list[_Adapter]:
+        if self.secondary is None or self.secondary is self.primary:
+            return [self.primary]
+        return [self.primary, self.secondary]
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        state = self._state
+        started = time.monotonic()
+        state.earn(self.max_hedge_rate)
+        primary = _start(self.primary.triage, title=title, body=body)
+        done, _ = wait([primary], timeout=self._deadline())
+        if done or not state.try_hedge():
+            result = primary.result()
+        else:
+            backup = self.secondary or self.primary
+            hedge = _start(backup.triage, title=title, body=body)
+            result = _first_success([primary, hedge])
+        state.record(time.monotonic() - started)
+        return result
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        state = self._state
+        started = time.monotonic()
+        state.earn(self.max_hedge_rate)
+        tasks = [asyncio.ensure_future(atriage_with(self.primary, title=title, body=body))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._deadline())
+            if done or not state.try_hedge():
+                result = await tasks[0]
+            else:
+                backup = self.secondary or self.primary
+                tasks.append(asyncio.ensure_future(atriage_with(backup, title=title, body=body)))
+                result = await _afirst_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # the loser's failure is not an error of this call
+        state.record(time.monotonic() - started)
+        return result
+
+    def _deadline(self) -> float:
+        latencies = self._state.latencies()
+        if len(latencies) < _MIN_SAMPLES:
+            return self.initial_delay_s
+        latencies.sort()
+        return latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))]
+
+
+def _start(fn: Callable[..., TriageOutput], /, **kwargs: str) -> Future[TriageOutput]:
+    """Run ``fn`` in a new daemon thread; a shared pool would queue hedges under load."""
+    future: Future[TriageOutput] = Future()
+
+    def run() -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(**kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="triage-hedge", daemon=True).start()
+    return future
+
+
+def _first_success(futures: Sequence[Future[TriageOutput]]) -> TriageOutput:
+    pending = set(futures)
+    while pending:
+        _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        # Check in submission order, so the primary wins a tie and its error is reported.
+        for future in futures:
+            if future.done() and future.exception() is None:
+                return future.result()
+    return futures[0].result()
+
+
+async def _afirst_success(tasks: Sequence[asyncio.Future[TriageOutput]]) -> TriageOutput:
+    pending = set(tasks)
+    while pending:
+        _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task.done() and task.exception() is None:
+                return task.result()
+    return tasks[0].result()
@@ -0,0 +1,266 @@
+"""Client-side rate limiting and adaptive concurrency for hosted providers.
+
+An :class:`AdaptiveLimiter` sits in front of every request an adapter sends:
+
+- optional token buckets cap requests and tokens per minute;
+- an AIMD window caps requests in flight, growing by roughly one per round trip while
+  responses come back fast and halving on 429/503, network errors or a latency spike;
+- ``x-ratelimit-remaining-*`` headers (GitHub Models, Azure, OpenAI) shrink the buckets
+  to what the provider reports and pause sending when a window is exhausted.
+
+Callers can therefore issue many concurrent requests (threads or asyncio) and let the
+limiter find the highest rate the endpoint sustains.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx
+
+# Responses that mean "slow down" rather than "this request is wrong".
+_CONGESTION_STATUSES = frozenset({429, 503})
+# How fast the latency baseline follows slower responses (per successful sample).
+_BASELINE_DRIFT = 0.05
+# Latencies are compared against at least this baseline, so scheduling jitter on very
+# fast responses (local servers, mocks) is not mistaken for congestion.
+_MIN_BASELINE_S = 0.01
+_DEFAULT_PAUSE_S = 1.0
+
+# Reset hints such as "1s", "6m0s" or "250ms".
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0.0 if it is available now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class AdaptiveLimiter:
+    """Token-bucket rate limiting plus AIMD concurrency control for one provider.
+
+    Args:
+        requests_per_minute: Request budget; ``None`` leaves requests unmetered.
+        tokens_per_minute: Token budget, charged with an estimate of each request's
+            size; ``None`` leaves tokens unmetered.
+        initial_concurrency: Requests allowed in flight before any feedback arrives.
+        max_concurrency: Upper bound for the adaptive window.
+        latency_tolerance: A response slower than this multiple of the baseline
+            latency counts as congestion.
+
+    One instance is shared by every call of an adapter (threads and event loops alike).
+    Pass the same instance to several adapters to make them share one budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 64,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be > 0.")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be > 0.")
+        if not 1 <= initial_concurrency <= max_concurrency:
+            raise ValueError("Expected 1 <= initial_concurrency <= max_concurrency.")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be > 1.")
+
+        self._settings: dict[str, Any] = {
+            "requests_per_minute": requests_per_minute,
+            "tokens_per_minute": tokens_per_minute,
+            "initial_concurrency": initial_concurrency,
+            "max_concurrency": max_concurrency,
+            "latency_tolerance": latency_tolerance,
+        }
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._max = max_concurrency
+        self._tolerance = latency_tolerance
+        self._window = float(initial_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._baseline: float | None = None
+        self._cond = threading.Condition()
+        # Futures of async waiters, possibly on several event loops; see ``_notify``.
+        self._async_waiters: set[asyncio.Future[None]] = set()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Only the configuration travels; a copy in another process learns afresh.
+        return self._settings
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    @property
+    def concurrency(self) -> int:
+        """Current adaptive limit on requests in flight."""
+        return int(self._window)
+
+    @property
+    def meters_tokens(self) -> bool:
+        return self._tokens is not None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request may be sent; returns its start time for :meth:`observe`."""
+        with self._cond:
+            while True:
+                wait = self._try_acquire(tokens)
+                if wait == 0.0:
+                    return time.monotonic()
+                self._cond.wait(None if math.isinf(wait) else wait)
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Async counterpart of :meth:`acquire`.
+
+        Waits until :meth:`release` or :meth:`observe` frees capacity, or until the
+        bucket refill or pause it is waiting for is due, without polling.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(tokens)
+                if wait == 0.0:
+                    return time.monotonic()
+                woken: asyncio.Future[None] = loop.create_future()
+                self._async_waiters.add(woken)
+            try:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(woken, None if math.isinf(wait) else wait)
+            finally:
+                with self._cond:
+                    self._async_waiters.discard(woken)
+
+    def release(self) -> None:
+        """Free the slot taken by :meth:`acquire`."""
+        with self._cond:
+            self._in_flight -= 1
+            self._notify()
+
+    def observe(self, started: float, response: httpx.Response | None) -> None:
+        """Feed back the outcome of a request (``None`` for a network error)."""
+        now = time.monotonic()
+        latency = now - started
+        with self._cond:
+            if response is not None:
+                self._apply_headers(response.headers, now)
+            if response is None or response.status_code in _CONGESTION_STATUSES:
+                self._decrease(started, now)
+            elif response.status_code < 400:
+                slow = (
+                    self._baseline is not None
+                    and latency > max(self._baseline, _MIN_BASELINE_S) * self._tolerance
+                )
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    self._baseline += (latency - self._baseline) * _BASELINE_DRIFT
+                if slow:
+                    self._decrease(started, now)
+                else:
+                    # Additive increase: about +1 per window's worth of successes.
+                    self._window = min(self._max, self._window + 1.0 / self._window)
+            self._notify()
+
+    def _notify(self) -> None:
+        # Called with ``_cond`` held. Async waiters may sit on other threads' loops.
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, set()
+        for woken in waiters:
+            with contextlib.suppress(RuntimeError):  # the waiter's loop has closed
+                woken.get_loop().call_soon_threadsafe(_resolve, woken)
+
+    def _try_acquire(self, tokens: int) -> float:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._window):
+            return math.inf
+        wait = 0.0
+        if self._requests is not None:
+            wait = self._requests.wait(1, now)
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.wait(tokens, now))
+        if wait > 0.0:
+            return wait
+        if self._requests is not None:
+            self._requests.take(1)
+        if self._tokens is not None:
+            self._tokens.take(tokens)
+        self._in_flight += 1
+        return 0.0
+
+    def _decrease(self, started: float, now: float) -> None:
+        # Requests sent before the last decrease saw the old window; one burst of
+        # failures halves the window once, not once per failed request.
+        if started < self._last_decrease:
+            return
+        self._window = max(1.0, self._window / 2)
+        self._last_decrease = now
+
+    def _apply_headers(self, headers: httpx.Headers, now: float) -> None:
+        for kind, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+            raw = headers.get(f"x-ratelimit-remaining-{kind}")
+            if raw is None:
+                continue
+            try:
+                remaining = float(raw)
+            except ValueError:
+                continue
+            if bucket is not None:
+                bucket.level = min(bucket.level, remaining)
+            if remaining <= 0:
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}", ""))
+                pause = reset if reset is not None else _DEFAULT_PAUSE_S
+                self._paused_until = max(self._paused_until, now + pause)
+
+
+def _resolve(woken: asyncio.Future[None]) -> None:
+    if not woken.done():
+        woken.set_result(None)
+
+
+def parse_duration(raw: str) -> float | None:
+    """Parse a reset hint: plain seconds (``"1.5"``) or a Go-style duration (``"6m0s"``)."""
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(raw)
+    if not parts or "".join(n + u for n, u in parts) != raw:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-import json
 import os
-from dataclasses import dataclass
-from typing import Any
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
 
 import httpx
 
 from ..schema import TriageOutput
-from .chat_completions import ChatCompletionsError, extract_json_object, get_chat_completion_content
+from .batch_jobs import run_batch_job
+from .chat_completions import (
+    ChatCompletionsError,
+    ClientPool,
+    PooledClientMixin,
+    RetryPolicy,
+    http_settings_from_env,
+    ttft_window,
+)
+from .limiter import AdaptiveLimiter
 
 
 class OpenAICompatibleError(ChatCompletionsError):
@@ -16,7 +26,7 @@ class OpenAICompatibleError(ChatCompletionsError):
 
 
 @dataclass(frozen=True)
-class OpenAICompatibleAdapter:
+class OpenAICompatibleAdapter(PooledClientMixin):
     """Adapter that calls an OpenAI-compatible Chat Completions API.
 
     This repository's workshop materials focus on GitHub Models and Microsoft Foundry.
@@ -29,49 +39,61 @@ class OpenAICompatibleAdapter:
     - TRIAGE_OPENAI_API_KEY
     - TRIAGE_OPENAI_MODEL (example: gpt-4o-mini)
 
+    Optional shared knobs:
+
+    - TRIAGE_HTTP_MAX_CONNECTIONS / TRIAGE_HTTP_MAX_KEEPALIVE (connection pool limits)
+    - TRIAGE_HTTP2 (true/false; requires the ``h2`` package)
+    - TRIAGE_MAX_RETRIES / TRIAGE_RETRY_BUDGET_S (retries on 429/5xx, see ``RetryPolicy``)
+    - TRIAGE_RATE_LIMIT_RPM / TRIAGE_RATE_LIMIT_TPM / TRIAGE_MAX_CONCURRENCY (see
+      ``AdaptiveLimiter``)
+    - TRIAGE_STREAM (true/false, default: false; stream the reply and stop reading at the
+      first schema-valid JSON object)
+    - TRIAGE_BODY_TOKEN_BUDGET (int, default: unset, sending bodies as they are; compact
+      bodies above this many tokens, see ``compaction.compact_body``)
+
+    Connections are pooled per adapter instance and kept alive between calls. Call
+    ``close()`` (or use the adapter as a context manager) when done.
+
+    For large offline runs, ``run_batch_job()`` submits the issues through the provider's
+    Batch API (``/v1/files`` + ``/v1/batches``) instead of one request per issue.
+
     Notes:
     - Many providers are "OpenAI-compatible" but differ slightly.
     - This adapter validates output strictly against ``TriageOutput``.
     """
 
+    _provider_name: ClassVar[str] = "OpenAI-compatible"
+    _error_type: ClassVar[type[ChatCompletionsError]] = OpenAICompatibleError
+
     base_url: str
     api_key: str
     model: str
     timeout_s: float = 30.0
     temperature: float = 0.2
     json_mode: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    http2: bool = False
+    stream: bool = False
+    body_token_budget: int | None = None
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    limiter: AdaptiveLimiter = field(default_factory=AdaptiveLimiter, repr=False, compare=False)
+    _pool: ClientPool = field(default_factory=ClientPool, init=False, repr=False, compare=False)
+    _ttft: deque[float] = field(default_factory=ttft_window, init=False, repr=False, compare=False)
 
     @staticmethod
     def from_env() -> OpenAICompatibleAdapter:
         base_url = os.environ["TRIAGE_OPENAI_BASE_URL"].strip()
         api_key = os.environ["TRIAGE_OPENAI_API_KEY"].strip()
         model = os.environ["TRIAGE_OPENAI_MODEL"].strip()
-        return OpenAICompatibleAdapter(base_url=base_url, api_key=api_key, model=model)
-
-    def triage(self, *, title: str, body: str) -> TriageOutput:
-        system_prompt = (
-            "You are a GitHub issue triage assistant. "
-            "Return ONLY a JSON object that matches the schema. "
-            "Do not wrap the JSON in markdown. "
-            "The JSON must include: type, priority, labels, rationale. "
-            "type is one of: bug, feature, docs, question. "
-            "priority is one of: p0, p1, p2. "
-            "labels is an array of strings. "
-            "rationale is a short string."
-        )
-
-        user_prompt = (
-            "Triage the following GitHub issue.\n\n"
-            f"Title: {title.strip()}\n\n"
-            f"Body:\n{body.strip()}\n"
+        return OpenAICompatibleAdapter(
+            base_url=base_url, api_key=api_key, model=model, **http_settings_from_env()
         )
 
+    def _build_request(self, messages: list[dict[str, str]]) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            "messages": messages,
             "temperature": self.temperature,
         }
 
@@ -82,35 +104,31 @@ class OpenAICompatibleAdapter:
         headers = {"Authorization": f"Bearer {self.api_key}"}
         url = self.base_url.rstrip("/") + "/v1/chat/completions"
 
-        try:
-            with httpx.Client(timeout=self.timeout_s) as client:
-                resp = client.post(url, headers=headers, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-        except httpx.HTTPStatusError as e:
-            raise OpenAICompatibleError(
+        return {"url": url, "headers": headers, "json": payload}
+
+    def run_batch_job(
+        self, issues: Sequence[tuple[str, str]], **options: Any
+    ) -> list[TriageOutput]:
+        """Triage ``(title, body)`` pairs with an offline batch job (see ``batch_jobs``)."""
+        return run_batch_job(self, issues, **options)
+
+    def _error(self, exc: Exception) -> ChatCompletionsError:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return OpenAICompatibleError(
                 _format_openai_compatible_http_status_error(
-                    status_code=e.response.status_code,
-                    reason=e.response.reason_phrase,
+                    status_code=exc.response.status_code,
+                    reason=exc.response.reason_phrase,
                     base_url=self.base_url,
                     model=self.model,
                 )
-            ) from e
-        except httpx.RequestError as e:
-            raise OpenAICompatibleError(
-                _format_openai_compatible_request_error(exc=e, base_url=self.base_url)
-            ) from e
-        except json.JSONDecodeError as e:
-            raise OpenAICompatibleError(
-                "Provider returned a non-JSON response. Verify TRIAGE_OPENAI_BASE_URL and TRIAGE_OPENAI_MODEL."
-            ) from e
-
-        content = get_chat_completion_content(data)
-        json_text = extract_json_object(content)
-        try:
-            return TriageOutput.model_validate_json(json_text)
-        except Exception as e:  # pragma: no cover
-            raise OpenAICompatibleError(f"Model output failed schema validation: {e}") from e
+            )
+        if isinstance(exc, httpx.RequestError):
+            return OpenAICompatibleError(
+                _format_openai_compatible_request_error(exc=exc, base_url=self.base_url)
+            )
+        return OpenAICompatibleError(
+            "Provider returned a non-JSON response. Verify TRIAGE_OPENAI_BASE_URL and TRIAGE_OPENAI_MODEL."
+        )
 
 
 def _format_openai_compatible_http_status_error(
@@ -0,0 +1,160 @@
+"""Pack several issues into one chat-completions request.
+
+One request per issue repeats the system prompt and spends a rate-limit slot every
+time. A pack sends up to ``max_pack_size`` issues at once, as long as their estimated
+size (prompt plus expected reply) fits a token budget, and asks for one JSON result per
+issue id. Results that come back missing or invalid, and the issues of a pack whose
+request failed, are re-requested one by one by the adapter, so every issue still gets a
+validated ``TriageOutput``.
+
+Adapters may also offer ``atriage_batch_outcomes``, which returns each issue's result or
+exception instead of failing the whole batch; the server uses it to retry nothing twice.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Sequence
+from typing import Any, Protocol, runtime_checkable
+
+from pydantic import ValidationError
+
+from ..schema import TriageOutput
+from .tokens import estimate_tokens
+
+DEFAULT_PACK_TOKENS = 8000
+DEFAULT_MAX_PACK_SIZE = 16
+
+# Expected reply size per issue, plus the "### Issue N" framing around it.
+_REPLY_TOKENS_PER_ISSUE = 120
+_FRAMING_TOKENS_PER_ISSUE = 16
+
+PACK_SYSTEM_PROMPT = (
+    "You are a GitHub issue triage assistant. "
+    "You will receive several GitHub issues, each introduced by '### Issue <id>'. "
+    'Return ONLY a JSON object of the form {"results": [...]} with exactly one element '
+    "per issue. Do not wrap the JSON in markdown. "
+    "Each element must include: id, type, priority, labels, rationale. "
+    "id is the issue id as a string. "
+    "type is one of: bug, feature, docs, question. "
+    "priority is one of: p0, p1, p2. "
+    "labels is an array of strings. "
+    "rationale is a short string."
+)
+
+
+@runtime_checkable
+class PackingAdapter(Protocol):
+    """An adapter that can triage many issues with fewer requests."""
+
+    def triage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+    ) -> list[TriageOutput]: ...
+
+    async def atriage_batch(
+        self,
+        issues: Sequence[tuple[str, str]],
+        *,
+        token_budget: int = DEFAULT_PACK_TOKENS,
+        max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+        concurrency: int | None = None,
+    ) -> list[TriageOutput]: ...
+
+
+def results_or_raise(outcomes: Sequence[TriageOutput | Exception]) -> list[TriageOutput]:
+    """The results of an ``atriage_batch_outcomes`` call; raises the first failure."""
+    results: list[TriageOutput] = []
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            raise outcome
+        results.append(outcome)
+    return results
+
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
+
+def plan_packs(
+    issues: Sequence[tuple[str, str]],
+    *,
+    token_budget: int = DEFAULT_PACK_TOKENS,
+    max_pack_size: int = DEFAULT_MAX_PACK_SIZE,
+) -> list[list[int]]:
+    """Group issue indexes into packs that fit ``token_budget``, keeping input order.
+
+    Small issues share a pack; an issue too large to share one gets a pack of its own.
+    """
+    if token_budget < 1 or max_pack_size < 1:
+        raise ValueError("token_budget and max_pack_size must be >= 1.")
+    budget = token_budget - estimate_tokens(PACK_SYSTEM_PROMPT)
+    packs: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for index, (title, body) in enumerate(issues):
+        cost = (
+            estimate_tokens(title)
+            + estimate_tokens(body)
+            + _REPLY_TOKENS_PER_ISSUE
+            + _FRAMING_TOKENS_PER_ISSUE
+        )
+        if current and (used + cost > budget or len(current) >= max_pack_size):
+            packs.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def pack_messages(issues: Sequence[tuple[str, str, str]]) -> list[dict[str, str]]:
+    """Chat messages asking for one result per ``(id, title, body)`` issue."""
+    return [
+        {"role": "system", "content": PACK_SYSTEM_PROMPT},
+        {"role": "user", "content": pack_prompt(issues)},
+    ]
+
+
+def pack_prompt(issues: Sequence[tuple[str, str, str]]) -> str:
+    """The user message of :func:`pack_messages`."""
+    sections = [
+        f"### Issue {issue_id}\nTitle: {title.strip()}\n\nBody:\n{body.strip()}\n"
+        for issue_id, title, body in issues
+    ]
+    return "Triage each of the following GitHub issues.\n\n" + "\n".join(sections)
+
+
+def parse_pack(content: str) -> dict[str, TriageOutput]:
+    """Valid results by issue id; malformed elements and unparsable replies are dropped.
+
+    Accepts ``{"results": [...]}``, a bare array, or an object keyed by id.
+    """
+    fenced = _FENCE.search(content)
+    text = fenced.group(1) if fenced else content.strip()
+    try:
+        data: Any = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        data = data["results"]
+    if isinstance(data, dict):
+        data = [{**value, "id": key} for key, value in data.items() if isinstance(value, dict)]
+    if not isinstance(data, list):
+        return {}
+
+    results: dict[str, TriageOutput] = {}
+    for element in data:
+        if not isinstance(element, dict) or "id" not in element:
+            continue
+        fields = {k: v for k, v in element.items() if k != "id"}
+        try:
+            results[str(element["id"])] = TriageOutput.model_validate(fields)
+        except ValidationError:
+            continue
+    return results
@@ -0,0 +1,209 @@
+"""Look up adapters by name without importing them.
+
+Every place that turns a name into an adapter (``--adapter``, ``TRIAGE_PROVIDER``,
+``TRIAGE_PROVIDER_CHAIN``, ``TRIAGE_HEDGE_PROVIDER`` and ``--adapter auto``) goes through
+this registry. An :class:`AdapterSpec` names its adapter as a ``"module:attribute"``
+string, so a module (and httpx, for the hosted adapters) is only imported when its adapter
+is selected.
+
+Third-party packages can add adapters through the ``triage_assistant.adapters`` entry
+point group. The entry point name is the adapter name and its value points at an adapter
+class with a ``from_env()`` staticmethod, or at a zero-argument factory::
+
+    [project.entry-points."triage_assistant.adapters"]
+    my-llm = "my_package.triage:MyLLMAdapter"
+
+Built-in names take precedence over entry points with the same name.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..triage import TriageAdapter
+
+ENTRY_POINT_GROUP = "triage_assistant.adapters"
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    """How to build one adapter, and how to tell whether it is configured.
+
+    - ``target``: ``"module:attribute"``; a class with ``from_env()`` or a factory
+    - ``aliases``: other accepted names (names are matched case-insensitively, ``_`` = ``-``)
+    - ``label``: human-readable name for messages
+    - ``required_env``: environment variables ``from_env()`` needs; each entry lists
+      alternatives, the preferred one first. Only adapters that declare them take part
+      in ``--adapter auto`` detection.
+    - ``hosted``: whether the adapter calls a remote model
+    """
+
+    name: str
+    target: str
+    aliases: tuple[str, ...] = ()
+    label: str = ""
+    required_env: tuple[tuple[str, ...], ...] = ()
+    hosted: bool = True
+
+    def matches(self, name: str) -> bool:
+        return name == self.name or name in self.aliases
+
+    def missing_env(self) -> list[str]:
+        """Required environment variables that are unset, formatted for messages."""
+        missing: list[str] = []
+        for alternatives in self.required_env:
+            if any((os.getenv(var) or "").strip() for var in alternatives):
+                continue
+            first, *rest = alternatives
+            missing.append(f"{first} (or {', '.join(rest)})" if rest else first)
+        return missing
+
+    def load(self) -> Any:
+        """Import and return the target (a class or factory)."""
+        module, _, attribute = self.target.partition(":")
+        return getattr(import_module(module), attribute)
+
+    def create(self) -> TriageAdapter:
+        """Build the adapter from the environment.
+
+        Raises:
+            KeyError: If a required environment variable is missing.
+        """
+        target = self.load()
+        from_env = getattr(target, "from_env", None)
+        adapter: TriageAdapter = from_env() if from_env is not None else target()
+        return adapter
+
+
+BUILTIN_ADAPTERS: tuple[AdapterSpec, ...] = (
+    AdapterSpec(
+        name="github",
+        target="triage_assistant.adapters.github_models:GitHubModelsAdapter",
+        aliases=("github-models",),
+        label="GitHub Models",
+        required_env=(("TRIAGE_GITHUB_TOKEN", "GITHUB_TOKEN"),),
+    ),
+    AdapterSpec(
+        name="foundry",
+        target="triage_assistant.adapters.foundry:FoundryModelInferenceAdapter",
+        aliases=("azure-foundry", "ai-foundry"),
+        label="Foundry",
+        required_env=(
+            ("TRIAGE_FOUNDRY_ENDPOINT",),
+            ("TRIAGE_FOUNDRY_API_KEY", "AZURE_INFERENCE_CREDENTIAL"),
+            ("TRIAGE_FOUNDRY_MODEL",),
+        ),
+    ),
+    AdapterSpec(
+        name="openai",
+        target="triage_assistant.adapters.openai_compatible:OpenAICompatibleAdapter",
+        aliases=("openai-compatible",),
+        label="OpenAI-compatible",
+        required_env=(
+            ("TRIAGE_OPENAI_BASE_URL",),
+            ("TRIAGE_OPENAI_API_KEY",),
+            ("TRIAGE_OPENAI_MODEL",),
+        ),
+    ),
+    AdapterSpec(
+        name="dummy",
+        target="triage_assistant.adapters.dummy:DummyAdapter",
+        aliases=("offline",),
+        label="Offline rules",
+        hosted=False,
+    ),
+)
+
+
+def normalize_name(name: str) -> str:
+    return name.strip().lower().replace("_", "-")
+
+
+@lru_cache(maxsize=1)
+def plugin_adapters() -> tuple[AdapterSpec, ...]:
+    """Adapters registered by installed packages (read from metadata, not imported)."""
+    from importlib.metadata import entry_points
+
+    return tuple(
+        AdapterSpec(name=normalize_name(ep.name), target=ep.value, label=ep.name)
+        for ep in entry_points(group=ENTRY_POINT_GROUP)
+    )
+
+
+def adapter_names() -> list[str]:
+    """Primary names of every known adapter, built-ins first."""
+    names = [spec.name for spec in BUILTIN_ADAPTERS]
+    names += [spec.name for spec in plugin_adapters() if spec.name not in names]
+    return names
+
+
+def get_adapter_spec(name: str) -> AdapterSpec:
+    """Return the spec for ``name`` or one of its aliases.
+
+    Entry points are only consulted when ``name`` is not built in.
+
+    Raises:
+        ValueError: If no adapter has that name.
+    """
+    normalized = normalize_name(name)
+    for spec in BUILTIN_ADAPTERS:
+        if spec.matches(normalized):
+            return spec
+    for spec in plugin_adapters():
+        if spec.matches(normalized):
+            return spec
+    raise ValueError(f"Unknown adapter: {name!r}. Use one of: {', '.join(adapter_names())}.")
+
+
+def detect_adapter() -> tuple[AdapterSpec, str]:
+    """Return the first built-in hosted adapter whose configuration is complete.
+
+    Falls back to the offline adapter. Returns ``(spec, reason)``; nothing is imported.
+    """
+    for spec in BUILTIN_ADAPTERS:
+        if spec.required_env and not spec.missing_env():
+            return spec, f"{spec.label} configuration detected"
+    return get_adapter_spec("dummy"), "No hosted adapter credentials detected"
+
+
+def auto_adapter_choice() -> tuple[str, str]:
+    """Return ``(adapter_name, reason)`` for what ``--adapter auto`` would choose.
+
+    Mirrors ``triage.get_default_adapter()`` from the environment alone: nothing is
+    imported or instantiated. An unsupported ``TRIAGE_PROVIDER`` gives ``"(invalid)"``.
+    """
+    chain = (os.getenv("TRIAGE_PROVIDER_CHAIN") or "").strip()
+    if chain:
+        return "chain", f"TRIAGE_PROVIDER_CHAIN={chain}"
+
+    provider = (os.getenv("TRIAGE_PROVIDER") or "").strip()
+    if provider:
+        try:
+            spec = get_adapter_spec(provider)
+        except ValueError:
+            return "(invalid)", f"TRIAGE_PROVIDER={provider} (unsupported)"
+        return spec.name, f"TRIAGE_PROVIDER={provider}"
+
+    spec, reason = detect_adapter()
+    return spec.name, reason
+
+
+def resolve_adapter_name(name: str) -> str:
+    """The primary name of the adapter ``name`` selects, resolving ``auto`` and aliases.
+
+    Raises:
+        ValueError: If the name (or, for ``auto``, ``TRIAGE_PROVIDER``) is unknown.
+    """
+    normalized = normalize_name(name)
+    if normalized == "auto":
+        normalized, reason = auto_adapter_choice()
+        if normalized == "(invalid)":
+            raise ValueError(f"Unknown adapter: {reason}.")
+    if normalized == "chain":
+        return normalized
+    return get_adapter_spec(normalized).name
@@ -0,0 +1,757 @@
+"""Declarative rules for the offline :class:`~triage_assistant.adapters.dummy.DummyAdapter`.
+
+A rules file (TOML, or JSON with the same structure) lists keyword categories and the
+decision order for type, priority and labels. See ``default_rules.toml`` next to this
+module for the format; it is also the built-in rule set.
+
+Loading a file compiles it once into:
+
+- a single-pass keyword matcher that returns a bitmask of the categories that fired
+- decision lists of integer conditions, memoized per distinct combination of hits
+
+``RulesFile`` wraps a path and swaps in a freshly compiled rule set when the file
+changes, so long-running workers pick up edits without a restart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import tomllib
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import Any
+
+from ..schema import IssueType, Priority, TriageOutput
+
+# Codes used by compiled rules and by ``DummyAdapter.triage_many`` columns.
+TYPES: tuple[IssueType, ...] = tuple(IssueType)
+PRIORITIES: tuple[Priority, ...] = tuple(Priority)
+
+# Bump when the compiled representation changes so stale disk caches are ignored.
+_COMPILED_FORMAT = 1
+
+_NON_SPACE = re.compile(r"\S")
+
+_CONDITION_KEYS = (
+    "has",
+    "title_has",
+    "body_has",
+    "lacks",
+    "title_lacks",
+    "body_lacks",
+    "type",
+    "priority",
+    "body_shorter_than",
+)
+
+# Regex patterns can match text of any length; when a body is scanned in chunks, matches
+# longer than this many characters may be missed if they straddle a chunk boundary.
+_PATTERN_OVERLAP = 256
+
+# Decisions are memoized per (title_hits, body_hits, length_flags); distinct combinations
+# are few in practice, but keep the table bounded for adversarial rule sets.
+_MAX_DECISIONS = 65536
+# Labels (type and priority labels included) are bits of one mask, stored as an unsigned
+# 64-bit column by ``DummyAdapter.triage_many``.
+MAX_LABELS = 64
+
+# Confidence of the type decision (see ``RuleSet.classify_with_confidence``).
+_CONFIDENCE_SIGNAL = 0.7  # one type signalled, and it is the decided type
+_CONFIDENCE_CONFLICT = 0.4  # several types signalled; rule order picked one
+_CONFIDENCE_DEFAULT = 0.3  # nothing signalled; the default rule decided
+_CONFIDENCE_OVERRIDDEN = 0.2  # the decided type is not the one signalled
+_CONFIDENCE_MAX = 0.95
+
+
+class RulesError(ValueError):
+    """Raised when a rules file cannot be read or is invalid."""
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    r"""Build a regex alternation factored by common prefixes.
+
+    ``["crash", "crashes", "cannot start"]`` becomes ``c(?:annot\ start|rash(?:es)?)``.
+    Factoring keeps the regex engine from retrying every keyword at every position, and
+    the greedy optional groups make it prefer the longest keyword at a given position.
+    """
+    trie: dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = f"(?:{'|'.join(branches)})"
+        return f"{group}?" if "" in node else group
+
+    return build(trie)
+
+
+class _KeywordMatcher:
+    """Match several keyword categories in a single pass over a text.
+
+    All keywords are compiled into one prefix-factored regex. ``scan`` walks the text
+    once and returns a bitmask of every category that fired. Matching keeps plain
+    substring semantics (``keyword in text``): overlapping keywords are all found, and a
+    keyword that is a prefix of a longer match is credited through its category mask.
+
+    Once a category has fired, its keywords cannot change the result any more, so the
+    scan continues with a narrower regex that leaves them out. Log-heavy bodies that
+    repeat "error" on every line therefore cost one match, not one per line.
+
+    Categories may also have regex ``patterns``; those are only searched when the
+    category's keywords did not already fire.
+    """
+
+    def __init__(self, masks: Mapping[str, int], patterns: Sequence[tuple[int, str]]) -> None:
+        # ``masks`` must already be prefix-closed (see ``_close_prefixes``).
+        self._masks = dict(masks)
+        self._all = _or_all(self._masks.values())
+        self._patterns: dict[int, re.Pattern[str] | None] = {}
+        self._extra = [(bit, re.compile(pattern)) for bit, pattern in patterns]
+        self.all_bits = _or_all([self._all, *(bit for bit, _ in patterns)])
+        # Characters to carry between chunks so no match is cut in half (see ScanWindow).
+        self.overlap = max((len(keyword) - 1 for keyword in self._masks), default=0)
+        if patterns:
+            self.overlap = max(self.overlap, _PATTERN_OVERLAP)
+
+    def scan(self, text: str, hits: int = 0) -> int:
+        """Return ``hits`` plus the bits of every category found in ``text``."""
+        pos = 0
+        masks = self._masks
+        pattern = self._pattern_for(hits & self._all)
+        while pattern is not None and (match := pattern.search(text, pos)) is not None:
+            hits |= masks[match.group()]
+            if hits & self._all == self._all:
+                break
+            pattern = self._pattern_for(hits & self._all)
+            # Restart one character later (not at the match end) so overlapping keywords
+            # are still seen.
+            pos = match.start() + 1
+
+        for bit, extra in self._extra:
+            if not hits & bit and extra.search(text) is not None:
+                hits |= bit
+        return hits
+
+    def _pattern_for(self, hits: int) -> re.Pattern[str] | None:
+        try:
+            return self._patterns[hits]
+        except KeyError:
+            pass
+        pending = [keyword for keyword, mask in self._masks.items() if mask & ~hits]
+        pattern = re.compile(_trie_pattern(pending)) if pending else None
+        self._patterns[hits] = pattern
+        return pattern
+
+
+def _or_all(bits: Iterable[int]) -> int:
+    result = 0
+    for bit in bits:
+        result |= bit
+    return result
+
+
+def _close_prefixes(masks: Mapping[str, int]) -> dict[str, int]:
+    # The matcher reports the longest keyword at each position, so fold in the
+    # categories of every shorter keyword that starts the same way.
+    return {
+        keyword: _or_all(mask for other, mask in masks.items() if keyword.startswith(other))
+        for keyword in masks
+    }
+
+
+class _Condition:
+    """A rule condition compiled to integer masks."""
+
+    __slots__ = (
+        "has",
+        "title_has",
+        "body_has",
+        "lacks",
+        "title_lacks",
+        "body_lacks",
+        "types",
+        "priorities",
+        "shorter",
+    )
+
+    def __init__(self, values: Sequence[int]) -> None:
+        (
+            self.has,
+            self.title_has,
+            self.body_has,
+            self.lacks,
+            self.title_lacks,
+            self.body_lacks,
+            self.types,
+            self.priorities,
+            self.shorter,
+        ) = values
+
+    def matches(
+        self,
+        title_hits: int,
+        body_hits: int,
+        length_flags: int,
+        type_code: int = -1,
+        priority_code: int = -1,
+    ) -> bool:
+        any_hits = title_hits | body_hits
+        return (
+            any_hits & self.has == self.has
+            and title_hits & self.title_has == self.title_has
+            and body_hits & self.body_has == self.body_has
+            and not any_hits & self.lacks
+            and not title_hits & self.title_lacks
+            and not body_hits & self.body_lacks
+            and (not self.types or bool(self.types >> type_code & 1))
+            and (not self.priorities or bool(self.priorities >> priority_code & 1))
+            and length_flags & self.shorter == self.shorter
+        )
+
+
+@dataclass(frozen=True)
+class ScanWindow:
+    """Bounded scanning for very large issue bodies.
+
+    By default a body is stripped and lower-cased as a whole before matching, which
+    copies it a couple of times. With a ``ScanWindow`` the body is processed in slices
+    of ``chunk_chars`` characters instead, carrying just enough text between slices that
+    keywords crossing a boundary are still found. Peak extra memory is a few chunks,
+    whatever the body size.
+
+    ``head_chars`` / ``tail_chars`` additionally limit scanning to the start and end of
+    the body (where titles, summaries and the final error usually are). Leave both unset
+    to scan the whole body.
+    """
+
+    chunk_chars: int = 64 * 1024
+    head_chars: int | None = None
+    tail_chars: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.chunk_chars <= 0:
+            raise ValueError("chunk_chars must be positive.")
+        if (self.head_chars is not None and self.head_chars < 0) or (
+            self.tail_chars is not None and self.tail_chars < 0
+        ):
+            raise ValueError("head_chars and tail_chars must not be negative.")
+
+    def regions(self, start: int, end: int) -> list[tuple[int, int]]:
+        """Return the ``[start, end)`` ranges of the body to scan."""
+        if self.head_chars is None and self.tail_chars is None:
+            return [(start, end)]
+        head_end = min(end, start + (self.head_chars or 0))
+        tail_start = max(head_end, end - (self.tail_chars or 0))
+        if head_end == tail_start:
+            # The windows meet, so scan the body as one region.
+            return [(start, end)]
+        return [(lo, hi) for lo, hi in ((start, head_end), (tail_start, end)) if lo < hi]
+
+
+class RuleSet:
+    """A compiled rule set.
+
+    Build one with :func:`load_rules` or :func:`default_rules`. Instances are immutable
+    from the caller's point of view and safe to share between threads.
+    """
+
+    def __init__(self, compiled: Mapping[str, Any]) -> None:
+        self._compiled = compiled
+        self.labels: tuple[str, ...] = tuple(compiled["labels"])
+        self._matcher = _KeywordMatcher(
+            compiled["keywords"], [(bit, pattern) for bit, pattern in compiled["patterns"]]
+        )
+        self._thresholds: tuple[int, ...] = tuple(compiled["thresholds"])
+        self._type_rules = [(_Condition(cond), code) for cond, code in compiled["type_rules"]]
+        self._priority_rules = [
+            (_Condition(cond), code) for cond, code in compiled["priority_rules"]
+        ]
+        self._label_rules = [(_Condition(cond), bit) for cond, bit in compiled["label_rules"]]
+        rationale = compiled["rationale"]
+        self._type_sentence: str = rationale["type"]
+        self._priority_sentences: list[str | None] = rationale["priority"]
+        self._label_sentences: list[str | None] = rationale["labels"]
+        self._decisions: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+        self._confidences: dict[tuple[int, int, int], float] = {}
+        self._signals = _type_signals(self._type_rules)
+
+    def __reduce__(self) -> tuple[type[RuleSet], tuple[Mapping[str, Any]]]:
+        # Ship only the compiled plain data (e.g. to worker processes); regexes and
+        # memo tables are rebuilt on the other side.
+        return RuleSet, (self._compiled,)
+
+    def current(self) -> RuleSet:
+        """Return ``self``; lets a plain ``RuleSet`` stand in for a :class:`RulesFile`."""
+        return self
+
+    def classify(
+        self, *, title: str, body: str, window: ScanWindow | None = None
+    ) -> tuple[int, int, int]:
+        """Classify an issue into ``(type_code, priority_code, label_mask)``.
+
+        ``type_code`` indexes ``TYPES``, ``priority_code`` indexes ``PRIORITIES`` and bit
+        ``i`` of ``label_mask`` stands for ``self.labels[i]``. Pass a ``window`` to scan
+        the body in bounded chunks (see :class:`ScanWindow`).
+        """
+        return self._decision(self._key(title, body, window))
+
+    def classify_with_confidence(
+        self, *, title: str, body: str, window: ScanWindow | None = None
+    ) -> tuple[tuple[int, int, int], float]:
+        """Like :meth:`classify`, plus how much the type decision can be trusted (0-1).
+
+        Type signals are the categories that decide a type on their own in the ``[[type]]``
+        rules (``docs`` -> docs, ``bug`` -> bug, ...). The score is high when exactly one
+        type is signalled and it agrees with the decision, higher still when the title
+        carries the signal; it is low when the type fell through to the default rule or
+        when categories signal different types.
+        """
+        key = self._key(title, body, window)
+        decision = self._decision(key)
+        confidence = self._confidences.get(key)
+        if confidence is None:
+            confidence = self._confidence(key[0], key[1], decision[0])
+            if len(self._confidences) < _MAX_DECISIONS:
+                self._confidences[key] = confidence
+        return decision, confidence
+
+    def decode(self, type_code: int, priority_code: int, label_mask: int) -> TriageOutput:
+        """Build the ``TriageOutput`` for a classification returned by :meth:`classify`."""
+        issue_type = TYPES[type_code]
+        priority = PRIORITIES[priority_code]
+        labels = [label for bit, label in enumerate(self.labels) if label_mask >> bit & 1]
+
+        parts = [self._type_sentence.format(type=issue_type.value)]
+        priority_sentence = self._priority_sentences[priority_code]
+        if priority_sentence:
+            parts.append(priority_sentence)
+        for bit, sentence in enumerate(self._label_sentences):
+            if sentence and label_mask >> bit & 1:
+                parts.append(sentence)
+
+        return TriageOutput(
+            type=issue_type, priority=priority, labels=labels, rationale=" ".join(parts)
+        )
+
+    def _key(self, title: str, body: str, window: ScanWindow | None) -> tuple[int, int, int]:
+        title_hits = self._matcher.scan(title.strip().casefold())
+        if window is None:
+            body_lower = body.strip().casefold()
+            body_hits = self._matcher.scan(body_lower)
+            body_len = len(body_lower)
+        else:
+            body_hits, body_len = self._scan_windowed(body, window)
+
+        length_flags = 0
+        for i, threshold in enumerate(self._thresholds):
+            if body_len < threshold:
+                length_flags |= 1 << i
+        return title_hits, body_hits, length_flags
+
+    def _decision(self, key: tuple[int, int, int]) -> tuple[int, int, int]:
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decide(*key)
+            if len(self._decisions) < _MAX_DECISIONS:
+                self._decisions[key] = decision
+        return decision
+
+    def _confidence(self, title_hits: int, body_hits: int, type_code: int) -> float:
+        any_hits = title_hits | body_hits
+        fired = [(bit, code) for bit, code in self._signals if any_hits & bit]
+        signalled = {code for _, code in fired}
+        if not signalled:
+            return _CONFIDENCE_DEFAULT
+        if signalled != {type_code}:
+            return _CONFIDENCE_CONFLICT if type_code in signalled else _CONFIDENCE_OVERRIDDEN
+        confidence = _CONFIDENCE_SIGNAL
+        if any(title_hits & bit for bit, _ in fired):
+            confidence += 0.15
+            if any(body_hits & bit for bit, _ in fired):
+                confidence += 0.05
+        if len(fired) > 1:
+            confidence += 0.05
+        return min(confidence, _CONFIDENCE_MAX)
+
+    def _scan_windowed(self, body: str, window: ScanWindow) -> tuple[int, int]:
+        """Scan ``body`` chunk by chunk; return ``(hits, casefolded stripped length)``."""
+        start, end = _strip_bounds(body, chunk_chars=window.chunk_chars)
+        matcher = self._matcher
+        hits = 0
+        for lo, hi in window.regions(start, end):
+            carry = ""
+            for pos in range(lo, hi, window.chunk_chars):
+                text = carry + body[pos : min(pos + window.chunk_chars, hi)].casefold()
+                hits = matcher.scan(text, hits)
+                if hits == matcher.all_bits:
+                    break
+                carry = text[len(text) - matcher.overlap :] if matcher.overlap else ""
+
+        # Casefolding never shortens text, so the exact length only matters (and is only
+        # computed) when the raw body is shorter than some length threshold.
+        body_len = end - start
+        if self._thresholds and body_len < max(self._thresholds):
+            body_len = len(body[start:end].casefold())
+        return hits, body_len
+
+    def _decide(self, title_hits: int, body_hits: int, length_flags: int) -> tuple[int, int, int]:
+        type_code = next(
+            code
+            for cond, code in self._type_rules
+            if cond.matches(title_hits, body_hits, length_flags)
+        )
+        priority_code = next(
+            code
+            for cond, code in self._priority_rules
+            if cond.matches(title_hits, body_hits, length_flags, type_code)
+        )
+        # Type and priority labels take the first bits, in that order.
+        label_mask = 1 << type_code | 1 << (len(TYPES) + priority_code)
+        for cond, bit in self._label_rules:
+            if cond.matches(title_hits, body_hits, length_flags, type_code, priority_code):
+                label_mask |= 1 << bit
+        return type_code, priority_code, label_mask
+
+
+def _type_signals(type_rules: Sequence[tuple[_Condition, int]]) -> tuple[tuple[int, int], ...]:
+    """``(category bit, type code)`` for each category that decides a type on its own."""
+    signals: dict[int, int] = {}
+    for cond, code in type_rules:
+        required = cond.has | cond.title_has | cond.body_has
+        if required and required & (required - 1) == 0:
+            signals.setdefault(required, code)
+    return tuple(signals.items())
+
+
+class RulesFile:
+    """A rules file on disk, recompiled automatically when it changes.
+
+    ``current()`` checks the file's size and modification time at most once every
+    ``check_interval_s`` seconds. When they change, the file is compiled in full and
+    then swapped in with a single assignment, so concurrent callers see either the
+    old or the new rule set, never a mix. If the new file is invalid, the previous rule
+    set stays active and the error is kept in ``last_error``.
+
+    Raises:
+        RulesError: If the initial load fails.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        cache_dir: Path | None = None,
+        check_interval_s: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.cache_dir = cache_dir
+        self.check_interval_s = check_interval_s
+        self.last_error: RulesError | None = None
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._rules = load_rules(path, cache_dir=cache_dir)
+        self._next_check = time.monotonic() + check_interval_s
+
+    def current(self) -> RuleSet:
+        """Return the active rule set, reloading it first if the file changed."""
+        if time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._rules
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _maybe_reload(self) -> None:
+        # Only one thread recompiles; the others keep using the active rule set.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval_s
+            signature = self._stat()
+            if signature == self._signature:
+                return
+            self._signature = signature
+            try:
+                self._rules = load_rules(self.path, cache_dir=self.cache_dir)
+                self.last_error = None
+            except RulesError as e:
+                self.last_error = e
+        finally:
+            self._lock.release()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=1)
+def default_rules() -> RuleSet:
+    """Return the built-in rule set (``default_rules.toml``), compiled once per process."""
+    source = resources.files(__package__).joinpath("default_rules.toml").read_bytes()
+    return RuleSet(_compile(_parse(source, suffix=".toml")))
+
+
+def load_rules(path: Path, *, cache_dir: Path | None = None) -> RuleSet:
+    """Load and compile a rules file (``.toml`` or ``.json``).
+
+    If ``cache_dir`` is given, the compiled form is stored there keyed by a hash of the
+    file contents, and later loads of identical contents skip parsing and compilation.
+    Regular expressions are still compiled lazily on first use, since CPython cannot
+    serialize compiled regexes.
+
+    Raises:
+        RulesError: If the file cannot be read or is invalid.
+    """
+    try:
+        source = path.read_bytes()
+    except OSError as e:
+        raise RulesError(f"Failed to read rules file: {e}") from e
+
+    cache_path: Path | None = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(source).hexdigest()
+        cache_path = cache_dir / f"rules-{digest[:32]}.json"
+        compiled = _read_cache(cache_path)
+        if compiled is not None:
+            return RuleSet(compiled)
+
+    compiled = _compile(_parse(source, suffix=path.suffix))
+    if cache_path is not None:
+        _write_cache(cache_path, compiled)
+    return RuleSet(compiled)
+
+
+def _parse(source: bytes, *, suffix: str) -> dict[str, Any]:
+    try:
+        text = source.decode("utf-8")
+        if suffix.lower() == ".json":
+            data = json.loads(text)
+        else:
+            data = tomllib.loads(text)
+    except (UnicodeDecodeError, json.JSONDecodeError, tomllib.TOMLDecodeError) as e:
+        raise RulesError(f"Failed to parse rules file: {e}") from e
+    if not isinstance(data, dict):
+        raise RulesError("Rules file must contain a table/object at the top level.")
+    return data
+
+
+def _compile(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Validate parsed rules and compile them into plain, JSON-serializable data."""
+    categories = data.get("categories")
+    if not isinstance(categories, dict) or not categories:
+        raise RulesError("Rules must define at least one entry under [categories].")
+
+    category_bits: dict[str, int] = {}
+    masks: dict[str, int] = {}
+    patterns: list[list[Any]] = []
+    for name, spec in categories.items():
+        if not isinstance(spec, dict):
+            raise RulesError(f"Category {name!r} must be a table.")
+        bit = 1 << len(category_bits)
+        category_bits[name] = bit
+        for keyword in _str_list(spec.get("keywords", []), where=f"categories.{name}.keywords"):
+            keyword = keyword.casefold()
+            if not keyword:
+                raise RulesError(f"Category {name!r} contains an empty keyword.")
+            masks[keyword] = masks.get(keyword, 0) | bit
+        for pattern in _str_list(spec.get("patterns", []), where=f"categories.{name}.patterns"):
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise RulesError(f"Invalid pattern in category {name!r}: {e}") from e
+            patterns.append([bit, pattern])
+
+    labels: list[str] = [t.value for t in TYPES] + [p.value for p in PRIORITIES]
+    thresholds: list[int] = []
+
+    def condition(rule: Mapping[str, Any], where: str) -> list[int]:
+        unknown = set(rule) - set(_CONDITION_KEYS) - {"value", "label"}
+        if unknown:
+            raise RulesError(f"Unknown key(s) in {where}: {', '.join(sorted(unknown))}")
+
+        def cats(key: str) -> int:
+            mask = 0
+            for name in _str_list(rule.get(key, []), where=f"{where}.{key}"):
+                if name not in category_bits:
+                    raise RulesError(f"Unknown category {name!r} in {where}.{key}")
+                mask |= category_bits[name]
+            return mask
+
+        types = _codes(rule.get("type"), [t.value for t in TYPES], where=f"{where}.type")
+        priorities = _codes(
+            rule.get("priority"), [p.value for p in PRIORITIES], where=f"{where}.priority"
+        )
+        shorter = 0
+        if "body_shorter_than" in rule:
+            limit = rule["body_shorter_than"]
+            if not isinstance(limit, int) or isinstance(limit, bool):
+                raise RulesError(f"{where}.body_shorter_than must be an integer.")
+            if limit not in thresholds:
+                thresholds.append(limit)
+            shorter = 1 << thresholds.index(limit)
+        return [
+            cats("has"),
+            cats("title_has"),
+            cats("body_has"),
+            cats("lacks"),
+            cats("title_lacks"),
+            cats("body_lacks"),
+            types,
+            priorities,
+            shorter,
+        ]
+
+    def decision_list(key: str, values: list[str]) -> list[list[Any]]:
+        rules = data.get(key)
+        if not isinstance(rules, list) or not rules:
+            raise RulesError(f"Rules must define at least one [[{key}]] entry.")
+        compiled: list[list[Any]] = []
+        for i, rule in enumerate(rules):
+            where = f"{key}[{i}]"
+            if not isinstance(rule, dict):
+                raise RulesError(f"{where} must be a table.")
+            value = rule.get("value")
+            if value not in values:
+                raise RulesError(f"{where}.value must be one of: {', '.join(values)}")
+            compiled.append([condition(rule, where), values.index(value)])
+        if any(compiled[-1][0]):
+            raise RulesError(f"The last [[{key}]] rule must have no conditions (the default).")
+        return compiled
+
+    type_rules = decision_list("type", [t.value for t in TYPES])
+    for cond, _code in type_rules:
+        if cond[6] or cond[7]:
+            raise RulesError("[[type]] rules cannot depend on type or priority.")
+    priority_rules = decision_list("priority", [p.value for p in PRIORITIES])
+    for cond, _code in priority_rules:
+        if cond[7]:
+            raise RulesError("[[priority]] rules cannot depend on priority.")
+
+    label_rules: list[list[Any]] = []
+    for i, rule in enumerate(data.get("labels", [])):
+        where = f"labels[{i}]"
+        if not isinstance(rule, dict):
+            raise RulesError(f"{where} must be a table.")
+        label = rule.get("label")
+        if not isinstance(label, str) or not label.strip():
+            raise RulesError(f"{where}.label must be a non-empty string.")
+        if label not in labels:
+            if len(labels) == MAX_LABELS:
+                raise RulesError(
+                    f"{where}: too many distinct labels; at most {MAX_LABELS} are supported, "
+                    f"including the {len(TYPES) + len(PRIORITIES)} type and priority labels."
+                )
+            labels.append(label)
+        label_rules.append([condition(rule, where), labels.index(label)])
+
+    rationale = data.get("rationale", {})
+    if not isinstance(rationale, dict):
+        raise RulesError("[rationale] must be a table.")
+    type_sentence = rationale.get("type", "Classified as '{type}'.")
+    if not isinstance(type_sentence, str) or not type_sentence.strip():
+        raise RulesError("rationale.type must be a non-empty string.")
+    priority_sentences = _sentences(rationale.get("priority", {}), where="rationale.priority")
+    label_sentences = _sentences(rationale.get("labels", {}), where="rationale.labels")
+
+    return {
+        "format": _COMPILED_FORMAT,
+        "keywords": _close_prefixes(masks),
+        "patterns": patterns,
+        "labels": labels,
+        "thresholds": thresholds,
+        "type_rules": type_rules,
+        "priority_rules": priority_rules,
+        "label_rules": label_rules,
+        "rationale": {
+            "type": type_sentence,
+            "priority": [priority_sentences.get(p.value) for p in PRIORITIES],
+            "labels": [label_sentences.get(label) for label in labels],
+        },
+    }
+
+
+def _strip_bounds(body: str, *, chunk_chars: int) -> tuple[int, int]:
+    """Return ``(start, end)`` such that ``body[start:end] == body.strip()``, without copying."""
+    match = _NON_SPACE.search(body)
+    if match is None:
+        return 0, 0
+    start = match.start()
+    end = len(body)
+    while end > start:
+        piece = body[max(start, end - chunk_chars) : end]
+        stripped = piece.rstrip()
+        if stripped:
+            return start, end - (len(piece) - len(stripped))
+        end -= len(piece)
+    return start, start
+
+
+def _str_list(value: Any, *, where: str) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise RulesError(f"{where} must be a string or a list of strings.")
+    return value
+
+
+def _codes(value: Any, allowed: list[str], *, where: str) -> int:
+    if value is None:
+        return 0
+    mask = 0
+    for name in _str_list(value, where=where):
+        if name not in allowed:
+            raise RulesError(f"{where} must be one of: {', '.join(allowed)}")
+        mask |= 1 << allowed.index(name)
+    return mask
+
+
+def _sentences(value: Any, *, where: str) -> dict[str, str]:
+    if not isinstance(value, dict) or not all(isinstance(v, str) for v in value.values()):
+        raise RulesError(f"{where} must map names to strings.")
+    return value
+
+
+def _read_cache(path: Path) -> dict[str, Any] | None:
+    try:
+        compiled = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(compiled, dict) or compiled.get("format") != _COMPILED_FORMAT:
+        return None
+    return compiled
+
+
+def _write_cache(path: Path, compiled: Mapping[str, Any]) -> None:
+    # Best effort: a cache that cannot be written only costs a recompile next time.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(compiled), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,34 @@
+"""Rough token counts for prompt budgeting.
+
+Body compaction, issue packing and the rate limiter only need an estimate that errs
+on the large side, not a tokenizer: about four characters per token, rounded up.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+# Room charged for the model's reply on top of the prompt.
+_REPLY_TOKENS = 256
+
+
+def estimate_tokens(text: str | bytes) -> int:
+    """Approximate token count of ``text`` (about four characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_request_tokens(payload: dict[str, Any] | bytes) -> int:
+    """Rough token count of a chat-completions ``payload``, including the reply.
+
+    ``payload`` is the request dict or its encoded JSON body; for the latter, the JSON
+    framing (a few dozen bytes) is counted along with the messages.
+    """
+    if isinstance(payload, bytes):
+        return estimate_tokens(payload) + _REPLY_TOKENS
+    text = "".join(
+        content
+        for message in payload.get("messages", ())
+        if isinstance(content := message.get("content"), str)
+    )
+    return estimate_tokens(text) + _REPLY_TOKENS
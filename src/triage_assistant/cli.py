@@ -1,23 +1,59 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated
+from typing import IO, Annotated, Any
 
 import typer
-from rich.console import Console
 
-from .adapters.chat_completions import ChatCompletionsError
+from .adapters.cascade import CascadeAdapter
 from .adapters.dummy import DummyAdapter
-from .adapters.foundry import FoundryModelInferenceAdapter
-from .adapters.github_models import GitHubModelsAdapter
-from .adapters.openai_compatible import OpenAICompatibleAdapter
+from .adapters.errors import ChatCompletionsError
+from .adapters.packing import PackingAdapter
+from .adapters.registry import (
+    BUILTIN_ADAPTERS,
+    auto_adapter_choice,
+    get_adapter_spec,
+    normalize_name,
+    plugin_adapters,
+    resolve_adapter_name,
+)
+from .adapters.rules import RulesError
+from .client import default_socket_path, wrapper_options
+from .client import status as daemon_status
+from .parallel import atriage_all, atriage_stream, triage_all
 from .schema import TriageOutput
-from .triage import get_default_adapter
+from .triage import TriageAdapter, adapter_chain, get_default_adapter, hedged_from_env
+
+# Only modules needed by the selected adapter and command are imported: `triage
+# --adapter dummy` never loads httpx or rich. scripts/bench_startup.py guards this.
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
-console = Console(stderr=True)
+
+
+class _StderrConsole:
+    """A rich console on stderr, created on first use (importing rich is not free)."""
+
+    def print(self, *objects: Any) -> None:
+        _rich_console().print(*objects)
+
+
+@lru_cache(maxsize=1)
+def _rich_console() -> Any:
+    from rich.console import Console
+
+    return Console(stderr=True)
+
+
+console = _StderrConsole()
 
 
 def _read_body(body: str | None, body_file: Path | None) -> str:
@@ -38,111 +74,92 @@ def _resolve_adapter(adapter_name: str | None):
     - github: GitHub Models (models.github.ai)
     - foundry: Microsoft Foundry (Azure AI inference endpoint)
     - openai: OpenAI-compatible chat completions (fallback)
+    - chain: fail over along TRIAGE_PROVIDER_CHAIN (e.g. github,foundry,dummy)
+    - any adapter registered through entry points (see adapters/registry.py)
     """
 
     if adapter_name is None or adapter_name == "auto":
         return get_default_adapter()
 
-    normalized = adapter_name.strip().lower().replace("_", "-")
-
-    if normalized == "dummy":
-        return DummyAdapter()
-
-    if normalized in {"github", "github-models"}:
-        try:
-            return GitHubModelsAdapter.from_env()
-        except KeyError as e:
-            missing = str(e).strip("'")
-            raise typer.BadParameter(
-                f"Missing environment variable for GitHub Models adapter: {missing}"
-            ) from e
-
-    if normalized in {"foundry", "ai-foundry", "azure-foundry"}:
-        try:
-            return FoundryModelInferenceAdapter.from_env()
-        except KeyError as e:
-            missing = str(e).strip("'")
-            raise typer.BadParameter(
-                f"Missing environment variable for Foundry adapter: {missing}"
-            ) from e
-
-    if normalized in {"openai", "openai-compatible"}:
+    if normalize_name(adapter_name) == "chain":
+        chain = os.getenv("TRIAGE_PROVIDER_CHAIN", "").strip()
+        if not chain:
+            raise typer.BadParameter("Set TRIAGE_PROVIDER_CHAIN to use the chain adapter.")
         try:
-            return OpenAICompatibleAdapter.from_env()
-        except KeyError as e:
-            missing = str(e).strip("'")
-            raise typer.BadParameter(
-                f"Missing environment variable for OpenAI-compatible adapter: {missing}"
-            ) from e
-
-    raise typer.BadParameter(f"Unknown adapter: {adapter_name}")
-
-
-def _is_set(name: str) -> bool:
-    return bool((os.getenv(name) or "").strip())
-
-
-def _missing_env_for_github_models() -> list[str]:
-    # GitHub Models accepts TRIAGE_GITHUB_TOKEN or (fallback) GITHUB_TOKEN.
-    if _is_set("TRIAGE_GITHUB_TOKEN") or _is_set("GITHUB_TOKEN"):
-        return []
-    return ["TRIAGE_GITHUB_TOKEN (or GITHUB_TOKEN)"]
-
-
-def _missing_env_for_foundry() -> list[str]:
-    missing: list[str] = []
-    if not _is_set("TRIAGE_FOUNDRY_ENDPOINT"):
-        missing.append("TRIAGE_FOUNDRY_ENDPOINT")
+            return hedged_from_env(adapter_chain(chain))
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from e
 
-    if not (_is_set("TRIAGE_FOUNDRY_API_KEY") or _is_set("AZURE_INFERENCE_CREDENTIAL")):
-        missing.append("TRIAGE_FOUNDRY_API_KEY (or AZURE_INFERENCE_CREDENTIAL)")
-
-    if not _is_set("TRIAGE_FOUNDRY_MODEL"):
-        missing.append("TRIAGE_FOUNDRY_MODEL")
-    return missing
-
-
-def _missing_env_for_openai_compatible() -> list[str]:
-    missing: list[str] = []
-    if not _is_set("TRIAGE_OPENAI_BASE_URL"):
-        missing.append("TRIAGE_OPENAI_BASE_URL")
-    if not _is_set("TRIAGE_OPENAI_API_KEY"):
-        missing.append("TRIAGE_OPENAI_API_KEY")
-    if not _is_set("TRIAGE_OPENAI_MODEL"):
-        missing.append("TRIAGE_OPENAI_MODEL")
-    return missing
+    try:
+        spec = get_adapter_spec(adapter_name)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    try:
+        return hedged_from_env(spec.create())
+    except KeyError as e:
+        missing = str(e).strip("'")
+        raise typer.BadParameter(
+            f"Missing environment variable for {spec.label} adapter: {missing}"
+        ) from e
+    except RulesError as e:
+        raise typer.BadParameter(str(e)) from e
 
 
-def _auto_adapter_choice() -> tuple[str, str]:
-    """Return (adapter_name, reason) for what `--adapter auto` would choose.
+def _with_cache(adapter: TriageAdapter, cache_path: Path | None, refresh: bool) -> TriageAdapter:
+    """Wrap hosted adapters in a persistent response cache when ``cache_path`` is set.
 
-    This mirrors the intent of `triage_assistant.triage.get_default_adapter()` but does
-    not instantiate adapters or make network calls.
+    The offline adapter is deterministic and fast, so it is never cached.
     """
+    if cache_path is None:
+        return adapter
+    from .adapters.cache import CacheableAdapter, CachedAdapter, ResponseCache
 
-    provider = (os.getenv("TRIAGE_PROVIDER") or "").strip()
-    if provider:
-        normalized = provider.lower().replace("_", "-")
-        if normalized in {"github", "github-models"}:
-            return "github", f"TRIAGE_PROVIDER={provider}"
-        if normalized in {"foundry", "azure-foundry", "ai-foundry"}:
-            return "foundry", f"TRIAGE_PROVIDER={provider}"
-        if normalized in {"openai", "openai-compatible"}:
-            return "openai", f"TRIAGE_PROVIDER={provider}"
-        if normalized in {"dummy", "offline"}:
-            return "dummy", f"TRIAGE_PROVIDER={provider}"
-        return "(invalid)", f"TRIAGE_PROVIDER={provider} (unsupported)"
+    if not isinstance(adapter, CacheableAdapter):
+        return adapter
+    return CachedAdapter(inner=adapter, cache=ResponseCache.from_env(cache_path), refresh=refresh)
 
-    if not _missing_env_for_github_models():
-        return "github", "GitHub Models credentials detected"
 
-    if not _missing_env_for_foundry():
-        return "foundry", "Foundry credentials detected"
+def _with_cascade(adapter: TriageAdapter, threshold: float | None) -> TriageAdapter:
+    """Put the offline rules in front of ``adapter`` when a cascade threshold is set.
 
-    if not _missing_env_for_openai_compatible():
-        return "openai", "OpenAI-compatible configuration detected"
-
-    return "dummy", "No hosted adapter credentials detected"
+    Rule results at or above ``threshold`` confidence are returned without calling
+    ``adapter``. Wrapping the offline adapter itself would be pointless, so it is left as is.
+    """
+    if threshold is None or isinstance(adapter, DummyAdapter):
+        return adapter
+    try:
+        return CascadeAdapter(fallback=adapter, rules=DummyAdapter.from_env(), threshold=threshold)
+    except RulesError as e:
+        raise typer.BadParameter(str(e)) from e
+
+
+_CacheOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--cache",
+        envvar="TRIAGE_CACHE_PATH",
+        help=(
+            "SQLite file caching hosted-model results, keyed by provider, model, prompt "
+            "and sampling settings. Identical calls skip the network."
+        ),
+    ),
+]
+_RefreshCacheOption = Annotated[
+    bool,
+    typer.Option(help="Ignore cached results (still storing fresh ones in --cache)."),
+]
+_CascadeOption = Annotated[
+    float | None,
+    typer.Option(
+        "--cascade",
+        envvar="TRIAGE_CASCADE_THRESHOLD",
+        min=0.0,
+        help=(
+            "Try the offline rules first and only call the hosted adapter when their "
+            "confidence is below this threshold (0-1, e.g. 0.8)."
+        ),
+    ),
+]
 
 
 @app.command()
@@ -157,15 +174,21 @@ def triage(
         typer.Option(
             help=(
                 "Which adapter to use: auto (default), dummy (offline baseline), "
-                "github (GitHub Models), foundry (Microsoft Foundry), openai (OpenAI-compatible)."
+                "github (GitHub Models), foundry (Microsoft Foundry), openai (OpenAI-compatible), "
+                "chain (fail over along TRIAGE_PROVIDER_CHAIN)."
             )
         ),
     ] = "auto",
     pretty: Annotated[bool, typer.Option(help="Pretty-print JSON output.")] = False,
+    cache: _CacheOption = None,
+    refresh_cache: _RefreshCacheOption = False,
+    cascade: _CascadeOption = None,
 ) -> None:
     """Triage an issue and print schema-valid JSON to stdout."""
     body_text = _read_body(body, body_file)
-    triage_adapter = _resolve_adapter(adapter)
+    triage_adapter = _with_cascade(
+        _with_cache(_resolve_adapter(adapter), cache, refresh_cache), cascade
+    )
 
     try:
         result = triage_adapter.triage(title=title, body=body_text)
@@ -179,6 +202,419 @@ def triage(
     typer.echo(result.to_json(pretty=pretty))
 
 
+@app.command()
+def batch(
+    input: Annotated[
+        Path | None,
+        typer.Argument(help="JSONL file with one issue per line; omit or use '-' for stdin."),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Write JSONL results here instead of stdout."),
+    ] = None,
+    adapter: Annotated[
+        str,
+        typer.Option(help="Which adapter to use (same names as the triage command)."),
+    ] = "auto",
+    concurrency: Annotated[int, typer.Option(min=1, help="Issues triaged at the same time.")] = 8,
+    ordered: Annotated[
+        bool,
+        typer.Option(
+            "--ordered/--unordered",
+            help="Keep input order, or write each result as soon as it is ready.",
+        ),
+    ] = True,
+    reorder_window: Annotated[
+        int | None,
+        typer.Option(
+            min=1,
+            help=(
+                "With --ordered, never run ahead of the oldest unfinished issue by more "
+                "than this many lines (default: 4 x concurrency). Bounds memory."
+            ),
+        ),
+    ] = None,
+    cache: _CacheOption = None,
+    refresh_cache: _RefreshCacheOption = False,
+    cascade: _CascadeOption = None,
+) -> None:
+    """Triage a JSONL stream of issues and write one JSON result per line.
+
+    Each input line is an object with "title", optional "body" and optional "id" (the
+    line number is used when it is missing). Each output line is
+    {"id": ..., "result": {...}} or, when that issue failed,
+    {"id": ..., "error": {"type": ..., "message": ...}}. Failures never stop the batch.
+    Input is read lazily, so memory use does not grow with the input size.
+    """
+    if reorder_window is not None and reorder_window < concurrency:
+        raise typer.BadParameter("--reorder-window must be at least --concurrency.")
+    triage_adapter = _with_cascade(
+        _with_cache(_resolve_adapter(adapter), cache, refresh_cache), cascade
+    )
+
+    source = sys.stdin if input is None or str(input) == "-" else _open_input(input)
+    sink = sys.stdout if output is None else output.open("w", encoding="utf-8")
+    ids: dict[int, Any] = {}
+    try:
+        counts = asyncio.run(
+            _write_batch(
+                _read_issues(source, ids),
+                ids,
+                sink,
+                adapter=triage_adapter,
+                concurrency=concurrency,
+                ordered=ordered,
+                window=reorder_window,
+            )
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    console.print(f"Triaged {counts[0]} issue(s); {counts[1]} failed.")
+
+
+def _open_input(path: Path) -> IO[str]:
+    try:
+        return path.open("r", encoding="utf-8")
+    except OSError as e:
+        raise typer.BadParameter(f"Failed to read input file: {e}") from e
+
+
+class _InvalidInput(ValueError):
+    """An input line that is not a JSON object with a string "title"."""
+
+
+def _read_issues(source: IO[str], ids: dict[int, Any]) -> Iterator[tuple[str, str] | Exception]:
+    # ``ids`` maps input positions to issue ids; entries are removed once written, so it
+    # only ever holds the issues in flight or waiting in the reorder buffer.
+    index = 0
+    for line_number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        ids[index] = line_number
+        index += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield _InvalidInput(f"Line {line_number} is not valid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield _InvalidInput(f"Line {line_number} is not a JSON object.")
+            continue
+        ids[index - 1] = record.get("id", line_number)
+        title = record.get("title")
+        body = record.get("body") or ""
+        if not isinstance(title, str) or not isinstance(body, str):
+            yield _InvalidInput(f'Line {line_number} needs a string "title" (and "body").')
+            continue
+        yield title, body
+
+
+async def _write_batch(
+    issues: Iterator[tuple[str, str] | Exception],
+    ids: dict[int, Any],
+    sink: IO[str],
+    **options: Any,
+) -> tuple[int, int]:
+    total = failed = 0
+    async for index, outcome in atriage_stream(issues, **options):
+        issue_id = json.dumps(ids.pop(index), ensure_ascii=False)
+        if isinstance(outcome, TriageOutput):
+            sink.write(f'{{"id":{issue_id},"result":{outcome.to_json()}}}\n')
+        else:
+            failed += 1
+            kind = "invalid_input" if isinstance(outcome, _InvalidInput) else type(outcome).__name__
+            error = json.dumps(
+                {"type": kind, "message": str(outcome)}, ensure_ascii=False, separators=(",", ":")
+            )
+            sink.write(f'{{"id":{issue_id},"error":{error}}}\n')
+        sink.flush()
+        total += 1
+    return total, failed
+
+
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option(help="Interface to listen on.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option(min=0, max=65535, help="TCP port (0 picks one).")] = 8080,
+    adapter: Annotated[
+        str,
+        typer.Option(help="Which adapter to use (same names as the triage command)."),
+    ] = "auto",
+    batch_window_ms: Annotated[
+        float,
+        typer.Option(
+            min=0.0,
+            help=(
+                "Coalesce issues from concurrent requests arriving within this many "
+                "milliseconds into one micro-batch (0 batches only what is already queued)."
+            ),
+        ),
+    ] = 5.0,
+    max_batch: Annotated[
+        int, typer.Option(min=1, help="Largest micro-batch sent to the adapter.")
+    ] = 16,
+    cache: _CacheOption = None,
+    refresh_cache: _RefreshCacheOption = False,
+    cascade: _CascadeOption = None,
+) -> None:
+    """Run a long-lived HTTP server exposing POST /triage and POST /triage/batch.
+
+    The adapter, its connection pool and the compiled rules stay warm across requests.
+    See docs/providers.md for the request and response formats.
+    """
+    from .server import TriageServer
+
+    triage_adapter = _with_cascade(
+        _with_cache(_resolve_adapter(adapter), cache, refresh_cache), cascade
+    )
+    server = TriageServer(
+        triage_adapter,
+        batch_window_s=batch_window_ms / 1000,
+        max_batch=max_batch,
+        adapter_name=resolve_adapter_name(adapter),
+        options=wrapper_options(cache=cache, refresh_cache=refresh_cache, cascade=cascade),
+    )
+
+    async def run() -> None:
+        try:
+            await server.start(host=host, port=port)
+        except OSError as e:
+            console.print(f"[red]Cannot listen on {host}:{port}:[/red] {e}")
+            raise typer.Exit(code=1) from e
+        console.print(f"Serving triage on {server.address} (Ctrl+C to stop)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+
+@app.command("mock-server")
+def mock_server(
+    host: Annotated[str, typer.Option(help="Interface to listen on.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option(min=0, max=65535, help="TCP port (0 picks one).")] = 8400,
+    latency: Annotated[
+        str,
+        typer.Option(
+            help="Response latency, kind:a[,b] with kind fixed|uniform|exponential|lognormal."
+        ),
+    ] = "fixed:0",
+    rate_limit: Annotated[float, typer.Option(help="Fraction answered 429.")] = 0.0,
+    retry_after: Annotated[float, typer.Option(help="Retry-After seconds.")] = 1.0,
+    error_every: Annotated[int, typer.Option(help="Start a 5xx burst every N requests.")] = 0,
+    error_burst: Annotated[int, typer.Option(help="5xx responses per burst.")] = 3,
+    error_status: Annotated[int, typer.Option(help="Status code of injected errors.")] = 503,
+    slow_drip: Annotated[float, typer.Option(help="Fraction of bodies sent slowly.")] = 0.0,
+    drip_chunk_bytes: Annotated[int, typer.Option(help="Bytes per slow chunk.")] = 16,
+    drip_interval: Annotated[float, typer.Option(help="Seconds between slow chunks.")] = 0.05,
+    malformed: Annotated[float, typer.Option(help="Fraction of broken JSON replies.")] = 0.0,
+    fenced: Annotated[float, typer.Option(help="Fraction of markdown-fenced replies.")] = 0.0,
+    seed: Annotated[int | None, typer.Option(help="Seed for replayable fault decisions.")] = None,
+) -> None:
+    """Run a local stand-in for the hosted chat-completions providers, with fault injection.
+
+    See docs/providers.md ("Local mock server") for the routes and faults.
+    """
+    from .mock_server import Latency, MockBehavior, MockChatServer
+
+    try:
+        behavior = MockBehavior(
+            latency=Latency.parse(latency),
+            rate_limit=rate_limit,
+            retry_after_s=retry_after,
+            error_every=error_every,
+            error_burst=error_burst,
+            error_status=error_status,
+            slow_drip=slow_drip,
+            drip_chunk_bytes=drip_chunk_bytes,
+            drip_interval_s=drip_interval,
+            malformed=malformed,
+            fenced=fenced,
+            seed=seed,
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    server = MockChatServer(behavior, host=host, port=port)
+
+    async def run() -> None:
+        try:
+            await server.start()
+        except OSError as e:
+            console.print(f"[red]Cannot listen on {host}:{port}:[/red] {e}")
+            raise typer.Exit(code=1) from e
+        console.print(f"Mock chat-completions server listening on {server.url} (Ctrl+C to stop)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+
+daemon_app = typer.Typer(
+    no_args_is_help=True,
+    help="Run a resident daemon that `triage` calls are forwarded to over a Unix socket.",
+)
+app.add_typer(daemon_app, name="daemon")
+
+_DAEMON_START_TIMEOUT_S = 15.0
+_DAEMON_STOP_TIMEOUT_S = 10.0
+
+_SocketOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--socket",
+        envvar="TRIAGE_DAEMON_SOCKET",
+        help=(
+            "Unix socket path (default: $XDG_RUNTIME_DIR/triage-assistant.sock, "
+            "else /tmp/triage-assistant-<uid>.sock)."
+        ),
+    ),
+]
+
+
+@daemon_app.command("start")
+def daemon_start(
+    socket: _SocketOption = None,
+    adapter: Annotated[
+        str,
+        typer.Option(help="Which adapter to use (same names as the triage command)."),
+    ] = "auto",
+    batch_window_ms: Annotated[
+        float,
+        typer.Option(min=0.0, help="Coalesce concurrent calls within this many milliseconds."),
+    ] = 5.0,
+    max_batch: Annotated[
+        int, typer.Option(min=1, help="Largest micro-batch sent to the adapter.")
+    ] = 16,
+    cache: _CacheOption = None,
+    refresh_cache: _RefreshCacheOption = False,
+    cascade: _CascadeOption = None,
+    foreground: Annotated[
+        bool, typer.Option(help="Run in this process instead of detaching.")
+    ] = False,
+) -> None:
+    """Start the daemon; `triage-assistant triage` forwards to it while it runs.
+
+    The adapter, its connection pool, the response cache and the compiled rules stay warm
+    between calls. The daemon resolves the adapter from the environment it starts with.
+    """
+    from .server import TriageServer
+
+    if not hasattr(asyncio, "start_unix_server"):
+        raise typer.BadParameter("The daemon needs Unix domain sockets.")
+    path = (socket or default_socket_path()).absolute()
+    if daemon_status(path) is not None:
+        console.print(f"[red]A triage daemon is already running on {path}.[/red]")
+        raise typer.Exit(code=1)
+
+    # Resolve before detaching so configuration errors are reported here.
+    triage_adapter = _with_cascade(
+        _with_cache(_resolve_adapter(adapter), cache, refresh_cache), cascade
+    )
+    if not foreground:
+        options = ["--adapter", adapter, "--batch-window-ms", str(batch_window_ms)]
+        options += ["--max-batch", str(max_batch)]
+        if cache is not None:
+            options += ["--cache", str(cache.absolute())]
+        if refresh_cache:
+            options.append("--refresh-cache")
+        if cascade is not None:
+            options += ["--cascade", str(cascade)]
+        _spawn_daemon(path, options)
+        return
+
+    server = TriageServer(
+        triage_adapter,
+        batch_window_s=batch_window_ms / 1000,
+        max_batch=max_batch,
+        adapter_name=resolve_adapter_name(adapter),
+        options=wrapper_options(cache=cache, refresh_cache=refresh_cache, cascade=cascade),
+    )
+
+    async def run() -> None:
+        try:
+            path.unlink(missing_ok=True)  # left behind by a daemon that was killed
+            await server.start_unix(path)
+        except OSError as e:
+            console.print(f"[red]Cannot listen on {path}:[/red] {e}")
+            raise typer.Exit(code=1) from e
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        console.print(f"Triage daemon listening on {path} (pid {os.getpid()})")
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+
+def _spawn_daemon(path: Path, options: list[str]) -> None:
+    """Start ``daemon start --foreground`` detached and wait until it answers."""
+    command = [sys.executable, "-m", "triage_assistant.cli", "daemon", "start", "--foreground"]
+    process = subprocess.Popen(
+        [*command, "--socket", str(path), *options],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + _DAEMON_START_TIMEOUT_S
+    while time.monotonic() < deadline and process.poll() is None:
+        info = daemon_status(path)
+        if info is not None:
+            console.print(f"Triage daemon started on {path} (pid {info['pid']}).")
+            return
+        time.sleep(0.05)
+    if process.poll() is None:
+        process.terminate()
+    console.print(
+        "[red]The triage daemon did not start.[/red] "
+        "Run `triage-assistant daemon start --foreground` to see why."
+    )
+    raise typer.Exit(code=1)
+
+
+@daemon_app.command("stop")
+def daemon_stop(socket: _SocketOption = None) -> None:
+    """Stop the running daemon."""
+    path = (socket or default_socket_path()).absolute()
+    info = daemon_status(path)
+    if info is None:
+        console.print(f"No triage daemon is running on {path}.")
+        raise typer.Exit(code=1)
+    os.kill(int(str(info["pid"])), signal.SIGTERM)
+    deadline = time.monotonic() + _DAEMON_STOP_TIMEOUT_S
+    while time.monotonic() < deadline and path.exists():
+        time.sleep(0.05)
+    console.print(f"Triage daemon (pid {info['pid']}) stopped.")
+
+
+@daemon_app.command("status")
+def daemon_status_command(socket: _SocketOption = None) -> None:
+    """Print the daemon's adapter and counters as JSON; exit 1 if it is not running."""
+    path = (socket or default_socket_path()).absolute()
+    info = daemon_status(path)
+    if info is None:
+        console.print(f"No triage daemon is running on {path}.")
+        raise typer.Exit(code=1)
+    typer.echo(json.dumps({"socket": str(path), **info}, ensure_ascii=False))
+
+
 @app.command()
 def schema(pretty: Annotated[bool, typer.Option(help="Pretty-print JSON schema.")] = True) -> None:
     """Print the JSON schema for the triage output contract."""
@@ -196,18 +632,17 @@ def doctor() -> None:
     This command is intentionally best-effort and never prints secret values.
     """
 
-    chosen, reason = _auto_adapter_choice()
+    chosen, reason = auto_adapter_choice()
     provider = (os.getenv("TRIAGE_PROVIDER") or "").strip() or None
 
-    gh_missing = _missing_env_for_github_models()
-    foundry_missing = _missing_env_for_foundry()
-    openai_missing = _missing_env_for_openai_compatible()
-
     lines: list[str] = []
     lines.append("triage-assistant doctor")
     lines.append("")
     lines.append("Auto adapter resolution")
     lines.append(f"- TRIAGE_PROVIDER: {provider if provider is not None else '(not set)'}")
+    chain = (os.getenv("TRIAGE_PROVIDER_CHAIN") or "").strip()
+    if chain:
+        lines.append(f"- TRIAGE_PROVIDER_CHAIN: {chain}")
     lines.append(f"- Selected adapter: {chosen} ({reason})")
 
     if chosen == "(invalid)":
@@ -224,9 +659,14 @@ def doctor() -> None:
             return f"- {provider_name}: OK"
         return f"- {provider_name}: missing {', '.join(missing)}"
 
-    lines.append(_fmt_missing("GitHub Models", gh_missing))
-    lines.append(_fmt_missing("Foundry", foundry_missing))
-    lines.append(_fmt_missing("OpenAI-compatible", openai_missing))
+    for spec in BUILTIN_ADAPTERS:
+        if spec.required_env:
+            lines.append(_fmt_missing(spec.label, spec.missing_env()))
+
+    plugins = plugin_adapters()
+    if plugins:
+        lines.append("")
+        lines.append(f"Plugin adapters: {', '.join(spec.name for spec in plugins)}")
 
     typer.echo("\n".join(lines))
 
@@ -249,6 +689,40 @@ def eval(
         Path | None,
         typer.Option(help="Write a Markdown report to this path. If omitted, print summary only."),
     ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            min=1,
+            help=(
+                "Number of worker processes. Rows are sent to workers in chunks and results "
+                "keep dataset order, so metrics and reports match a serial run."
+            ),
+        ),
+    ] = 1,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            min=1,
+            help=(
+                "Requests kept in flight for hosted adapters. The provider's adaptive "
+                "limiter backs off on throttling, so a generous value is safe."
+            ),
+        ),
+    ] = 1,
+    pack_tokens: Annotated[
+        int,
+        typer.Option(
+            min=0,
+            help=(
+                "Hosted adapters only: pack several issues into each request, up to this "
+                "many estimated tokens per request (0 sends one issue per request). "
+                "With --concurrency N, up to N packs are in flight at once."
+            ),
+        ),
+    ] = 0,
+    cache: _CacheOption = None,
+    refresh_cache: _RefreshCacheOption = False,
+    cascade: _CascadeOption = None,
 ) -> None:
     """Run a simple local evaluation against the dataset.
 
@@ -262,13 +736,37 @@ def eval(
     if not dataset.exists():
         raise typer.BadParameter(f"Dataset not found: {dataset}")
 
-    triage_adapter = _resolve_adapter(adapter)
+    if workers > 1 and concurrency > 1:
+        raise typer.BadParameter("Use either --workers or --concurrency, not both.")
+    if workers > 1 and pack_tokens:
+        raise typer.BadParameter("Use --concurrency instead of --workers with --pack-tokens.")
+
+    triage_adapter = _with_cascade(
+        _with_cache(_resolve_adapter(adapter), cache, refresh_cache), cascade
+    )
+    if isinstance(triage_adapter, CascadeAdapter) and workers > 1:
+        # Worker processes would count the cascade paths in their own copies.
+        raise typer.BadParameter("Use --concurrency instead of --workers with --cascade.")
+    if pack_tokens and isinstance(triage_adapter, CascadeAdapter):
+        # The cascade triages issue by issue, so nothing would be packed.
+        raise typer.BadParameter("--pack-tokens cannot be combined with --cascade.")
 
     rows = _load_dataset(dataset)
-    results = []
-    for row in rows:
-        pred = triage_adapter.triage(title=row["title"], body=row["body"])
-        results.append((row, pred))
+    issues = [(row["title"], row["body"]) for row in rows]
+    if pack_tokens and isinstance(triage_adapter, PackingAdapter):
+        if concurrency > 1:
+            preds = asyncio.run(
+                triage_adapter.atriage_batch(
+                    issues, token_budget=pack_tokens, concurrency=concurrency
+                )
+            )
+        else:
+            preds = triage_adapter.triage_batch(issues, token_budget=pack_tokens)
+    elif concurrency > 1:
+        preds = asyncio.run(atriage_all(issues, adapter=triage_adapter, concurrency=concurrency))
+    else:
+        preds = triage_all(issues, adapter=triage_adapter, workers=workers)
+    results = list(zip(rows, preds, strict=True))
 
     metrics = _compute_metrics(results)
 
@@ -280,10 +778,16 @@ def eval(
     )
     typer.echo(summary)
 
+    paths: dict[str, int] | None = None
+    if isinstance(triage_adapter, CascadeAdapter):
+        paths = triage_adapter.path_counts
+        typer.echo(_cascade_summary(paths, threshold=triage_adapter.threshold))
+
     if report is not None:
         report.parent.mkdir(parents=True, exist_ok=True)
         report.write_text(
-            _render_report(dataset=dataset, metrics=metrics, results=results), encoding="utf-8"
+            _render_report(dataset=dataset, metrics=metrics, results=results, cascade=paths),
+            encoding="utf-8",
         )
         typer.echo(f"Wrote report: {report}")
 
@@ -300,6 +804,15 @@ def _load_dataset(path: Path) -> list[dict[str, str]]:
     return rows
 
 
+def _cascade_summary(paths: dict[str, int], *, threshold: float) -> str:
+    total = paths["rules"] + paths["escalated"]
+    share = paths["rules"] / total if total else 0.0
+    return (
+        f"cascade: rules={paths['rules']}, escalated={paths['escalated']} "
+        f"(rules_share={share:.3f}, threshold={threshold:g})"
+    )
+
+
 def _compute_metrics(results: list[tuple[dict[str, str], TriageOutput]]) -> dict[str, float]:
     def parse_labels(s: str) -> set[str]:
         s = s.strip()
@@ -355,6 +868,7 @@ def _render_report(
     dataset: Path,
     metrics: dict[str, float],
     results: list[tuple[dict[str, str], TriageOutput]],
+    cascade: dict[str, int] | None = None,
 ) -> str:
     def _parse_expected_labels(s: str) -> set[str]:
         s = (s or "").strip()
@@ -388,6 +902,13 @@ def _render_report(
     lines.append(f"- Label F1: {metrics['label_f1']:.3f}")
     lines.append("")
 
+    if cascade is not None:
+        lines.append("## Cascade")
+        lines.append("")
+        lines.append(f"- Answered by offline rules: {cascade['rules']}")
+        lines.append(f"- Escalated to the hosted adapter: {cascade['escalated']}")
+        lines.append("")
+
     # Failure pattern analysis (basic grouping is OK; keep deterministic ordering).
     type_confusions: dict[tuple[str, str], int] = {}
     priority_confusions: dict[tuple[str, str], int] = {}
@@ -533,3 +1054,7 @@ def _render_report(
         if count >= 5:
             break
     return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,275 @@
+"""The ``triage-assistant`` entry point, with a fast path to a resident daemon.
+
+Shell pipelines and git hooks may run ``triage-assistant triage`` thousands of times.
+Each run normally pays for interpreter start, imports (typer, pydantic, the adapter), rule
+compilation and, for hosted adapters, a fresh TLS connection. ``triage-assistant daemon
+start`` keeps all of that warm behind a Unix domain socket (see ``server.py``).
+
+When the daemon's socket exists, :func:`main` forwards ``triage`` calls to it using only
+the standard library, before the CLI is imported. It falls back to the regular in-process
+CLI whenever forwarding is not possible or not equivalent:
+
+- no daemon (socket missing, stale or owned by another user) or ``TRIAGE_NO_DAEMON`` set
+- options the fast path does not handle (``--cache``, ``--cascade``, ``--help``, ...)
+- ``--adapter`` names a different adapter than the daemon runs (``auto``, the default, is
+  resolved from this call's ``TRIAGE_PROVIDER_CHAIN`` / ``TRIAGE_PROVIDER`` / tokens first)
+- the daemon's ``--cache`` / ``--cascade`` settings differ from what this call would use
+  (``TRIAGE_CACHE_PATH`` and ``TRIAGE_CASCADE_THRESHOLD``), see :func:`wrapper_options`
+- the daemon rejects the request
+
+Note that the daemon resolves adapters from its own environment, captured at start.
+
+Environment variables:
+
+- TRIAGE_DAEMON_SOCKET (optional; socket path, default ``$XDG_RUNTIME_DIR/triage-assistant.sock``
+  or ``/tmp/triage-assistant-<uid>.sock``)
+- TRIAGE_NO_DAEMON (optional; true/false, set to always triage in-process)
+- TRIAGE_DAEMON_TIMEOUT_S (optional; max seconds to wait for a reply, default 300)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from urllib.parse import quote
+
+DEFAULT_TIMEOUT_S = 300.0
+_CONNECT_TIMEOUT_S = 1.0
+_MAX_HEAD_BYTES = 64 * 1024
+
+
+class DaemonError(RuntimeError):
+    """The daemon accepted a request but did not answer it usably."""
+
+
+def default_socket_path() -> Path:
+    configured = os.getenv("TRIAGE_DAEMON_SOCKET", "").strip()
+    if configured:
+        return Path(configured).expanduser()
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR", "").strip()
+    if runtime_dir:
+        return Path(runtime_dir) / "triage-assistant.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(os.getenv("TMPDIR") or "/tmp") / f"triage-assistant-{uid}.sock"
+
+
+def _timeout_from_env() -> float:
+    raw = os.getenv("TRIAGE_DAEMON_TIMEOUT_S", "").strip()
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_TIMEOUT_S
+    return value if value > 0 else DEFAULT_TIMEOUT_S
+
+
+def request(
+    path: Path,
+    method: str,
+    target: str,
+    payload: object = None,
+    *,
+    headers: dict[str, str] | None = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> tuple[int, bytes] | None:
+    """Send one HTTP request over the daemon socket and return ``(status, body)``.
+
+    Returns ``None`` when no daemon is listening at ``path``, so callers can fall back.
+
+    Raises:
+        DaemonError: If the connection breaks or times out after the request was sent.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        # Never hand issue text to a socket another user could have created.
+        if path.stat().st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode()
+    lines = [f"{method} {target} HTTP/1.1", "Host: triage-assistant", "Connection: close"]
+    if payload is not None:
+        lines.append("Content-Type: application/json")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    message = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(_CONNECT_TIMEOUT_S)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return None  # stale socket file or daemon shutting down
+        sock.settimeout(timeout_s)
+        try:
+            sock.sendall(message)
+            chunks: list[bytes] = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+        except OSError as e:
+            raise DaemonError(f"Lost the connection to the triage daemon: {e}") from e
+    finally:
+        sock.close()
+    return _parse_response(b"".join(chunks))
+
+
+def _parse_response(raw: bytes) -> tuple[int, bytes]:
+    head, sep, body = raw.partition(b"\r\n\r\n")
+    if not sep or len(head) > _MAX_HEAD_BYTES:
+        raise DaemonError("The triage daemon sent an incomplete response.")
+    try:
+        status = int(head.split(b" ", 2)[1])
+    except (IndexError, ValueError) as e:
+        raise DaemonError("The triage daemon sent a malformed response.") from e
+    return status, body
+
+
+def status(path: Path | None = None) -> dict[str, object] | None:
+    """The daemon's ``/healthz`` document, or ``None`` if no daemon answers at ``path``."""
+    try:
+        reply = request(path or default_socket_path(), "GET", "/healthz", timeout_s=5.0)
+    except DaemonError:
+        return None
+    if reply is None or reply[0] != 200:
+        return None
+    data = json.loads(reply[1])
+    return data if isinstance(data, dict) else None
+
+
+def wrapper_options(*, cache: Path | None, refresh_cache: bool, cascade: float | None) -> str:
+    """Canonical form of the cache and cascade settings, compared by the daemon.
+
+    The daemon answers 409 to a call whose ``X-Triage-Options`` header differs from its
+    own, so a forwarded call never gets a cached or cascaded result it did not ask for.
+    """
+    parts: list[str] = []
+    if cache is not None:
+        parts.append(f"cache={quote(str(cache.expanduser().absolute()))}")
+        if refresh_cache:
+            parts.append("refresh-cache")
+    if cascade is not None:
+        parts.append(f"cascade={cascade:g}")
+    return ";".join(parts) or "none"
+
+
+def _options_from_env() -> str | None:
+    """The wrapper options an in-process ``triage`` would use, or ``None`` if invalid."""
+    cache = os.getenv("TRIAGE_CACHE_PATH", "")
+    raw_cascade = os.getenv("TRIAGE_CASCADE_THRESHOLD", "")
+    cascade: float | None = None
+    if raw_cascade:
+        try:
+            cascade = float(raw_cascade)
+        except ValueError:
+            return None  # the CLI reports the bad value
+        if cascade < 0:
+            return None
+    return wrapper_options(
+        cache=Path(cache) if cache else None, refresh_cache=False, cascade=cascade
+    )
+
+
+def _parse_triage_args(args: list[str]) -> dict[str, str | bool] | None:
+    """Options of a ``triage`` call, or ``None`` if the fast path does not handle them."""
+    values: dict[str, str | bool] = {"adapter": "auto", "pretty": False}
+    names = {
+        "--title": "title",
+        "--body": "body",
+        "--body-file": "body_file",
+        "--adapter": "adapter",
+    }
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in {"--pretty", "--no-pretty"}:
+            values["pretty"] = arg == "--pretty"
+            i += 1
+            continue
+        name, eq, value = arg.partition("=")
+        if name not in names:
+            return None
+        if not eq:
+            if i + 1 >= len(args):
+                return None
+            value = args[i + 1]
+            i += 1
+        values[names[name]] = value
+        i += 1
+    if "title" not in values:
+        return None
+    return values
+
+
+def forward_triage(args: list[str], path: Path | None = None) -> int | None:
+    """Run ``triage`` with ``args`` through the daemon and return the exit code.
+
+    Returns ``None`` when the call should run in-process instead.
+    """
+    options = _parse_triage_args(args)
+    if options is None:
+        return None
+    body = str(options.get("body") or "")
+    if "body_file" in options:
+        try:
+            body = Path(str(options["body_file"])).read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None  # the CLI reports unreadable files
+
+    wrappers = _options_from_env()
+    if wrappers is None:
+        return None
+    from .adapters.registry import resolve_adapter_name
+
+    try:
+        adapter = resolve_adapter_name(str(options["adapter"]))
+    except ValueError:
+        return None  # the CLI reports unknown adapters
+    headers = {"X-Triage-Adapter": adapter, "X-Triage-Options": wrappers}
+    try:
+        reply = request(
+            path or default_socket_path(),
+            "POST",
+            "/triage",
+            {"title": options["title"], "body": body},
+            headers=headers,
+            timeout_s=_timeout_from_env(),
+        )
+    except DaemonError as e:
+        print(f"Triage daemon error: {e}", file=sys.stderr)
+        return 1
+    if reply is None:
+        return None
+
+    code, payload = reply
+    if code == 200:
+        if options["pretty"]:
+            text = json.dumps(json.loads(payload), indent=2, ensure_ascii=False)
+        else:
+            text = payload.decode()
+        sys.stdout.write(text + "\n")
+        return 0
+    if code in {502, 500}:
+        message = json.loads(payload).get("error", {}).get("message", "")
+        prefix = "Model adapter error" if code == 502 else "Unexpected error"
+        print(f"{prefix}: {message}", file=sys.stderr)
+        return 2 if code == 502 else 1
+    return None  # adapter or options mismatch, or rejected input: let the CLI handle it
+
+
+def main() -> None:
+    """Console-script entry point: forward ``triage`` to the daemon, else run the CLI."""
+    args = sys.argv[1:]
+    disabled = os.getenv("TRIAGE_NO_DAEMON", "").strip().lower() in {"1", "true", "yes", "on"}
+    if args[:1] == ["triage"] and not disabled:
+        code = forward_triage(args[1:])
+        if code is not None:
+            raise SystemExit(code)
+
+    from .cli import app
+
+    app()
@@ -0,0 +1,340 @@
+"""A local stand-in for the hosted chat-completions providers, with fault injection.
+
+Serves the routes the hosted adapters call, so the adapters can be load-tested and
+benchmarked without a live provider or real quota:
+
+- ``POST /inference/chat/completions`` and ``/orgs/<org>/inference/chat/completions``
+  (GitHub Models)
+- ``POST /chat/completions`` under any prefix, e.g. ``/models/chat/completions``
+  (Foundry model inference)
+- ``POST /v1/chat/completions`` (OpenAI-compatible)
+
+Replies are real triage results: the issue in the user message is classified with the
+offline rules, and packed prompts (``### Issue <id>`` sections) get one result per issue.
+``"stream": true`` requests get server-sent events. ``GET /stats`` returns counters of
+what was served.
+
+Faults are configured with :class:`MockBehavior`: response latency drawn from a
+distribution, 429s with ``Retry-After``, bursts of 5xx responses, slow-drip bodies,
+malformed JSON and replies wrapped in markdown fences. Decisions use a seeded random
+generator, so a run can be replayed.
+
+Usage:
+    triage-assistant mock-server --port 8400
+    triage-assistant mock-server --latency lognormal:0.4,0.6 --rate-limit 0.05 \\
+        --error-every 50 --fenced 0.2
+
+Then point an adapter at it, e.g. ``TRIAGE_OPENAI_BASE_URL=http://127.0.0.1:8400``,
+``TRIAGE_GITHUB_BASE_URL=http://127.0.0.1:8400`` or
+``TRIAGE_FOUNDRY_ENDPOINT=http://127.0.0.1:8400/models``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from ._http import HttpError, error_body, json_bytes, read_request, response_head, send_json
+from .adapters.dummy import DummyAdapter
+from .schema import TriageOutput
+
+_LATENCY_KINDS = ("fixed", "uniform", "exponential", "lognormal")
+_ISSUE = re.compile(r"^### Issue (\S+)\n(.*?)(?=^### Issue |\Z)", re.MULTILINE | re.DOTALL)
+_TITLE_BODY = re.compile(r"Title: (.*?)\n\nBody:\n(.*)", re.DOTALL)
+_STREAM_PIECE_CHARS = 12
+_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Latency:
+    """A response latency distribution, in seconds.
+
+    - ``fixed``: always ``a``
+    - ``uniform``: between ``a`` and ``b``
+    - ``exponential``: mean ``a``
+    - ``lognormal``: median ``a``, shape ``b`` (sigma of the underlying normal); a
+      realistic long tail
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in _LATENCY_KINDS:
+            raise ValueError(f"Latency kind must be one of: {', '.join(_LATENCY_KINDS)}")
+        if self.a < 0 or self.b < 0:
+            raise ValueError("Latency parameters must be >= 0.")
+
+    @staticmethod
+    def parse(spec: str) -> Latency:
+        """Parse ``kind:a[,b]``, e.g. ``fixed:0.05`` or ``lognormal:0.3,0.5``.
+
+        Raises:
+            ValueError: If the spec is malformed.
+        """
+        kind, _, params = spec.strip().partition(":")
+        values = [float(v) for v in params.split(",") if v.strip()] if params else []
+        if len(values) > 2:
+            raise ValueError(f"Too many latency parameters: {spec!r}")
+        return Latency(kind.strip().lower(), *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, max(self.a, self.b))
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.a) if self.a else 0.0
+        if self.kind == "lognormal":
+            return self.a * math.exp(rng.gauss(0.0, self.b)) if self.a else 0.0
+        return self.a
+
+
+@dataclass(frozen=True)
+class MockBehavior:
+    """Faults injected by :class:`MockChatServer`. Rates are fractions of requests (0-1).
+
+    The checks run in this order: latency, 5xx burst, 429, then the reply (which may be
+    fenced, malformed and/or dripped).
+    """
+
+    latency: Latency = field(default_factory=Latency)
+    rate_limit: float = 0.0
+    retry_after_s: float = 1.0
+    error_every: int = 0
+    error_burst: int = 3
+    error_status: int = 503
+    slow_drip: float = 0.0
+    drip_chunk_bytes: int = 16
+    drip_interval_s: float = 0.05
+    malformed: float = 0.0
+    fenced: float = 0.0
+    model: str = "mock-triage"
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("rate_limit", "slow_drip", "malformed", "fenced"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1.")
+        if self.error_every < 0 or self.error_burst < 0:
+            raise ValueError("error_every and error_burst must be >= 0.")
+        if self.drip_chunk_bytes < 1 or self.drip_interval_s < 0 or self.retry_after_s < 0:
+            raise ValueError("Invalid drip or Retry-After settings.")
+
+
+class MockChatServer:
+    """An asyncio HTTP/1.1 server answering chat-completions requests (see module docs).
+
+    Use ``await start()`` / ``await close()`` inside an event loop, or ``running()`` to
+    serve from a background thread (handy for tests and for benchmarking sync code).
+    """
+
+    def __init__(
+        self, behavior: MockBehavior | None = None, *, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.behavior = behavior or MockBehavior()
+        self.host = host
+        self.port = port
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.behavior.seed)
+        self._rules = DummyAdapter()
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed() open.
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @contextmanager
+    def running(self) -> Iterator[str]:
+        """Serve from a background thread; yields the base URL."""
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        stop = asyncio.Event()
+
+        async def main() -> None:
+            await self.start()
+            ready.set()
+            await stop.wait()
+            await self.close()
+
+        thread = threading.Thread(target=loop.run_until_complete, args=(main(),), daemon=True)
+        thread.start()
+        ready.wait()
+        try:
+            yield self.url
+        finally:
+            loop.call_soon_threadsafe(stop.set)
+            thread.join()
+            loop.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while (request := await read_request(reader, max_body=_MAX_BODY_BYTES)) is not None:
+                await self._respond(writer, request.method, request.path, request.body)
+                if not request.keep_alive:
+                    return
+        except HttpError as e:
+            await send_json(writer, e.status, error_body(str(e)))
+        except ConnectionError:
+            return
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes
+    ) -> None:
+        behavior = self.behavior
+        if method == "GET" and path == "/stats":
+            return await _send(writer, 200, json_bytes(dict(self.stats)))
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return await _send(writer, 404, error_body("Not found"))
+
+        count = self.stats["requests"]
+        self.stats["requests"] += 1
+        delay = behavior.latency.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if behavior.error_every and count % behavior.error_every < behavior.error_burst:
+            self.stats["errors"] += 1
+            return await _send(writer, behavior.error_status, error_body("Injected failure"))
+        if self._rng.random() < behavior.rate_limit:
+            self.stats["rate_limited"] += 1
+            headers = {
+                "Retry-After": str(math.ceil(behavior.retry_after_s)),
+                "retry-after-ms": str(int(behavior.retry_after_s * 1000)),
+            }
+            return await _send(writer, 429, error_body("Rate limited"), headers)
+
+        try:
+            request = json.loads(body)
+            messages = request["messages"]
+            prompt = str(messages[-1]["content"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            self.stats["bad_requests"] += 1
+            return await _send(writer, 400, error_body("Expected a chat-completions request"))
+
+        content = self._reply(prompt)
+        if self._rng.random() < behavior.fenced:
+            self.stats["fenced"] += 1
+            content = f"Here is the triage result:\n```json\n{content}\n```\nHope this helps."
+        malformed = self._rng.random() < behavior.malformed
+        drip = self._rng.random() < behavior.slow_drip
+        if malformed:
+            self.stats["malformed"] += 1
+        if drip:
+            self.stats["dripped"] += 1
+        self.stats["ok"] += 1
+
+        if request.get("stream"):
+            self.stats["streamed"] += 1
+            events = self._stream_events(content, malformed=malformed)
+            return await _send_chunked(writer, events, drip=behavior if drip else None)
+        payload = json_bytes(self._completion(content))
+        if malformed:
+            payload = payload[: len(payload) // 2]
+        await _send(writer, 200, payload, drip=behavior if drip else None)
+
+    def _reply(self, prompt: str) -> str:
+        issues = _ISSUE.findall(prompt)
+        if issues:
+            results = [
+                {"id": issue_id, **self._triage(text).model_dump(mode="json")}
+                for issue_id, text in issues
+            ]
+            return json.dumps({"results": results})
+        return self._triage(prompt).to_json()
+
+    def _triage(self, text: str) -> TriageOutput:
+        match = _TITLE_BODY.search(text)
+        title, body = (match.group(1), match.group(2)) if match else ("", text)
+        return self._rules.triage(title=title, body=body)
+
+    def _completion(self, content: str) -> dict[str, Any]:
+        return {
+            "id": f"chatcmpl-mock-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.behavior.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _stream_events(self, content: str, *, malformed: bool) -> list[bytes]:
+        events: list[bytes] = []
+        for start in range(0, len(content), _STREAM_PIECE_CHARS):
+            delta = {"content": content[start : start + _STREAM_PIECE_CHARS]}
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": self.behavior.model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+            data = json_bytes(chunk)
+            if malformed and start == 0:
+                data = data[: len(data) // 2]
+            events.append(b"data: " + data + b"\n\n")
+        events.append(b"data: [DONE]\n\n")
+        return events
+
+
+async def _send(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    headers: dict[str, str] | None = None,
+    *,
+    drip: MockBehavior | None = None,
+) -> None:
+    writer.write(response_head(status, length=len(body), headers=headers))
+    if drip is None:
+        writer.write(body)
+    else:
+        for start in range(0, len(body), drip.drip_chunk_bytes):
+            writer.write(body[start : start + drip.drip_chunk_bytes])
+            await writer.drain()
+            await asyncio.sleep(drip.drip_interval_s)
+    await writer.drain()
+
+
+async def _send_chunked(
+    writer: asyncio.StreamWriter, events: list[bytes], *, drip: MockBehavior | None
+) -> None:
+    writer.write(response_head(200, content_type="text/event-stream"))
+    for event in events:
+        writer.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+        await writer.drain()
+        if drip is not None:
+            await asyncio.sleep(drip.drip_interval_s)
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
@@ -0,0 +1,182 @@
+"""Bulk triage: process pools for local rules, concurrent requests for hosted models.
+
+Rule-based triage is CPU-bound, so threads do not help under the GIL. ``triage_all``
+spreads issues over worker processes in chunks (one pickle round trip per chunk rather
+than per issue) and returns results in input order, so callers such as ``eval`` see
+exactly what a serial run would produce.
+
+Hosted adapters spend their time waiting on the network instead. ``atriage_all`` keeps
+many requests in flight on one event loop; the adapter's ``AdaptiveLimiter`` decides how
+many the provider actually sees.
+
+``atriage_stream`` does the same for inputs of any size: it pulls issues lazily and
+yields results as they finish, so memory stays bounded by the concurrency (and, for
+ordered output, by the reorder window) rather than by the input.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any
+
+from .schema import TriageOutput
+from .triage import TriageAdapter, atriage_issue
+
+# Several chunks per worker keep workers busy when some chunks are slower than others.
+_CHUNKS_PER_WORKER = 4
+_MAX_CHUNK_SIZE = 1024
+
+# Default reorder window of ``atriage_stream``, in multiples of the concurrency.
+_WINDOW_PER_SLOT = 4
+
+_worker_adapter: TriageAdapter | None = None
+
+_Outcome = tuple[int, TriageOutput | Exception]
+_END: Any = object()
+
+
+def triage_all(
+    issues: Sequence[tuple[str, str]],
+    *,
+    adapter: TriageAdapter,
+    workers: int = 1,
+    chunk_size: int | None = None,
+) -> list[TriageOutput]:
+    """Triage ``(title, body)`` pairs, optionally in ``workers`` processes.
+
+    The adapter is pickled once per worker process, not once per issue. With
+    ``workers <= 1`` (or a single issue) everything runs in the calling process.
+
+    Exceptions raised by the adapter propagate to the caller, as in a serial loop.
+    """
+    if workers <= 1 or len(issues) <= 1:
+        return [adapter.triage(title=title, body=body) for title, body in issues]
+    # Imported here: multiprocessing adds noticeably to CLI startup.
+    from concurrent.futures import ProcessPoolExecutor
+
+    if chunk_size is None:
+        chunk_size = -(-len(issues) // (workers * _CHUNKS_PER_WORKER))
+        chunk_size = max(1, min(chunk_size, _MAX_CHUNK_SIZE))
+    chunks = [issues[i : i + chunk_size] for i in range(0, len(issues), chunk_size)]
+
+    results: list[TriageOutput] = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(adapter,),
+    ) as pool:
+        # ``map`` yields in submission order, whatever order the chunks finish in.
+        for chunk_results in pool.map(_triage_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+async def atriage_all(
+    issues: Sequence[tuple[str, str]],
+    *,
+    adapter: TriageAdapter,
+    concurrency: int = 16,
+) -> list[TriageOutput]:
+    """Triage ``(title, body)`` pairs concurrently, at most ``concurrency`` at a time.
+
+    Results keep input order. Adapters without ``atriage`` run in worker threads.
+    Exceptions raised by the adapter propagate to the caller.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1.")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(title: str, body: str) -> TriageOutput:
+        async with semaphore:
+            return await atriage_issue(title=title, body=body, adapter=adapter)
+
+    return list(await asyncio.gather(*(one(title, body) for title, body in issues)))
+
+
+async def atriage_stream(
+    issues: Iterable[tuple[str, str] | Exception],
+    *,
+    adapter: TriageAdapter,
+    concurrency: int = 16,
+    ordered: bool = True,
+    window: int | None = None,
+) -> AsyncIterator[tuple[int, TriageOutput | Exception]]:
+    """Triage ``(title, body)`` pairs lazily; yield ``(input index, result or exception)``.
+
+    At most ``concurrency`` issues are in flight. ``issues`` is consumed only as fast as
+    results are produced, one item at a time in a worker thread, so it may be a file or
+    stdin that blocks. Items that are exceptions (e.g. unparsable input) and exceptions
+    raised by the adapter are yielded in place of a result instead of ending the stream.
+
+    With ``ordered=True`` results come out in input order. Finished results wait in a
+    reorder buffer, and no issue more than ``window`` positions (default: four times
+    ``concurrency``) past the oldest unfinished one is started, which bounds the buffer
+    when a slow issue holds up the line. With ``ordered=False`` results come out as soon
+    as they finish.
+
+    Raises:
+        ValueError: If ``concurrency < 1`` or ``window < concurrency``.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1.")
+    window = concurrency * _WINDOW_PER_SLOT if window is None else window
+    if window < concurrency:
+        raise ValueError("window must be >= concurrency.")
+
+    async def run(index: int, item: tuple[str, str] | Exception) -> _Outcome:
+        if isinstance(item, Exception):
+            return index, item
+        title, body = item
+        try:
+            return index, await atriage_issue(title=title, body=body, adapter=adapter)
+        except Exception as e:
+            return index, e
+
+    source = iter(issues)
+    pending: set[asyncio.Task[_Outcome]] = set()
+    buffer: dict[int, TriageOutput | Exception] = {}
+    started = 0
+    emitted = 0
+    exhausted = False
+    try:
+        while True:
+            while (
+                not exhausted
+                and len(pending) < concurrency
+                and (not ordered or started - emitted < window)
+            ):
+                item = await asyncio.to_thread(next, source, _END)
+                if item is _END:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(run(started, item)))
+                started += 1
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, outcome = task.result()
+                if ordered:
+                    buffer[index] = outcome
+                else:
+                    yield index, outcome
+                    emitted += 1
+            while emitted in buffer:
+                yield emitted, buffer.pop(emitted)
+                emitted += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _init_worker(adapter: TriageAdapter) -> None:
+    global _worker_adapter
+    _worker_adapter = adapter
+
+
+def _triage_chunk(chunk: Sequence[tuple[str, str]]) -> list[TriageOutput]:
+    adapter = _worker_adapter
+    if adapter is None:  # pragma: no cover - the pool initializer always runs first
+        raise RuntimeError("Worker process was not initialized with an adapter.")
+    return [adapter.triage(title=title, body=body) for title, body in chunk]
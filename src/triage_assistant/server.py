@@ -0,0 +1,298 @@
+"""A long-running triage HTTP server with warm adapters and micro-batching.
+
+Starting Python, importing typer, pydantic and httpx, and compiling the rules costs far
+more than triaging one issue. ``triage-assistant serve`` pays that once: the adapter, its
+connection pool and the compiled rules stay warm for every request.
+
+Endpoints (JSON in, JSON out):
+
+- ``POST /triage`` with ``{"title": ..., "body": ...}`` returns a ``TriageOutput``
+- ``POST /triage/batch`` with ``{"issues": [{"id": ..., "title": ..., "body": ...}]}`` (or
+  a bare list) returns ``{"results": [...]}`` with one ``{"id", "result"}`` or
+  ``{"id", "error"}`` entry per issue, in order
+- ``GET /healthz`` returns the status, adapter name and options, pid and request/batch
+  counters
+
+A client may name the adapter it expects in an ``X-Triage-Adapter`` header, and the
+cache and cascade settings it expects in an ``X-Triage-Options`` header (see
+``client.wrapper_options``); a server started differently answers 409 so the client can
+triage in-process instead (see ``client.py``).
+
+Issues from concurrent requests that arrive within ``batch_window_s`` of each other are
+coalesced into one micro-batch (see :class:`MicroBatcher`). Adapters that can pack
+several issues into one request (``PackingAdapter``) receive the batch as a whole;
+others get its issues concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from ._http import HttpError, Request, error_body, json_bytes, read_request, send_json
+from .adapters.dummy import DummyAdapter
+from .adapters.errors import ChatCompletionsError
+from .adapters.packing import PackingAdapter
+from .adapters.registry import normalize_name
+from .schema import TriageOutput
+from .triage import TriageAdapter, aclose_adapter, atriage_issue, close_adapter
+
+DEFAULT_BATCH_WINDOW_S = 0.005
+DEFAULT_MAX_BATCH = 16
+DEFAULT_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+class _Issue(BaseModel):
+    id: Any = None
+    title: str
+    body: str = ""
+
+
+class MicroBatcher:
+    """Coalesce concurrent triage calls into batches for the downstream adapter.
+
+    The first call after an idle period opens a batch; the batch is sent when it holds
+    ``max_batch`` issues or ``window_s`` seconds after it opened, whichever comes first.
+    One bad issue only fails its own call. Adapters with ``atriage_batch_outcomes``
+    report each issue's outcome, so nothing is requested twice; for other packing
+    adapters a failed batch is retried issue by issue.
+    """
+
+    def __init__(
+        self,
+        adapter: TriageAdapter,
+        *,
+        window_s: float = DEFAULT_BATCH_WINDOW_S,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        if window_s < 0 or max_batch < 1:
+            raise ValueError("window_s must be >= 0 and max_batch >= 1.")
+        self.adapter = adapter
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.batches = 0
+        self._pending: list[tuple[str, str, asyncio.Future[TriageOutput]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def triage(self, *, title: str, body: str) -> TriageOutput:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[TriageOutput] = loop.create_future()
+        self._pending.append((title, body, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, str, asyncio.Future[TriageOutput]]]) -> None:
+        issues = [(title, body) for title, body, _ in batch]
+        if len(batch) > 1 and isinstance(self.adapter, PackingAdapter):
+            outcomes_of = getattr(self.adapter, "atriage_batch_outcomes", None)
+            try:
+                if outcomes_of is not None:
+                    # The adapter already retried what its packs missed; settle as is.
+                    outcomes = await outcomes_of(issues)
+                else:
+                    outcomes = await self.adapter.atriage_batch(issues)
+            except Exception:
+                pass
+            else:
+                self._settle(batch, outcomes)
+                return
+
+        self._settle(
+            batch,
+            await asyncio.gather(
+                *(atriage_issue(title=t, body=b, adapter=self.adapter) for t, b in issues),
+                return_exceptions=True,
+            ),
+        )
+
+    @staticmethod
+    def _settle(
+        batch: list[tuple[str, str, asyncio.Future[TriageOutput]]],
+        outcomes: Sequence[TriageOutput | BaseException],
+    ) -> None:
+        for (_, _, future), outcome in zip(batch, outcomes, strict=True):
+            if future.done():
+                continue  # the caller went away
+            if isinstance(outcome, TriageOutput):
+                future.set_result(outcome)
+            elif isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.cancel()
+
+
+class TriageServer:
+    """Serve the triage API over TCP or a Unix domain socket (see module docs)."""
+
+    def __init__(
+        self,
+        adapter: TriageAdapter,
+        *,
+        batch_window_s: float = DEFAULT_BATCH_WINDOW_S,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        adapter_name: str | None = None,
+        options: str | None = None,
+    ) -> None:
+        self.adapter = adapter
+        self.adapter_name = normalize_name(adapter_name) if adapter_name else None
+        self.options = options
+        self.batcher = MicroBatcher(adapter, window_s=batch_window_s, max_batch=max_batch)
+        self.max_body_bytes = max_body_bytes
+        self.stats: Counter[str] = Counter()
+        self._server: asyncio.Server | None = None
+        self._unix_path: Path | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def address(self) -> str:
+        """``http://host:port`` or the socket path of the running server."""
+        if self._server is None:
+            raise RuntimeError("The server is not running.")
+        sockname = self._server.sockets[0].getsockname()
+        if isinstance(sockname, str):
+            return sockname
+        return f"http://{sockname[0]}:{sockname[1]}"
+
+    async def start(self, *, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self._warm()
+        self._server = await asyncio.start_server(self._serve, host, port)
+
+    async def start_unix(self, path: Path) -> None:
+        self._warm()
+        self._server = await asyncio.start_unix_server(self._serve, str(path))
+        self._unix_path = path
+        # Issue text is private to the user who started the server.
+        path.chmod(0o600)
+
+    def _warm(self) -> None:
+        # Rule regexes compile lazily; pay for that before the first request, not during it.
+        rules = getattr(self.adapter, "rules", self.adapter)
+        if isinstance(rules, DummyAdapter):
+            rules.triage(title="warm-up", body="warm-up")
+
+    async def close(self) -> None:
+        """Stop accepting connections and release the adapter's connection pools.
+
+        Wrapper adapters (cache, cascade, failover, hedging) close the adapters they wrap.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._unix_path is not None:
+            self._unix_path.unlink(missing_ok=True)
+            self._unix_path = None
+        await aclose_adapter(self.adapter)
+        close_adapter(self.adapter)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while (request := await read_request(reader, max_body=self.max_body_bytes)) is not None:
+                status, body = await self._handle(request)
+                await send_json(writer, status, body)
+                if not request.keep_alive:
+                    return
+        except HttpError as e:
+            await send_json(writer, e.status, error_body(str(e), kind="bad_request"))
+        except ConnectionError:
+            return
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _handle(self, request: Request) -> tuple[int, bytes]:
+        route = (request.method, request.path.rstrip("/"))
+        if route == ("GET", "/healthz"):
+            stats = {
+                "status": "ok",
+                "adapter": self.adapter_name,
+                "options": self.options,
+                "pid": os.getpid(),
+                "batches": self.batcher.batches,
+                **self.stats,
+            }
+            return 200, json_bytes(stats)
+        expected = request.headers.get("x-triage-adapter")
+        if expected and self.adapter_name and normalize_name(expected) != self.adapter_name:
+            return 409, error_body(f"This server runs the {self.adapter_name!r} adapter.")
+        expected = request.headers.get("x-triage-options")
+        if expected and self.options and expected != self.options:
+            return 409, error_body(f"This server runs with options {self.options!r}.")
+        if route == ("POST", "/triage"):
+            self.stats["requests"] += 1
+            try:
+                issue = _Issue.model_validate_json(request.body)
+            except ValidationError as e:
+                return 400, error_body(_first_error(e), kind="invalid_input")
+            try:
+                result = await self.batcher.triage(title=issue.title, body=issue.body)
+            except Exception as e:
+                status = 502 if isinstance(e, ChatCompletionsError) else 500
+                return status, error_body(str(e), kind=type(e).__name__)
+            return 200, result.to_json().encode()
+        if route == ("POST", "/triage/batch"):
+            self.stats["requests"] += 1
+            return await self._handle_batch(request.body)
+        if request.path.rstrip("/") in {"/healthz", "/triage", "/triage/batch"}:
+            return 405, error_body("Method not allowed.")
+        return 404, error_body("Not found.")
+
+    async def _handle_batch(self, raw: bytes) -> tuple[int, bytes]:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return 400, error_body("Request body is not valid JSON.", kind="invalid_input")
+        items = data.get("issues") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return 400, error_body('Expected {"issues": [...]} or a list.', kind="invalid_input")
+
+        async def one(position: int, item: Any) -> str:
+            issue_id = item.get("id", position) if isinstance(item, dict) else position
+            encoded_id = json.dumps(issue_id, ensure_ascii=False)
+            try:
+                issue = _Issue.model_validate(item)
+            except ValidationError as e:
+                error = json_bytes({"type": "invalid_input", "message": _first_error(e)}).decode()
+                return f'{{"id":{encoded_id},"error":{error}}}'
+            try:
+                result = await self.batcher.triage(title=issue.title, body=issue.body)
+            except Exception as e:
+                error = json_bytes({"type": type(e).__name__, "message": str(e)}).decode()
+                return f'{{"id":{encoded_id},"error":{error}}}'
+            return f'{{"id":{encoded_id},"result":{result.to_json()}}}'
+
+        entries = await asyncio.gather(*(one(i, item) for i, item in enumerate(items)))
+        return 200, f'{{"results":[{",".join(entries)}]}}'.encode()
+
+
+def _first_error(error: ValidationError) -> str:
+    first = error.errors()[0]
+    where = ".".join(str(part) for part in first["loc"])
+    return f"{where}: {first['msg']}" if where else str(first["msg"])
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
-from typing import Protocol
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 from .adapters.dummy import DummyAdapter
-from .adapters.foundry import FoundryModelInferenceAdapter
-from .adapters.github_models import GitHubModelsAdapter
-from .adapters.openai_compatible import OpenAICompatibleAdapter
+from .adapters.registry import adapter_names, detect_adapter, get_adapter_spec
 from .schema import TriageOutput
 
+if TYPE_CHECKING:
+    from .adapters.failover import FailoverAdapter
+
 
 class TriageAdapter(Protocol):
     """A triage adapter produces a schema-valid triage result."""
@@ -18,17 +23,149 @@ class TriageAdapter(Protocol):
         raise NotImplementedError
 
 
+@runtime_checkable
+class AsyncTriageAdapter(Protocol):
+    """An adapter that can also triage without blocking the event loop.
+
+    All bundled adapters implement this. Hosted adapters use ``httpx.AsyncClient``.
+    """
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:  # pragma: no cover
+        raise NotImplementedError
+
+
 @dataclass(frozen=True)
 class TriageEngine:
     """A thin wrapper around a triage adapter.
 
     The intent is to make adapters swappable without changing call sites.
+
+    Repeated content is common (webhook retries, re-opened issues), so the engine can
+    avoid calling the adapter again for a ``(title, body)`` it has already seen:
+
+    - ``memo_size``: keep up to this many recent results in an LRU memo (0 disables it)
+    - ``single_flight``: concurrent identical calls share one adapter call; every
+      caller gets its result (or its exception)
     """
 
     adapter: TriageAdapter
+    memo_size: int = 0
+    single_flight: bool = True
+    _calls: _CallTable = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.memo_size < 0:
+            raise ValueError("memo_size must be >= 0.")
+        object.__setattr__(self, "_calls", _CallTable(self.memo_size))
 
     def triage(self, *, title: str, body: str) -> TriageOutput:
-        return self.adapter.triage(title=title, body=body)
+        if not self.memo_size and not self.single_flight:
+            return self.adapter.triage(title=title, body=body)
+
+        key = (title, body)
+        calls = self._calls
+        leader: Future[TriageOutput] | None = None
+        with calls.lock:
+            cached = calls.recall(key)
+            if cached is not None:
+                return cached
+            shared = calls.in_flight.get(key)
+            if shared is None and self.single_flight:
+                leader = calls.in_flight[key] = Future()
+        if shared is not None:
+            return shared.result()
+
+        try:
+            result = self.adapter.triage(title=title, body=body)
+        except BaseException as e:
+            if leader is not None:
+                calls.finish(key, leader)
+                leader.set_exception(e)
+            raise
+        calls.remember(key, result)
+        if leader is not None:
+            calls.finish(key, leader)
+            leader.set_result(result)
+        return result
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        if not self.memo_size and not self.single_flight:
+            return await atriage_issue(title=title, body=body, adapter=self.adapter)
+
+        key = (title, body)
+        calls = self._calls
+        with calls.lock:
+            cached = calls.recall(key)
+        if cached is not None:
+            return cached
+        if not self.single_flight:
+            return await self._atriage_and_remember(key)
+
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with calls.lock:
+            task = calls.async_in_flight.get(task_key)
+            if task is None:
+                task = loop.create_task(self._atriage_and_remember(key))
+                calls.async_in_flight[task_key] = task
+                task.add_done_callback(lambda t: calls.finish_async(task_key, t))
+        # A cancelled caller must not cancel the call other callers are waiting for.
+        return await asyncio.shield(task)
+
+    async def _atriage_and_remember(self, key: tuple[str, str]) -> TriageOutput:
+        title, body = key
+        result = await atriage_issue(title=title, body=body, adapter=self.adapter)
+        self._calls.remember(key, result)
+        return result
+
+
+class _CallTable:
+    """LRU memo and in-flight calls of one :class:`TriageEngine`."""
+
+    def __init__(self, memo_size: int) -> None:
+        self.memo_size = memo_size
+        self.memo: OrderedDict[tuple[str, str], TriageOutput] = OrderedDict()
+        self.in_flight: dict[tuple[str, str], Future[TriageOutput]] = {}
+        self.async_in_flight: dict[
+            tuple[asyncio.AbstractEventLoop, tuple[str, str]], asyncio.Task[TriageOutput]
+        ] = {}
+        self.lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[_CallTable], tuple[int]]:
+        return _CallTable, (self.memo_size,)
+
+    def recall(self, key: tuple[str, str]) -> TriageOutput | None:
+        """Return the memoized result for ``key``; the caller holds ``lock``."""
+        result = self.memo.get(key)
+        if result is not None:
+            self.memo.move_to_end(key)
+        return result
+
+    def remember(self, key: tuple[str, str], result: TriageOutput) -> None:
+        if not self.memo_size:
+            return
+        with self.lock:
+            self.memo[key] = result
+            self.memo.move_to_end(key)
+            while len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+
+    def finish(self, key: tuple[str, str], future: Future[TriageOutput]) -> None:
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def finish_async(
+        self,
+        task_key: tuple[asyncio.AbstractEventLoop, tuple[str, str]],
+        task: asyncio.Task[TriageOutput],
+    ) -> None:
+        with self.lock:
+            if self.async_in_flight.get(task_key) is task:
+                del self.async_in_flight[task_key]
+        # Mark a failure as retrieved even if every waiter was cancelled meanwhile.
+        if not task.cancelled():
+            task.exception()
 
 
 def get_default_adapter() -> TriageAdapter:
@@ -38,78 +175,135 @@ def get_default_adapter() -> TriageAdapter:
 
     Resolution order:
 
+    0. If TRIAGE_PROVIDER_CHAIN is set (e.g. ``github,foundry,dummy``), fail over along
+       that chain (see :func:`adapter_chain`).
     1. If TRIAGE_PROVIDER is set, use it (explicit beats implicit).
     2. If GitHub Models credentials are present, use GitHub Models.
     3. If Microsoft Foundry credentials are present, use Foundry.
     4. If OpenAI-compatible configuration is present, use the OpenAI-compatible adapter.
     5. Otherwise, fall back to the deterministic DummyAdapter.
 
+    Hosted adapters are wrapped for hedged requests when TRIAGE_HEDGE is enabled
+    (see :func:`hedged_from_env`).
+
     Supported TRIAGE_PROVIDER values:
     - github | github-models
     - foundry
     - openai
     - dummy
+    - any adapter registered through entry points (see ``adapters/registry.py``)
+
+    Only the selected adapter's module is imported.
     """
 
-    provider = os.getenv("TRIAGE_PROVIDER", "").strip().lower()
-    if provider:
-        return _adapter_from_provider(provider)
+    return hedged_from_env(_select_adapter())
 
-    if _has_github_models_config():
-        return GitHubModelsAdapter.from_env()
 
-    if _has_foundry_config():
-        return FoundryModelInferenceAdapter.from_env()
+def hedged_from_env(adapter: TriageAdapter) -> TriageAdapter:
+    """Wrap a hosted ``adapter`` in a :class:`HedgedAdapter` when TRIAGE_HEDGE is enabled.
 
-    if _has_openai_compatible_config():
-        return OpenAICompatibleAdapter.from_env()
+    - TRIAGE_HEDGE (true/false, default: false)
+    - TRIAGE_HEDGE_PROVIDER (optional; send duplicates to this provider instead)
+    - TRIAGE_HEDGE_PERCENTILE / TRIAGE_HEDGE_INITIAL_DELAY_S / TRIAGE_HEDGE_MAX_RATE
+    """
+    enabled = os.getenv("TRIAGE_HEDGE", "").strip().lower() in {"1", "true", "yes", "on"}
+    if not enabled or isinstance(adapter, DummyAdapter):
+        return adapter
+    from .adapters.hedging import HedgedAdapter
 
-    return DummyAdapter()
+    provider = os.getenv("TRIAGE_HEDGE_PROVIDER", "").strip().lower()
+    secondary = _adapter_from_provider(provider) if provider else None
+    return HedgedAdapter.from_env(adapter, secondary)
 
 
-def _adapter_from_provider(provider: str) -> TriageAdapter:
-    normalized = provider.replace("_", "-")
+def adapter_chain(chain: str) -> FailoverAdapter:
+    """Build a :class:`FailoverAdapter` from comma-separated provider names.
 
-    if normalized in {"github", "github-models"}:
-        return GitHubModelsAdapter.from_env()
+    Providers whose environment variables are missing are left out of the chain, so one
+    chain setting works across environments.
 
-    if normalized in {"foundry", "azure-foundry", "ai-foundry"}:
-        return FoundryModelInferenceAdapter.from_env()
+    Raises:
+        ValueError: If a name is unsupported or no provider in the chain is configured.
+    """
+    from .adapters.failover import FailoverAdapter
+
+    adapters: list[TriageAdapter] = []
+    for name in chain.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            adapters.append(_adapter_from_provider(name))
+        except KeyError:
+            continue
+    if not adapters:
+        raise ValueError(f"No provider in TRIAGE_PROVIDER_CHAIN is configured: {chain!r}")
+    return FailoverAdapter.from_env(adapters)
+
+
+def _select_adapter() -> TriageAdapter:
+    chain = os.getenv("TRIAGE_PROVIDER_CHAIN", "").strip()
+    if chain:
+        return adapter_chain(chain)
 
-    if normalized in {"openai", "openai-compatible"}:
-        return OpenAICompatibleAdapter.from_env()
+    provider = os.getenv("TRIAGE_PROVIDER", "").strip().lower()
+    if provider:
+        return _adapter_from_provider(provider)
 
-    if normalized in {"dummy", "offline"}:
-        return DummyAdapter()
+    spec, _reason = detect_adapter()
+    return spec.create()
 
-    raise ValueError(
-        "Unsupported TRIAGE_PROVIDER. Use one of: github, foundry, openai, dummy. "
-        f"Got: {provider!r}"
-    )
 
+def _adapter_from_provider(provider: str) -> TriageAdapter:
+    try:
+        spec = get_adapter_spec(provider)
+    except ValueError:
+        raise ValueError(
+            f"Unsupported TRIAGE_PROVIDER. Use one of: {', '.join(adapter_names())}. "
+            f"Got: {provider!r}"
+        ) from None
+    return spec.create()
 
-def _has_github_models_config() -> bool:
-    token = (os.getenv("TRIAGE_GITHUB_TOKEN") or os.getenv("GITHUB_TOKEN") or "").strip()
-    return bool(token)
 
+def triage_issue(*, title: str, body: str, adapter: TriageAdapter | None = None) -> TriageOutput:
+    """Convenience function for callers that don't need an engine instance."""
+    effective_adapter = adapter or get_default_adapter()
+    return effective_adapter.triage(title=title, body=body)
 
-def _has_foundry_config() -> bool:
-    endpoint = os.getenv("TRIAGE_FOUNDRY_ENDPOINT", "").strip()
-    api_key = (
-        os.getenv("TRIAGE_FOUNDRY_API_KEY") or os.getenv("AZURE_INFERENCE_CREDENTIAL") or ""
-    ).strip()
-    model = os.getenv("TRIAGE_FOUNDRY_MODEL", "").strip()
-    return bool(endpoint and api_key and model)
 
+async def atriage_issue(
+    *, title: str, body: str, adapter: TriageAdapter | None = None
+) -> TriageOutput:
+    """Async counterpart of :func:`triage_issue`; see :func:`atriage_with`."""
+    return await atriage_with(adapter or get_default_adapter(), title=title, body=body)
 
-def _has_openai_compatible_config() -> bool:
-    base_url = os.getenv("TRIAGE_OPENAI_BASE_URL", "").strip()
-    api_key = os.getenv("TRIAGE_OPENAI_API_KEY", "").strip()
-    model = os.getenv("TRIAGE_OPENAI_MODEL", "").strip()
-    return bool(base_url and api_key and model)
 
+async def atriage_with(adapter: TriageAdapter, *, title: str, body: str) -> TriageOutput:
+    """Triage with ``adapter`` without blocking the event loop.
 
-def triage_issue(*, title: str, body: str, adapter: TriageAdapter | None = None) -> TriageOutput:
-    """Convenience function for callers that don't need an engine instance."""
-    effective_adapter = adapter or get_default_adapter()
-    return effective_adapter.triage(title=title, body=body)
+    Uses the adapter's native ``atriage`` when it has one. Adapters that only implement
+    the blocking ``triage`` run in a worker thread so the event loop stays responsive.
+    Wrapper adapters use this to call the adapters they wrap.
+    """
+    atriage = getattr(adapter, "atriage", None)
+    if atriage is not None:
+        result: TriageOutput = await atriage(title=title, body=body)
+        return result
+    return await asyncio.to_thread(adapter.triage, title=title, body=body)
+
+
+def close_adapter(adapter: object) -> None:
+    """Release ``adapter``'s connections via its ``close()``, if it has one.
+
+    Wrapper adapters pass this on to the adapters they wrap.
+    """
+    close = getattr(adapter, "close", None)
+    if close is not None:
+        close()
+
+
+async def aclose_adapter(adapter: object) -> None:
+    """Async counterpart of :func:`close_adapter`, using the adapter's ``aclose()``."""
+    aclose = getattr(adapter, "aclose", None)
+    if aclose is not None:
+        await aclose()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from collections.abc import Iterator
+from importlib import metadata
+
+import pytest
+from typer.testing import CliRunner
+
+from triage_assistant.adapters import registry
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.registry import (
+    ENTRY_POINT_GROUP,
+    get_adapter_spec,
+    plugin_adapters,
+)
+from triage_assistant.cli import app
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+from triage_assistant.triage import get_default_adapter
+
+runner = CliRunner()
+
+
+class _PluginAdapter:
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        return TriageOutput(
+            type=IssueType.question, priority=Priority.p2, labels=[], rationale="plugin"
+        )
+
+
+def make_plugin_adapter() -> _PluginAdapter:
+    return _PluginAdapter()
+
+
+@pytest.fixture
+def plugins(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    installed = [
+        metadata.EntryPoint(
+            name="my_llm", value=f"{__name__}:make_plugin_adapter", group=ENTRY_POINT_GROUP
+        ),
+        metadata.EntryPoint(
+            name="dummy", value=f"{__name__}:make_plugin_adapter", group=ENTRY_POINT_GROUP
+        ),
+    ]
+
+    def entry_points(*, group: str) -> list[metadata.EntryPoint]:
+        return [ep for ep in installed if ep.group == group]
+
+    monkeypatch.setattr(metadata, "entry_points", entry_points)
+    plugin_adapters.cache_clear()
+    yield
+    plugin_adapters.cache_clear()
+
+
+def test_names_and_aliases_resolve_to_one_spec() -> None:
+    assert get_adapter_spec("GitHub_Models") is get_adapter_spec("github")
+    assert get_adapter_spec(" offline ").name == "dummy"
+    with pytest.raises(ValueError, match="Use one of: github, foundry, openai, dummy"):
+        get_adapter_spec("nope")
+
+
+def test_missing_env_lists_unset_variables(monkeypatch: pytest.MonkeyPatch) -> None:
+    for var in ("TRIAGE_FOUNDRY_ENDPOINT", "TRIAGE_FOUNDRY_API_KEY", "TRIAGE_FOUNDRY_MODEL"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("AZURE_INFERENCE_CREDENTIAL", "k")
+    assert get_adapter_spec("foundry").missing_env() == [
+        "TRIAGE_FOUNDRY_ENDPOINT",
+        "TRIAGE_FOUNDRY_MODEL",
+    ]
+
+
+def test_creating_the_dummy_adapter_does_not_import_hosted_adapters() -> None:
+    code = (
+        "import sys\n"
+        "from triage_assistant.adapters.registry import get_adapter_spec\n"
+        "get_adapter_spec('dummy').create()\n"
+        "print(sorted(m for m in ('httpx', 'rich', 'sqlite3') if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "[]"
+
+
+def test_cli_dummy_path_does_not_import_httpx_or_rich() -> None:
+    code = (
+        "import sys\n"
+        "from triage_assistant.cli import app\n"
+        "sys.argv = ['triage-assistant', 'triage', '--title', 'Crash', '--adapter', 'dummy']\n"
+        "try:\n"
+        "    app()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('httpx', 'rich', 'sqlite3') if m in sys.modules), file=sys.stderr)\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert proc.stderr.strip() == "[]"
+
+
+@pytest.mark.usefixtures("plugins")
+def test_entry_point_adapters_are_selectable_by_name(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert registry.adapter_names()[-1] == "my-llm"
+    assert isinstance(get_adapter_spec("my-llm").create(), _PluginAdapter)
+    # Built-in names win over entry points with the same name.
+    assert isinstance(get_adapter_spec("dummy").create(), DummyAdapter)
+
+    monkeypatch.delenv("TRIAGE_PROVIDER_CHAIN", raising=False)
+    monkeypatch.delenv("TRIAGE_HEDGE", raising=False)
+    monkeypatch.setenv("TRIAGE_PROVIDER", "my_llm")
+    assert isinstance(get_default_adapter(), _PluginAdapter)
+
+    result = runner.invoke(app, ["triage", "--title", "How?", "--adapter", "my-llm"])
+    assert result.exit_code == 0, result.output
+    assert TriageOutput.model_validate_json(result.stdout).type == IssueType.question
+
+
+@pytest.mark.usefixtures("plugins")
+def test_doctor_lists_plugin_adapters() -> None:
+    result = runner.invoke(app, ["doctor"], env={"TRIAGE_PROVIDER": "my-llm"})
+    assert result.exit_code == 0
+    assert "Selected adapter: my-llm (TRIAGE_PROVIDER=my-llm)" in result.stdout
+    assert "Plugin adapters: my-llm, dummy" in result.stdout
+
+
+def test_unknown_cli_adapter_is_a_usage_error() -> None:
+    result = runner.invoke(app, ["triage", "--title", "x", "--adapter", "nope"])
+    assert result.exit_code == 2
+    assert "Unknown adapter" in result.output
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import ChatCompletionsError, RetryPolicy
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+from triage_assistant.triage import atriage_issue
+
+_CONTENT = '{"type": "bug", "priority": "p1", "labels": ["bug"], "rationale": "Crash report."}'
+
+
+def _mock_async_client(
+    monkeypatch: pytest.MonkeyPatch, handler: Any, created: list[httpx.AsyncClient]
+) -> None:
+    real_async_client = httpx.AsyncClient
+
+    def factory(**kwargs: Any) -> httpx.AsyncClient:
+        client = real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+
+
+def test_hosted_adapter_atriage_reuses_async_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen_urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json={"choices": [{"message": {"content": _CONTENT}}]})
+
+    created: list[httpx.AsyncClient] = []
+    _mock_async_client(monkeypatch, handler, created)
+    adapter = OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+
+    async def run() -> list[TriageOutput]:
+        async with adapter:
+            return list(
+                await asyncio.gather(
+                    adapter.atriage(title="Crash", body="boom"),
+                    adapter.atriage(title="Crash again", body="boom"),
+                )
+            )
+
+    results = asyncio.run(run())
+
+    assert [r.type for r in results] == [IssueType.bug, IssueType.bug]
+    assert seen_urls == ["https://example.test/v1/chat/completions"] * 2
+    assert len(created) == 1
+    assert created[0].is_closed
+
+
+def test_hosted_adapter_atriage_maps_http_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    _mock_async_client(monkeypatch, lambda request: httpx.Response(429), [])
+    adapter = OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", retry=RetryPolicy(max_retries=0)
+    )
+
+    with pytest.raises(ChatCompletionsError, match="HTTP 429"):
+        asyncio.run(adapter.atriage(title="Crash", body="boom"))
+
+
+def test_dummy_adapter_atriage_matches_triage() -> None:
+    adapter = DummyAdapter()
+    title, body = "Crash on startup", "Steps to reproduce:\n1. Launch"
+    assert asyncio.run(adapter.atriage(title=title, body=body)) == adapter.triage(
+        title=title, body=body
+    )
+
+
+def test_atriage_issue_runs_sync_only_adapters_in_a_thread() -> None:
+    class SyncOnlyAdapter:
+        def triage(self, *, title: str, body: str) -> TriageOutput:
+            return TriageOutput(
+                type=IssueType.question, priority=Priority.p2, rationale=f"{title}/{body}"
+            )
+
+    out = asyncio.run(atriage_issue(title="How?", body="Please", adapter=SyncOnlyAdapter()))
+    assert out.rationale == "How?/Please"
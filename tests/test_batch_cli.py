@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from triage_assistant import cli
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.parallel import atriage_stream
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+
+runner = CliRunner()
+
+_RESULT = TriageOutput(type=IssueType.bug, priority=Priority.p1, labels=[], rationale="r")
+
+
+class _SlowFirst:
+    """Answers the issue titled "slow" last, everything else immediately."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05 if title == "slow" else 0)
+            if title == "boom":
+                raise RuntimeError("adapter failed")
+            return _RESULT
+        finally:
+            self.in_flight -= 1
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:  # pragma: no cover
+        raise AssertionError("the async path should be used")
+
+
+async def _collect(issues: list[tuple[str, str]], **options: Any) -> list[int]:
+    return [index async for index, _ in atriage_stream(issues, **options)]
+
+
+def test_ordered_stream_keeps_input_order() -> None:
+    issues = [("slow", "")] + [("fast", "")] * 5
+    order = asyncio.run(_collect(issues, adapter=_SlowFirst(), concurrency=3))
+    assert order == list(range(6))
+
+
+def test_unordered_stream_yields_as_ready() -> None:
+    issues = [("slow", "")] + [("fast", "")] * 5
+    order = asyncio.run(_collect(issues, adapter=_SlowFirst(), concurrency=3, ordered=False))
+    assert sorted(order) == list(range(6))
+    assert order[-1] == 0
+
+
+def test_reorder_window_bounds_run_ahead() -> None:
+    # While the first issue is slow, at most ``window`` issues may have been started.
+    pulled: list[int] = []
+
+    def issues() -> Iterator[tuple[str, str]]:
+        for i in range(100):
+            pulled.append(i)
+            yield ("slow" if i == 0 else "fast", "")
+
+    async def first() -> int:
+        stream = atriage_stream(issues(), adapter=_SlowFirst(), concurrency=2, window=4)
+        index, _ = await anext(stream)
+        await stream.aclose()  # type: ignore[attr-defined]
+        return index
+
+    assert asyncio.run(first()) == 0
+    assert len(pulled) <= 5
+
+
+def test_adapter_errors_are_yielded_not_raised() -> None:
+    async def run() -> list[TriageOutput | Exception]:
+        issues = [("ok", ""), ("boom", ""), ("ok", "")]
+        return [o async for _, o in atriage_stream(issues, adapter=_SlowFirst())]
+
+    outcomes = asyncio.run(run())
+    assert isinstance(outcomes[1], RuntimeError)
+    assert outcomes[0] == outcomes[2] == _RESULT
+
+
+def test_invalid_window_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(_collect([], adapter=_SlowFirst(), concurrency=4, window=2))
+
+
+def test_batch_command_writes_results_and_error_records(tmp_path: Path) -> None:
+    source = tmp_path / "issues.jsonl"
+    lines = [
+        json.dumps({"id": "a-1", "title": "App crashes on save", "body": "error"}),
+        "",
+        "{not json",
+        json.dumps({"title": "Typo in README"}),
+        json.dumps({"id": 7, "body": "no title"}),
+    ]
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    result = runner.invoke(cli.app, ["batch", str(source), "--adapter", "dummy"])
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+    assert [r["id"] for r in records] == ["a-1", 3, 4, 7]
+    expected = DummyAdapter().triage(title="App crashes on save", body="error")
+    assert TriageOutput.model_validate(records[0]["result"]) == expected
+    assert records[1]["error"]["type"] == "invalid_input"
+    assert records[2]["result"]["type"] == "docs"
+    assert records[3]["error"]["type"] == "invalid_input"
+    # Result and error records share the same compact formatting.
+    error_lines = [line for line in result.stdout.splitlines() if '"error":' in line]
+    assert error_lines and all('{"type":"invalid_input","message":' in line for line in error_lines)
+
+
+def test_batch_command_reads_stdin_and_writes_output_file(tmp_path: Path) -> None:
+    out = tmp_path / "out.jsonl"
+    stdin = "".join(json.dumps({"id": i, "title": f"Crash {i}"}) + "\n" for i in range(20))
+
+    result = runner.invoke(
+        cli.app,
+        ["batch", "-", "-o", str(out), "--adapter", "dummy", "--unordered", "--concurrency", "4"],
+        input=stdin,
+    )
+
+    assert result.exit_code == 0, result.output
+    ids = sorted(json.loads(line)["id"] for line in out.read_text(encoding="utf-8").splitlines())
+    assert ids == list(range(20))
+
+
+def test_stream_memory_does_not_grow_with_input() -> None:
+    def issues(n: int) -> Iterator[tuple[str, str]]:
+        for i in range(n):
+            yield (f"Crash {i}", "error " * 50)
+
+    async def drain(n: int) -> int:
+        peak = 0
+        async for _ in atriage_stream(issues(n), adapter=DummyAdapter(), concurrency=8):
+            peak = max(peak, tracemalloc.get_traced_memory()[0])
+        return peak
+
+    tracemalloc.start()
+    try:
+        small = asyncio.run(drain(200))
+        tracemalloc.reset_peak()
+        large = asyncio.run(drain(2000))
+    finally:
+        tracemalloc.stop()
+    assert large < small * 2
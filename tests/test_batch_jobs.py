@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.batch_jobs import BatchJobError
+from triage_assistant.adapters.openai_compatible import (
+    OpenAICompatibleAdapter,
+    OpenAICompatibleError,
+)
+
+_ISSUES = [(f"Issue {name}", f"Body {name}") for name in ("a", "b", "c", "d")]
+
+
+def _reply(priority: str) -> dict[str, Any]:
+    content = json.dumps(
+        {"type": "bug", "priority": priority, "labels": [], "rationale": "stand-in"}
+    )
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class _BatchServer:
+    """In-memory stand-in for the files and batches endpoints."""
+
+    def __init__(self, *, fail_first: dict[str, str] | None = None, polls: int = 1) -> None:
+        self.fail_first = fail_first or {}
+        self.polls = polls
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.submitted: list[list[dict[str, Any]]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            file_id = f"file-{len(self.files)}"
+            body = request.read()
+            assert b'name="purpose"' in body and b"batch" in body
+            lines = [line for line in body.splitlines() if line.startswith(b'{"custom_id"')]
+            self.files[file_id] = b"\n".join(lines)
+            return httpx.Response(200, json={"id": file_id, "purpose": "batch"})
+        if path == "/v1/batches" and request.method == "POST":
+            spec = json.loads(request.content)
+            assert spec["endpoint"] == "/v1/chat/completions"
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "status": "validating",
+                "input_file_id": spec["input_file_id"],
+                "polls": 0,
+            }
+            return httpx.Response(200, json=self._public(self.batches[batch_id]))
+        if path.endswith("/cancel"):
+            batch = self.batches[path.split("/")[3]]
+            batch["status"] = "cancelled"
+            return httpx.Response(200, json=self._public(batch))
+        if path.startswith("/v1/batches/"):
+            batch = self.batches[path.rsplit("/", 1)[-1]]
+            batch["polls"] += 1
+            if batch["polls"] >= self.polls and batch["status"] != "completed":
+                self._complete(batch)
+            else:
+                batch["status"] = "in_progress"
+            return httpx.Response(200, json=self._public(batch))
+        if path.startswith("/v1/files/") and path.endswith("/content"):
+            return httpx.Response(200, content=self.files[path.split("/")[3]])
+        return httpx.Response(404)
+
+    def _public(self, batch: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in batch.items() if key != "polls"}
+
+    def _complete(self, batch: dict[str, Any]) -> None:
+        requests = [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines()]
+        first_round = not self.submitted
+        self.submitted.append(requests)
+        output: list[bytes] = []
+        errors: list[bytes] = []
+        for request in requests:
+            custom_id = request["custom_id"]
+            failure = self.fail_first.get(custom_id) if first_round else None
+            if failure == "http":
+                record = {
+                    "custom_id": custom_id,
+                    "response": {"status_code": 500, "body": {"error": {"message": "boom"}}},
+                }
+                errors.append(json.dumps(record).encode())
+                continue
+            priority = "p9" if failure == "invalid" else "p1"
+            record = {
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "body": _reply(priority)},
+            }
+            output.append(json.dumps(record).encode())
+        batch["status"] = "completed"
+        batch["output_file_id"] = f"file-{len(self.files)}"
+        self.files[batch["output_file_id"]] = b"\n".join(reversed(output))
+        if errors:
+            batch["error_file_id"] = f"file-{len(self.files)}"
+            self.files[batch["error_file_id"]] = b"\n".join(errors)
+
+
+def _adapter(
+    monkeypatch: pytest.MonkeyPatch, server: Callable[[httpx.Request], httpx.Response]
+) -> OpenAICompatibleAdapter:
+    real_client = httpx.Client
+    transport = httpx.MockTransport(server)
+    monkeypatch.setattr(httpx, "Client", lambda **kw: real_client(transport=transport, **kw))
+    return OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+
+
+def test_batch_job_returns_results_in_input_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer(polls=3)
+    adapter = _adapter(monkeypatch, server)
+
+    results = adapter.run_batch_job(_ISSUES, poll_interval_s=0)
+
+    assert [r.priority for r in results] == ["p1"] * len(_ISSUES)
+    assert len(server.submitted) == 1
+    request = server.submitted[0][1]
+    assert request["custom_id"] == "issue-1"
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["model"] == "m"
+    assert "Issue b" in request["body"]["messages"][-1]["content"]
+
+
+def test_partial_failures_are_resubmitted(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer(fail_first={"issue-1": "http", "issue-3": "invalid"})
+    adapter = _adapter(monkeypatch, server)
+
+    results = adapter.run_batch_job(_ISSUES, poll_interval_s=0)
+
+    assert len(results) == len(_ISSUES)
+    assert [[r["custom_id"] for r in job] for job in server.submitted] == [
+        ["issue-0", "issue-1", "issue-2", "issue-3"],
+        ["issue-1", "issue-3"],
+    ]
+
+
+def test_exhausted_resubmits_raise_with_partial_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer(fail_first={"issue-2": "http"})
+    adapter = _adapter(monkeypatch, server)
+
+    with pytest.raises(BatchJobError) as info:
+        adapter.run_batch_job(_ISSUES, poll_interval_s=0, max_resubmits=0)
+
+    assert sorted(info.value.results) == [0, 1, 3]
+    assert list(info.value.failed) == [2]
+    assert "HTTP 500" in info.value.failed[2]
+
+
+def test_unfinished_job_is_cancelled(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer(polls=10**6)
+    adapter = _adapter(monkeypatch, server)
+
+    with pytest.raises(BatchJobError, match="did not finish"):
+        adapter.run_batch_job(_ISSUES, poll_interval_s=0.01, max_wait_s=0.05)
+
+    assert server.batches["batch-0"]["status"] == "cancelled"
+
+
+def test_timed_out_resubmission_keeps_earlier_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer(fail_first={"issue-1": "http"})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = server(request)
+        if server.submitted:
+            server.polls = 10**6  # the resubmitted job never finishes
+        return response
+
+    adapter = _adapter(monkeypatch, handler)
+
+    with pytest.raises(BatchJobError, match="did not finish") as info:
+        adapter.run_batch_job(_ISSUES, poll_interval_s=0.01, max_wait_s=0.05)
+
+    assert sorted(info.value.results) == [0, 2, 3]
+    assert list(info.value.failed) == [1]
+
+
+def test_throttled_files_and_batches_calls_are_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _BatchServer()
+    throttled: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = f"{request.method} {request.url.path}"
+        if key not in throttled:
+            throttled.append(key)
+            if request.method == "GET":
+                return httpx.Response(503)
+            return httpx.Response(429, headers={"retry-after": "0"})
+        return server(request)
+
+    adapter = _adapter(monkeypatch, handler)
+
+    results = adapter.run_batch_job(_ISSUES, poll_interval_s=0)
+
+    assert len(results) == len(_ISSUES)
+    assert "POST /v1/files" in throttled and "POST /v1/batches" in throttled
+    assert "GET /v1/batches/batch-0" in throttled
+
+
+def test_uploads_are_not_resent_after_a_server_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    uploads: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        uploads.append(request)
+        return httpx.Response(503)  # the file may have been stored anyway
+
+    adapter = _adapter(monkeypatch, handler)
+
+    with pytest.raises(OpenAICompatibleError, match="503"):
+        adapter.run_batch_job(_ISSUES, poll_interval_s=0)
+    assert len(uploads) == 1
+
+
+def test_files_api_errors_use_provider_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = _adapter(monkeypatch, lambda request: httpx.Response(401))
+
+    with pytest.raises(OpenAICompatibleError, match="HTTP 401"):
+        adapter.run_batch_job(_ISSUES, poll_interval_s=0)
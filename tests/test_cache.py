@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from triage_assistant.adapters.cache import CachedAdapter, ResponseCache
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.cli import app
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+
+_CONTENT = '{"type": "bug", "priority": "p1", "labels": ["bug"], "rationale": "Crash report."}'
+
+
+def _output(rationale: str) -> TriageOutput:
+    return TriageOutput(type=IssueType.bug, priority=Priority.p1, rationale=rationale)
+
+
+@pytest.fixture
+def requests_seen(monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": _CONTENT}}]})
+
+    real_client = httpx.Client
+
+    def factory(**kwargs: Any) -> httpx.Client:
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "Client", factory)
+    return seen
+
+
+def test_cache_round_trip_uses_wal(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache" / "triage.sqlite3")
+    assert cache.get("k") is None
+
+    cache.put("k", _output("first"))
+    assert cache.get("k") == _output("first")
+
+    with sqlite3.connect(cache.path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_cache_expires_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ResponseCache(tmp_path / "triage.sqlite3", ttl_s=60)
+    cache.put("k", _output("old"))
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(time, "time", lambda: float(next(clock)))
+    cache = ResponseCache(tmp_path / "triage.sqlite3", max_entries=2)
+
+    cache.put("a", _output("a"))
+    cache.put("b", _output("b"))
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", _output("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_cache_inserts_do_not_count_the_table(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "triage.sqlite3", max_entries=50)
+    statements: list[str] = []
+    cache._connection().set_trace_callback(statements.append)
+
+    for i in range(60):
+        cache.put(f"k{i}", _output(str(i)))
+    cache.put("k59", _output("replaced"))
+
+    counts = [s for s in statements if "COUNT(*)" in s]
+    assert len(counts) == 1
+    assert len(cache) == 50
+    assert cache.get("k9") is None and cache.get("k59") == _output("replaced")
+
+
+def test_cached_adapter_skips_identical_requests(
+    tmp_path: Path, requests_seen: list[httpx.Request]
+) -> None:
+    cache = ResponseCache(tmp_path / "triage.sqlite3")
+    inner = OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+    adapter = CachedAdapter(inner=inner, cache=cache)
+
+    first = adapter.triage(title="Crash", body="boom")
+    second = adapter.triage(title="Crash", body="boom")
+    assert first == second
+    assert len(requests_seen) == 1
+
+    # Different sampling settings or prompt text are different cache entries.
+    warmer = OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", temperature=0.9
+    )
+    CachedAdapter(inner=warmer, cache=cache).triage(title="Crash", body="boom")
+    adapter.triage(title="Crash", body="boom!")
+    assert len(requests_seen) == 3
+
+    CachedAdapter(inner=inner, cache=cache, refresh=True).triage(title="Crash", body="boom")
+    assert len(requests_seen) == 4
+
+
+def test_cache_key_ignores_credentials() -> None:
+    def adapter(api_key: str) -> OpenAICompatibleAdapter:
+        return OpenAICompatibleAdapter(base_url="https://example.test", api_key=api_key, model="m")
+
+    assert adapter("a").cache_key(title="t", body="b") == adapter("b").cache_key(
+        title="t", body="b"
+    )
+    assert adapter("a").cache_key(title="t", body="b") != adapter("a").cache_key(
+        title="t", body="c"
+    )
+
+
+class _SlowSyncAdapter:
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        time.sleep(0.1)
+        return _output(title)
+
+    def cache_key(self, *, title: str, body: str) -> str:
+        return title
+
+
+def test_async_calls_do_not_block_the_event_loop(tmp_path: Path) -> None:
+    adapter = CachedAdapter(inner=_SlowSyncAdapter(), cache=ResponseCache(tmp_path / "c.sqlite3"))
+
+    async def run() -> tuple[list[TriageOutput], int]:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        results = await adapter.atriage_batch([("a", ""), ("b", "")])
+        ticker.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+    assert [r.rationale for r in results] == ["a", "b"]
+    # The loop kept running while the inner adapter slept for 0.2 s.
+    assert ticks >= 5
+    assert asyncio.run(adapter.atriage(title="a", body="")) == results[0]
+
+
+def test_cache_pickles_as_settings(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "triage.sqlite3", ttl_s=None, max_entries=5)
+    cache.put("k", _output("x"))
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert (copy.path, copy.ttl_s, copy.max_entries) == (cache.path, None, 5)
+    assert copy.get("k") == _output("x")
+
+
+def test_cli_cache_flag(tmp_path: Path, requests_seen: list[httpx.Request]) -> None:
+    env = {
+        "TRIAGE_OPENAI_BASE_URL": "https://example.test",
+        "TRIAGE_OPENAI_API_KEY": "k",
+        "TRIAGE_OPENAI_MODEL": "m",
+    }
+    args = ["triage", "--adapter", "openai", "--title", "Crash", "--body", "boom"]
+    cache_args = ["--cache", str(tmp_path / "triage.sqlite3")]
+    runner = CliRunner()
+
+    for _ in range(2):
+        result = runner.invoke(app, [*args, *cache_args], env=env)
+        assert result.exit_code == 0, result.output
+    assert len(requests_seen) == 1
+
+    result = runner.invoke(app, [*args, *cache_args, "--refresh-cache"], env=env)
+    assert result.exit_code == 0, result.output
+    assert len(requests_seen) == 2
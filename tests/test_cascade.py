@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from triage_assistant import cli
+from triage_assistant.adapters.cascade import CascadeAdapter
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+
+_MODEL_RESULT = TriageOutput(
+    type=IssueType.question, priority=Priority.p2, labels=["model"], rationale="From the model."
+)
+
+
+class _Model:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.threads: list[threading.Thread] = []
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        self.calls.append(title)
+        self.threads.append(threading.current_thread())
+        return _MODEL_RESULT
+
+
+@pytest.mark.parametrize(
+    ("title", "body"),
+    [
+        ("App crashes on save", "Traceback (most recent call last): ... error"),
+        ("Typo in README", "The word 'recieve' is misspelled."),
+        ("Add support for YAML configs", "It would be nice to load settings from YAML."),
+    ],
+)
+def test_obvious_issues_are_confident(title: str, body: str) -> None:
+    rules = DummyAdapter()
+    result, confidence = rules.triage_with_confidence(title=title, body=body)
+    assert result == rules.triage(title=title, body=body)
+    assert confidence >= 0.8
+
+
+@pytest.mark.parametrize(
+    ("title", "body"),
+    [
+        # A question and a bug signal: the rules pick one, but should not be trusted.
+        ("How do I stop the crash?", "Is it possible to work around it?"),
+        # Nothing fired: the type came from the default rule.
+        ("Thoughts on the roadmap", "Where is this project heading?"),
+        # The signal is only in the body.
+        ("Saving files", "Sometimes saving fails."),
+    ],
+)
+def test_unclear_issues_have_low_confidence(title: str, body: str) -> None:
+    _, confidence = DummyAdapter().triage_with_confidence(title=title, body=body)
+    assert confidence < 0.8
+
+
+def test_cascade_escalates_only_below_threshold() -> None:
+    model = _Model()
+    cascade = CascadeAdapter(fallback=model, threshold=0.8)
+
+    confident = cascade.triage(title="App crashes on save", body="Traceback ... error")
+    unsure = cascade.triage(title="Thoughts on the roadmap", body="Where is this going?")
+
+    assert confident.type == IssueType.bug
+    assert unsure == _MODEL_RESULT
+    assert model.calls == ["Thoughts on the roadmap"]
+    assert cascade.path_counts == {"rules": 1, "escalated": 1}
+
+
+def test_cascade_threshold_extremes() -> None:
+    model = _Model()
+    never = CascadeAdapter(fallback=model, threshold=0.0)
+    always = CascadeAdapter(fallback=model, threshold=1.01)
+
+    assert never.triage(title="Roadmap", body="?") != _MODEL_RESULT
+    assert always.triage(title="App crashes", body="error") == _MODEL_RESULT
+
+
+def test_async_cascade_uses_sync_fallback() -> None:
+    model = _Model()
+    cascade = CascadeAdapter(fallback=model)
+
+    result = asyncio.run(cascade.atriage(title="Roadmap", body="?"))
+
+    assert result == _MODEL_RESULT
+    assert cascade.path_counts == {"rules": 0, "escalated": 1}
+    # The blocking call ran in a worker thread, not on the event loop.
+    assert model.threads != [threading.main_thread()]
+
+
+def test_threshold_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TRIAGE_CASCADE_THRESHOLD", "0.5")
+    assert CascadeAdapter.from_env(_Model()).threshold == 0.5
+    monkeypatch.setenv("TRIAGE_CASCADE_THRESHOLD", "not-a-number")
+    assert CascadeAdapter.from_env(_Model()).threshold == 0.8
+
+
+def test_eval_reports_the_cascade_split(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    model = _Model()
+    monkeypatch.setattr(cli, "_resolve_adapter", lambda name: model)
+    report = tmp_path / "report.md"
+
+    result = CliRunner().invoke(
+        cli.app,
+        ["eval", "--adapter", "openai", "--cascade", "0.8", "--report", str(report)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "cascade: rules=" in result.stdout
+    rules_line = next(line for line in result.stdout.splitlines() if line.startswith("cascade"))
+    escalated = int(rules_line.split("escalated=")[1].split()[0])
+    assert escalated == len(model.calls) > 0
+    assert "## Cascade" in report.read_text(encoding="utf-8")
+
+
+def test_eval_rejects_packing_with_the_cascade(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cli, "_resolve_adapter", lambda name: _Model())
+    result = CliRunner().invoke(
+        cli.app, ["eval", "--adapter", "openai", "--cascade", "0.8", "--pack-tokens", "4000"]
+    )
+    assert result.exit_code == 2
+    assert "--pack-tokens cannot be combined with --cascade" in result.output
@@ -215,3 +215,58 @@ def test_cli_eval_report_contains_key_headings(tmp_path: Path) -> None:
     assert "## Metrics" in report
     assert "## Top failure patterns" in report
     assert "## Failure examples (first 5)" in report
+
+
+def test_cli_eval_with_workers_matches_serial_report(tmp_path: Path) -> None:
+    dataset = Path(__file__).resolve().parents[1] / "datasets" / "triage_dataset.csv"
+    serial_report = tmp_path / "serial.md"
+    parallel_report = tmp_path / "parallel.md"
+
+    serial = runner.invoke(
+        app,
+        ["eval", "--adapter", "dummy", "--dataset", str(dataset), "--report", str(serial_report)],
+    )
+    parallel = runner.invoke(
+        app,
+        [
+            "eval",
+            "--adapter",
+            "dummy",
+            "--dataset",
+            str(dataset),
+            "--report",
+            str(parallel_report),
+            "--workers",
+            "2",
+        ],
+    )
+    assert serial.exit_code == 0, serial.stdout
+    assert parallel.exit_code == 0, parallel.stdout
+    assert serial.stdout.splitlines()[0] == parallel.stdout.splitlines()[0]
+    assert parallel_report.read_bytes() == serial_report.read_bytes()
+
+
+def test_cli_eval_with_concurrency_matches_serial_summary() -> None:
+    dataset = Path(__file__).resolve().parents[1] / "datasets" / "triage_dataset.csv"
+    args = ["eval", "--adapter", "dummy", "--dataset", str(dataset)]
+
+    serial = runner.invoke(app, args)
+    concurrent = runner.invoke(app, [*args, "--concurrency", "8"])
+    assert serial.exit_code == 0, serial.stdout
+    assert concurrent.exit_code == 0, concurrent.stdout
+    assert concurrent.stdout == serial.stdout
+
+    both = runner.invoke(app, [*args, "--concurrency", "8", "--workers", "2"])
+    assert both.exit_code != 0
+    packed = runner.invoke(app, [*args, "--pack-tokens", "4000", "--workers", "2"])
+    assert packed.exit_code != 0
+
+
+def test_mock_server_command_rejects_bad_faults() -> None:
+    result = runner.invoke(app, ["mock-server", "--latency", "gaussian:1"])
+    assert result.exit_code == 2
+    assert "Latency kind" in result.output
+
+    result = runner.invoke(app, ["mock-server", "--rate-limit", "2"])
+    assert result.exit_code == 2
+    assert "rate_limit" in result.output
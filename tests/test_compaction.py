@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.compaction import compact_body
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.adapters.tokens import estimate_tokens
+
+# Distinct names: lines that differ only in numbers would be collapsed as repeats.
+_NAMES = [a + b for a in "abcdefghij" for b in "klmnopqrst"]
+
+
+def _python_trace(depth: int) -> str:
+    lines = ["Traceback (most recent call last):"]
+    for name in _NAMES[:depth]:
+        lines.append(f'  File "/app/handlers/{name}.py", line 10, in handle_{name}')
+        lines.append(f"    return next_{name}(request)")
+    lines.append("KeyError: 'user_id'")
+    return "\n".join(lines)
+
+
+def test_estimate_tokens_is_about_four_characters_per_token() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_body_within_budget_is_unchanged() -> None:
+    body = "Steps:\n1. open app\n1. open app\n1. open app\n"
+    assert compact_body(body, 100) == body
+
+
+def test_repeated_log_lines_collapse_ignoring_numbers() -> None:
+    lines = ["Starting worker"]
+    lines += [f"2024-05-01T10:00:{n:02d} WARN retrying connection (attempt {n})" for n in range(50)]
+    lines += ["Worker crashed"]
+    body = "\n".join(lines)
+
+    compacted = compact_body(body, 60)
+
+    assert compacted.splitlines() == [
+        "Starting worker",
+        lines[1],
+        "[... previous line repeated 49 more times ...]",
+        "Worker crashed",
+    ]
+
+
+def test_repeated_frame_groups_collapse() -> None:
+    frames = ['  File "app.py", line 3, in recurse', "    return recurse(n - 1)"] * 40
+    body = "\n".join(["Traceback (most recent call last):", *frames, "RecursionError: boom"])
+
+    compacted = compact_body(body, 60)
+
+    assert "[... previous 2 lines repeated 39 more times ...]" in compacted
+    assert compacted.endswith("RecursionError: boom")
+
+
+def test_long_trace_keeps_head_and_tail() -> None:
+    body = "The handler fails on every request:\n\n" + _python_trace(100)
+
+    compacted = compact_body(body, 200)
+
+    assert estimate_tokens(compacted) <= 200
+    assert compacted.startswith("The handler fails on every request:")
+    assert 'File "/app/handlers/ak.py"' in compacted
+    assert 'File "/app/handlers/jt.py"' in compacted
+    assert 'File "/app/handlers/fk.py"' not in compacted
+    assert "stack trace lines omitted ...]" in compacted
+    assert compacted.endswith("KeyError: 'user_id'")
+
+
+def test_long_code_block_past_budget_is_dropped_with_marker() -> None:
+    code = "\n".join(f"    {name} = compute_{name}(request)" for name in _NAMES[:60])
+    body = f"Summary first.\n\n```python\n{code}\n```\n\nExpected: no crash."
+
+    compacted = compact_body(body, 100)
+
+    assert compacted.splitlines() == [
+        "Summary first.",
+        "",
+        "[... code block of 60 lines omitted ...]",
+        "",
+        "Expected: no crash.",
+    ]
+
+
+def test_head_and_tail_fit_the_budget_and_are_idempotent() -> None:
+    body = "\n".join(f"line {n}: " + "x" * (n % 37) for n in range(5000))
+
+    compacted = compact_body(body, 300)
+
+    assert estimate_tokens(compacted) <= 300
+    assert compacted.startswith("line 0: ")
+    assert compacted.endswith(body.splitlines()[-1])
+    assert "lines omitted ...]" in compacted
+    assert compact_body(compacted, 300) == compacted
+
+
+def test_single_huge_line_is_cut_to_budget() -> None:
+    compacted = compact_body("a" * 100_000, 50)
+    assert estimate_tokens(compacted) <= 50
+
+
+def test_budget_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        compact_body("body", 0)
+
+
+def test_hosted_adapter_sends_compacted_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content)["messages"][1]["content"])
+        content = json.dumps({"type": "bug", "priority": "p1", "labels": [], "rationale": "crash"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    real_client = httpx.Client
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, "Client", lambda **kw: real_client(transport=transport, **kw))
+
+    body = "\n".join(["Crash on save"] + ["ERROR disk full"] * 2000)
+    adapter = OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", body_token_budget=100
+    )
+    adapter.triage(title="Save fails", body=body)
+    uncompacted = OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", body_token_budget=None
+    )
+    uncompacted.triage(title="Save fails", body=body)
+
+    assert "[... previous line repeated 1999 more times ...]" in sent[0]
+    assert sent[0].count("ERROR disk full") == 1
+    assert sent[1].count("ERROR disk full") == 2000
+
+
+def test_body_token_budget_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TRIAGE_OPENAI_BASE_URL", "https://example.test")
+    monkeypatch.setenv("TRIAGE_OPENAI_API_KEY", "k")
+    monkeypatch.setenv("TRIAGE_OPENAI_MODEL", "m")
+    monkeypatch.delenv("TRIAGE_BODY_TOKEN_BUDGET", raising=False)
+    assert OpenAICompatibleAdapter.from_env().body_token_budget is None
+    monkeypatch.setenv("TRIAGE_BODY_TOKEN_BUDGET", "0")
+    assert OpenAICompatibleAdapter.from_env().body_token_budget is None
+    monkeypatch.setenv("TRIAGE_BODY_TOKEN_BUDGET", "1500")
+    assert OpenAICompatibleAdapter.from_env().body_token_budget == 1500
+    monkeypatch.setenv("TRIAGE_BODY_TOKEN_BUDGET", "lots")
+    assert OpenAICompatibleAdapter.from_env().body_token_budget is None
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from triage_assistant import client
+from triage_assistant.adapters.chat_completions import ChatCompletionsError
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.cli import app
+from triage_assistant.schema import TriageOutput
+from triage_assistant.server import TriageServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+
+runner = CliRunner()
+
+_TITLE = "App crashes on save"
+_BODY = "Steps to reproduce:\n1. Open\n2. Save\nTraceback: error"
+_RESULT = DummyAdapter().triage(title=_TITLE, body=_BODY)
+
+
+class _Failing:
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        raise ChatCompletionsError("provider is down")
+
+
+@pytest.fixture(autouse=True)
+def _local_adapter(monkeypatch: pytest.MonkeyPatch) -> None:
+    # ``--adapter auto`` is resolved from the caller's environment before forwarding.
+    monkeypatch.delenv("TRIAGE_PROVIDER_CHAIN", raising=False)
+    monkeypatch.setenv("TRIAGE_PROVIDER", "dummy")
+
+
+@pytest.fixture
+def short_dir() -> Iterator[Path]:
+    # Unix socket paths are limited to about 100 bytes, so avoid deep pytest tmp paths.
+    path = Path(tempfile.mkdtemp(prefix="triage-"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _run_daemon(
+    adapter: Any, path: Path, *, adapter_name: str = "dummy", options: str = "none"
+) -> Iterator[Path]:
+    loop = asyncio.new_event_loop()
+    server = TriageServer(adapter, adapter_name=adapter_name, options=options)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start_unix(path), loop).result()
+    try:
+        yield path
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@pytest.fixture
+def daemon(short_dir: Path) -> Iterator[Path]:
+    yield from _run_daemon(DummyAdapter(), short_dir / "d.sock")
+
+
+def test_forwarded_output_matches_in_process(
+    daemon: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    code = client.forward_triage(["--title", _TITLE, f"--body={_BODY}"], daemon)
+    assert code == 0
+    assert capsys.readouterr().out == _RESULT.to_json() + "\n"
+
+    assert client.forward_triage(["--title", _TITLE, "--body", _BODY, "--pretty"], daemon) == 0
+    assert capsys.readouterr().out == _RESULT.to_json(pretty=True) + "\n"
+
+
+def test_body_file_is_read_by_the_client(
+    daemon: Path, short_dir: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    body_file = short_dir / "body.txt"
+    body_file.write_text(_BODY, encoding="utf-8")
+    assert client.forward_triage(["--title", _TITLE, "--body-file", str(body_file)], daemon) == 0
+    assert TriageOutput.model_validate_json(capsys.readouterr().out) == _RESULT
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--title", _TITLE, "--adapter", "github"],  # the daemon runs another adapter
+        ["--title", _TITLE, "--cache", "cache.sqlite"],  # not handled by the fast path
+        ["--body", "no title"],
+        ["--title", _TITLE, "--body-file", "/does/not/exist"],
+        ["--help"],
+    ],
+)
+def test_calls_the_daemon_cannot_serve_fall_back(daemon: Path, args: list[str]) -> None:
+    assert client.forward_triage(args, daemon) is None
+
+
+def test_auto_resolving_to_another_adapter_falls_back(
+    daemon: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("TRIAGE_PROVIDER", "openai")
+    assert client.forward_triage(["--title", _TITLE], daemon) is None
+    monkeypatch.setenv("TRIAGE_PROVIDER_CHAIN", "openai,dummy")
+    assert client.forward_triage(["--title", _TITLE], daemon) is None
+    monkeypatch.setenv("TRIAGE_PROVIDER", "no-such-adapter")
+    monkeypatch.delenv("TRIAGE_PROVIDER_CHAIN")
+    assert client.forward_triage(["--title", _TITLE], daemon) is None
+
+    monkeypatch.setenv("TRIAGE_PROVIDER", "Dummy")
+    assert client.forward_triage(["--title", _TITLE, "--body", _BODY], daemon) == 0
+    assert TriageOutput.model_validate_json(capsys.readouterr().out) == _RESULT
+
+
+def test_calls_with_other_cache_or_cascade_settings_fall_back(
+    short_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cascade = client.wrapper_options(cache=None, refresh_cache=False, cascade=0.8)
+    for path in _run_daemon(DummyAdapter(), short_dir / "c.sock", options=cascade):
+        # The daemon cascades, this call would not.
+        assert client.forward_triage(["--title", _TITLE], path) is None
+        monkeypatch.setenv("TRIAGE_CASCADE_THRESHOLD", "0.8")
+        assert client.forward_triage(["--title", _TITLE], path) == 0
+        assert client.status(path)["options"] == "cascade=0.8"  # type: ignore[index]
+
+    monkeypatch.setenv("TRIAGE_CACHE_PATH", str(short_dir / "cache.sqlite"))
+    for path in _run_daemon(DummyAdapter(), short_dir / "d.sock", options=cascade):
+        assert client.forward_triage(["--title", _TITLE], path) is None
+
+
+def test_missing_or_stale_socket_falls_back(short_dir: Path) -> None:
+    path = short_dir / "stale.sock"
+    assert client.forward_triage(["--title", _TITLE], path) is None
+    path.write_text("")
+    assert client.forward_triage(["--title", _TITLE], path) is None
+    assert client.status(path) is None
+
+
+def test_adapter_errors_keep_the_cli_exit_code(
+    short_dir: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    for path in _run_daemon(_Failing(), short_dir / "f.sock", adapter_name="github"):
+        assert client.forward_triage(["--title", _TITLE, "--adapter", "github"], path) == 2
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Model adapter error: provider is down" in captured.err
+
+
+def test_main_runs_the_cli_without_a_daemon(
+    short_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("TRIAGE_DAEMON_SOCKET", str(short_dir / "none.sock"))
+    monkeypatch.setattr(sys, "argv", ["triage-assistant", "triage", "--title", _TITLE])
+    monkeypatch.setenv("TRIAGE_PROVIDER", "dummy")
+    with pytest.raises(SystemExit) as exit_info:
+        client.main()
+    assert exit_info.value.code in (0, None)
+    assert "type" in json.loads(capsys.readouterr().out)
+
+
+def test_daemon_lifecycle_commands(short_dir: Path) -> None:
+    path = str(short_dir / "cli.sock")
+
+    started = runner.invoke(app, ["daemon", "start", "--socket", path, "--adapter", "dummy"])
+    assert started.exit_code == 0, started.output
+    try:
+        assert (os.stat(path).st_mode & 0o777) == 0o600
+        again = runner.invoke(app, ["daemon", "start", "--socket", path, "--adapter", "dummy"])
+        assert again.exit_code == 1
+
+        assert client.forward_triage(["--title", _TITLE, "--body", _BODY], Path(path)) == 0
+        status = runner.invoke(app, ["daemon", "status", "--socket", path])
+        assert status.exit_code == 0
+        assert json.loads(status.stdout)["requests"] == 1
+    finally:
+        stopped = runner.invoke(app, ["daemon", "stop", "--socket", path])
+    assert stopped.exit_code == 0, stopped.output
+    assert not Path(path).exists()
+    assert runner.invoke(app, ["daemon", "status", "--socket", path]).exit_code == 1
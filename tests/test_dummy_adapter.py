@@ -1,4 +1,7 @@
+import pytest
+
 from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.rules import ScanWindow
 from triage_assistant.schema import IssueType, Priority
 
 
@@ -60,3 +63,53 @@ def test_feature_request_is_feature_p2_and_enhancement() -> None:
     assert out.type == IssueType.feature
     assert out.priority == Priority.p2
     assert "enhancement" in out.labels
+
+
+def test_overlapping_keywords_all_count() -> None:
+    # "crash on startup" (p0) starts with "crash" (bug); both must be detected.
+    adapter = DummyAdapter()
+    out = adapter.triage(title="Crash on startup", body="Version: 2.0.0\n1. Launch")
+    assert out.type == IssueType.bug
+    assert out.priority == Priority.p0
+    assert "needs-repro" not in out.labels
+    assert "needs-env-info" not in out.labels
+
+
+def test_triage_many_matches_triage_row_by_row() -> None:
+    adapter = DummyAdapter()
+    issues = [
+        ("Crash when saving file", "Steps to reproduce:\n1. Open\n2. Save\nVersion: 1.0"),
+        ("App fails with KeyError", "It fails with error: KeyError: 'x'."),
+        ("README typo in installation section", "There is a typo."),
+        ("How do I configure the adapter?", "How do I set the token?"),
+        ("Add export to PDF", "It would be useful to export reports to PDF."),
+        ("Security: token leaked in logs", ""),
+    ]
+    titles = [title for title, _ in issues]
+    bodies = [body for _, body in issues]
+
+    cols = adapter.triage_many(titles, bodies)
+
+    assert len(cols) == len(issues)
+    assert cols.outputs() == [adapter.triage(title=t, body=b) for t, b in issues]
+
+
+def test_triage_many_rejects_mismatched_columns() -> None:
+    with pytest.raises(ValueError):
+        DummyAdapter().triage_many(["a", "b"], ["only one body"])
+
+
+def test_chunked_scan_finds_keywords_across_chunk_boundaries() -> None:
+    body = "x" * 10 + "Steps to reproduce" + "y" * 10 + "\nVersion: 1.0"
+    whole = DummyAdapter().triage(title="Crash when saving", body=body)
+    for chunk_chars in (1, 5, 16):
+        chunked = DummyAdapter(scan_window=ScanWindow(chunk_chars=chunk_chars))
+        assert chunked.triage(title="Crash when saving", body=body) == whole
+    assert "needs-repro" not in whole.labels
+
+
+def test_head_tail_window_skips_the_middle_of_the_body() -> None:
+    body = "Summary line\n" + "noise " * 1000 + "data loss " + "noise " * 1000 + "\nThe end"
+    adapter = DummyAdapter(scan_window=ScanWindow(head_chars=200, tail_chars=200))
+    out = adapter.triage(title="Saving fails", body=body)
+    assert out.priority == Priority.p1  # "data loss" sits outside the scanned window
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from triage_assistant.adapters.chat_completions import ChatCompletionsError
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.failover import CircuitBreaker, FailoverAdapter
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+from triage_assistant.triage import adapter_chain, get_default_adapter
+
+
+class _Provider:
+    def __init__(self, name: str, *, down: bool = False) -> None:
+        self.name = name
+        self.down = down
+        self.calls = 0
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        self.calls += 1
+        if self.down:
+            raise ChatCompletionsError(f"{self.name} timed out")
+        return TriageOutput(type=IssueType.bug, priority=Priority.p1, rationale=self.name)
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        return self.triage(title=title, body=body)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+def test_breaker_opens_probes_and_backs_off(clock: _Clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+
+    clock.now += 10
+    assert not breaker.allow()  # a failed probe doubles the wait
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failover_routes_around_a_dead_provider(clock: _Clock) -> None:
+    primary, secondary = _Provider("primary", down=True), _Provider("secondary")
+    adapter = FailoverAdapter((primary, secondary), failure_threshold=2, reset_timeout_s=30)
+
+    for _ in range(5):
+        assert adapter.triage(title="t", body="b").rationale == "secondary"
+    # Two failures opened the breaker; later calls skipped the primary entirely.
+    assert primary.calls == 2
+    assert adapter.breaker_states == [("_Provider", "open"), ("_Provider", "closed")]
+
+    primary.down = False
+    clock.now += 30
+    assert adapter.triage(title="t", body="b").rationale == "primary"
+    assert adapter.breaker_states[0][1] == "closed"
+
+
+def test_failover_reports_every_provider_when_all_fail(clock: _Clock) -> None:
+    adapter = FailoverAdapter(
+        (_Provider("github", down=True), _Provider("foundry", down=True)), failure_threshold=1
+    )
+    with pytest.raises(ChatCompletionsError, match="github timed out.*foundry timed out"):
+        adapter.triage(title="t", body="b")
+    with pytest.raises(ChatCompletionsError, match="circuit open"):
+        asyncio.run(adapter.atriage(title="t", body="b"))
+
+
+def test_async_failover(clock: _Clock) -> None:
+    adapter = FailoverAdapter((_Provider("primary", down=True), _Provider("secondary")))
+    assert asyncio.run(adapter.atriage(title="t", body="b")).rationale == "secondary"
+
+
+class _SyncProvider:
+    def __init__(self) -> None:
+        self.threads: list[threading.Thread] = []
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        self.threads.append(threading.current_thread())
+        return TriageOutput(type=IssueType.bug, priority=Priority.p1, rationale="sync")
+
+
+def test_async_failover_runs_sync_adapters_in_a_thread(clock: _Clock) -> None:
+    fallback = _SyncProvider()
+    adapter = FailoverAdapter((_Provider("primary", down=True), fallback))
+    assert asyncio.run(adapter.atriage(title="t", body="b")).rationale == "sync"
+    assert fallback.threads != [threading.main_thread()]
+
+
+def test_provider_chain_skips_unconfigured_providers(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("TRIAGE_GITHUB_TOKEN", "GITHUB_TOKEN", "TRIAGE_FOUNDRY_ENDPOINT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TRIAGE_PROVIDER_CHAIN", "github, foundry, dummy")
+
+    adapter = get_default_adapter()
+    assert isinstance(adapter, FailoverAdapter)
+    assert [type(a) for a in adapter.adapters] == [DummyAdapter]
+
+    with pytest.raises(ValueError, match="No provider"):
+        adapter_chain("github,foundry")
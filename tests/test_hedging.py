@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from triage_assistant.adapters.hedging import HedgedAdapter
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+
+
+class _Provider:
+    def __init__(self, name: str, delay_s: float, error: Exception | None = None) -> None:
+        self.name = name
+        self.delay_s = delay_s
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    def _result(self) -> TriageOutput:
+        if self.error is not None:
+            raise self.error
+        return TriageOutput(type=IssueType.bug, priority=Priority.p1, rationale=self.name)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        self.calls += 1
+        time.sleep(self.delay_s)
+        return self._result()
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._result()
+
+
+def test_slow_primary_is_hedged_to_secondary() -> None:
+    primary, secondary = _Provider("primary", 0.5), _Provider("secondary", 0.0)
+    adapter = HedgedAdapter(primary, secondary, initial_delay_s=0.05, max_hedge_rate=1.0)
+
+    started = time.monotonic()
+    assert adapter.triage(title="t", body="b").rationale == "secondary"
+    assert time.monotonic() - started < 0.4
+    assert adapter.hedge_count == 1
+
+
+def test_sync_hedges_do_not_queue_behind_busy_calls() -> None:
+    stuck = threading.Event()
+
+    class _Stuck(_Provider):
+        def triage(self, *, title: str, body: str) -> TriageOutput:
+            stuck.wait()
+            return self._result()
+
+    adapter = HedgedAdapter(
+        _Stuck("primary", 0.0),
+        _Provider("secondary", 0.0),
+        initial_delay_s=0.05,
+        max_hedge_rate=1.0,
+    )
+    busy = [
+        threading.Thread(target=adapter.triage, kwargs={"title": "t", "body": "b"})
+        for _ in range(40)
+    ]
+    for thread in busy:
+        thread.start()
+    unstick = threading.Timer(1.0, stuck.set)  # a queued hedge fails the test, not hangs
+    unstick.start()
+    try:
+        time.sleep(0.1)  # every busy call is stuck on the primary or got its hedge
+        started = time.monotonic()
+        assert adapter.triage(title="t", body="b").rationale == "secondary"
+        assert time.monotonic() - started < 0.4
+    finally:
+        stuck.set()
+        unstick.cancel()
+        for thread in busy:
+            thread.join()
+
+
+def test_fast_primary_is_not_hedged() -> None:
+    primary, secondary = _Provider("primary", 0.0), _Provider("secondary", 0.0)
+    adapter = HedgedAdapter(primary, secondary, initial_delay_s=0.5, max_hedge_rate=1.0)
+
+    assert adapter.triage(title="t", body="b").rationale == "primary"
+    assert secondary.calls == 0
+
+
+def test_hedge_rate_is_capped() -> None:
+    primary = _Provider("primary", 0.03)
+    adapter = HedgedAdapter(primary, initial_delay_s=0.0, max_hedge_rate=0.25)
+
+    for _ in range(8):
+        adapter.triage(title="t", body="b")
+    assert adapter.hedge_count == 2
+
+
+def test_fast_calls_earn_hedge_credits() -> None:
+    primary = _Provider("primary", 0.0)
+    adapter = HedgedAdapter(primary, initial_delay_s=0.02, max_hedge_rate=0.2)
+    for _ in range(15):
+        adapter.triage(title="t", body="b")
+    assert adapter.hedge_count == 0
+
+    # 15 fast calls saved up 3 credits; the next slow calls may spend them.
+    primary.delay_s = 0.05
+    for _ in range(4):
+        adapter.triage(title="t", body="b")
+    assert adapter.hedge_count == 3
+
+
+def test_failed_request_falls_back_to_the_other_one() -> None:
+    primary = _Provider("primary", 0.2, error=RuntimeError("provider down"))
+    adapter = HedgedAdapter(
+        primary, _Provider("secondary", 0.3), initial_delay_s=0.05, max_hedge_rate=1.0
+    )
+    assert adapter.triage(title="t", body="b").rationale == "secondary"
+
+    both_down = HedgedAdapter(
+        primary,
+        _Provider("secondary", 0.0, error=ValueError("also down")),
+        initial_delay_s=0.05,
+        max_hedge_rate=1.0,
+    )
+    with pytest.raises(RuntimeError, match="provider down"):
+        both_down.triage(title="t", body="b")
+
+
+def test_async_hedge_cancels_the_loser() -> None:
+    primary, secondary = _Provider("primary", 5.0), _Provider("secondary", 0.0)
+    adapter = HedgedAdapter(primary, secondary, initial_delay_s=0.05, max_hedge_rate=1.0)
+
+    async def run() -> TriageOutput:
+        result = await adapter.atriage(title="t", body="b")
+        await asyncio.sleep(0)  # let the cancellation reach the primary
+        return result
+
+    assert asyncio.run(run()).rationale == "secondary"
+    assert primary.cancelled == 1
+
+
+def test_deadline_is_learned_from_recent_latencies() -> None:
+    primary = _Provider("primary", 0.0)
+    adapter = HedgedAdapter(primary, initial_delay_s=10.0, max_hedge_rate=1.0)
+    for _ in range(25):
+        adapter.triage(title="t", body="b")
+
+    primary.delay_s = 0.3
+    started = time.monotonic()
+    adapter.triage(title="t", body="b")
+    # The hedge (to the same, now slow, provider) was sent well before 10 s.
+    assert adapter.hedge_count == 1
+    assert time.monotonic() - started < 1.0
@@ -21,7 +21,7 @@ def test_github_models_http_401_error_is_actionable_and_does_not_leak_token(
     response = httpx.Response(401, request=request, json={"error": "unauthorized"})
 
     class FakeClient:
-        def __init__(self, *, timeout: float) -> None:  # noqa: ARG002
+        def __init__(self, *, timeout: float, **kwargs: object) -> None:  # noqa: ARG002
             pass
 
         def __enter__(self) -> FakeClient:
@@ -30,7 +30,7 @@ def test_github_models_http_401_error_is_actionable_and_does_not_leak_token(
         def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
             return None
 
-        def post(self, url: str, *, headers: dict[str, str], json: dict) -> httpx.Response:  # noqa: ANN001
+        def post(self, url: str, *, headers: dict[str, str], content: bytes) -> httpx.Response:
             return response
 
     monkeypatch.setattr("triage_assistant.adapters.github_models.httpx.Client", FakeClient)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pickle
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.github_models import GitHubModelsAdapter
+
+_REPLY = {
+    "choices": [
+        {
+            "message": {
+                "content": '{"type": "bug", "priority": "p1", "labels": ["bug"], '
+                '"rationale": "Crash report."}'
+            }
+        }
+    ]
+}
+
+
+class _CountingClient:
+    created = 0
+    closed = 0
+
+    def __init__(self, **kwargs: object) -> None:
+        type(self).created += 1
+        self.kwargs = kwargs
+
+    def post(self, url: str, **kwargs: object) -> httpx.Response:
+        return httpx.Response(200, request=httpx.Request("POST", url), json=_REPLY)
+
+    def close(self) -> None:
+        type(self).closed += 1
+
+
+@pytest.fixture
+def counting_client(monkeypatch: pytest.MonkeyPatch) -> type[_CountingClient]:
+    _CountingClient.created = 0
+    _CountingClient.closed = 0
+    monkeypatch.setattr(httpx, "Client", _CountingClient)
+    return _CountingClient
+
+
+def test_adapter_reuses_one_client_across_calls(counting_client: type[_CountingClient]) -> None:
+    adapter = GitHubModelsAdapter(token="t", max_connections=4, max_keepalive_connections=2)
+
+    for _ in range(3):
+        assert adapter.triage(title="Crash", body="boom").type.value == "bug"
+
+    assert counting_client.created == 1
+    adapter.close()
+    assert counting_client.closed == 1
+
+
+def test_adapter_context_manager_closes_pool(counting_client: type[_CountingClient]) -> None:
+    with GitHubModelsAdapter(token="t") as adapter:
+        adapter.triage(title="Crash", body="boom")
+    assert counting_client.closed == 1
+
+    # A closed adapter opens a fresh pool on the next call.
+    adapter.triage(title="Crash", body="boom")
+    assert counting_client.created == 2
+
+
+def test_adapter_with_open_pool_can_be_pickled(counting_client: type[_CountingClient]) -> None:
+    adapter = GitHubModelsAdapter(token="t")
+    adapter.triage(title="Crash", body="boom")
+
+    copy = pickle.loads(pickle.dumps(adapter))
+    assert copy == adapter
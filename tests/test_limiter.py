@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import threading
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.limiter import AdaptiveLimiter, parse_duration
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.adapters.tokens import estimate_request_tokens
+from triage_assistant.parallel import atriage_all
+
+_CONTENT = '{"type": "bug", "priority": "p1", "labels": [], "rationale": "x"}'
+
+
+def _round_trip(limiter: AdaptiveLimiter, response: httpx.Response) -> None:
+    started = limiter.acquire()
+    limiter.observe(started, response)
+    limiter.release()
+
+
+def test_window_grows_on_success_and_halves_once_per_burst() -> None:
+    limiter = AdaptiveLimiter(initial_concurrency=4, max_concurrency=8)
+    for _ in range(40):
+        _round_trip(limiter, httpx.Response(200))
+    assert limiter.concurrency == 8
+
+    # Four requests in flight when the provider starts throttling: one halving, not four.
+    starts = [limiter.acquire() for _ in range(4)]
+    for started in starts:
+        limiter.observe(started, httpx.Response(429))
+        limiter.release()
+    assert limiter.concurrency == 4
+
+    _round_trip(limiter, httpx.Response(429))
+    assert limiter.concurrency == 2
+
+
+def test_latency_spike_counts_as_congestion() -> None:
+    limiter = AdaptiveLimiter(initial_concurrency=4, latency_tolerance=2.0)
+    now = time.monotonic()
+    limiter.observe(now - 0.1, httpx.Response(200))
+    window = limiter.concurrency
+    limiter.observe(time.monotonic() - 1.0, httpx.Response(200))
+    assert limiter.concurrency < window
+
+
+def test_remaining_headers_pause_until_reset() -> None:
+    limiter = AdaptiveLimiter()
+    headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "150ms"}
+    _round_trip(limiter, httpx.Response(200, headers=headers))
+
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.release()
+    assert time.monotonic() - started >= 0.1
+
+
+def test_token_bucket_spaces_requests() -> None:
+    limiter = AdaptiveLimiter(requests_per_minute=600)  # refills 10 requests per second
+    for _ in range(600):
+        limiter.acquire()
+        limiter.release()
+
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.release()
+    assert time.monotonic() - started >= 0.05
+
+
+def test_async_waiters_are_woken_by_release_without_polling() -> None:
+    limiter = AdaptiveLimiter(initial_concurrency=1)
+    attempts = 0
+    try_acquire = limiter._try_acquire
+
+    def counting(tokens: int) -> float:
+        nonlocal attempts
+        attempts += 1
+        return try_acquire(tokens)
+
+    limiter._try_acquire = counting  # type: ignore[method-assign]
+
+    async def run() -> float:
+        limiter.acquire()
+        releaser = threading.Timer(0.2, limiter.release)
+        releaser.start()
+        started = time.monotonic()
+        await limiter.aacquire()
+        releaser.join()
+        return time.monotonic() - started
+
+    waited = asyncio.run(run())
+    assert 0.15 < waited < 1.0
+    assert attempts == 3  # the sync acquire, the blocked attempt and the one after release
+
+
+def test_pickled_limiter_keeps_settings_but_not_state() -> None:
+    limiter = AdaptiveLimiter(requests_per_minute=60, initial_concurrency=2, max_concurrency=5)
+    for _ in range(10):
+        _round_trip(limiter, httpx.Response(200))
+
+    copy = pickle.loads(pickle.dumps(limiter))
+    assert copy.concurrency == 2
+    assert copy.meters_tokens is False
+
+
+def test_estimate_tokens_and_duration_parsing() -> None:
+    payload = {"messages": [{"role": "user", "content": "x" * 400}]}
+    assert estimate_request_tokens(payload) == 100 + 256
+    assert estimate_request_tokens(b"x" * 401) == 101 + 256
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration("soon") is None
+
+
+def test_atriage_all_keeps_order_within_the_adaptive_window(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        title = request.read().decode().split("Title: ")[1].split("\\n")[0]
+        content = _CONTENT.replace('"x"', f'"{title}"')
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    real_async_client = httpx.AsyncClient
+
+    def factory(**kwargs: Any) -> httpx.AsyncClient:
+        return real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", factory)
+    adapter = OpenAICompatibleAdapter(
+        base_url="https://example.test",
+        api_key="k",
+        model="m",
+        limiter=AdaptiveLimiter(initial_concurrency=2, max_concurrency=3),
+    )
+    issues = [(f"issue-{i}", "body") for i in range(12)]
+
+    results = asyncio.run(atriage_all(issues, adapter=adapter, concurrency=10))
+
+    assert [r.rationale for r in results] == [title for title, _ in issues]
+    assert 2 <= peak <= 3
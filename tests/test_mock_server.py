@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import ChatCompletionsError, RetryPolicy
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.foundry import FoundryModelInferenceAdapter
+from triage_assistant.adapters.github_models import GitHubModelsAdapter
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.mock_server import Latency, MockBehavior, MockChatServer
+
+_TITLE = "App crashes on save"
+_BODY = "Steps to reproduce:\n1. Open\n2. Save\nTraceback: error"
+_FAST_RETRY = RetryPolicy(max_retries=5, base_delay_s=0.01, max_delay_s=1.0, budget_s=5.0)
+
+
+def _openai(url: str, **kwargs: Any) -> OpenAICompatibleAdapter:
+    return OpenAICompatibleAdapter(base_url=url, api_key="k", model="m", **kwargs)
+
+
+def test_every_adapter_route_returns_the_rule_result() -> None:
+    expected = DummyAdapter().triage(title=_TITLE, body=_BODY)
+    server = MockChatServer()
+    with server.running() as url:
+        adapters = [
+            GitHubModelsAdapter(token="t", base_url=url),
+            GitHubModelsAdapter(token="t", base_url=url, org="acme"),
+            FoundryModelInferenceAdapter(endpoint=f"{url}/models", api_key="k", model="m"),
+            _openai(url),
+        ]
+        for adapter in adapters:
+            with adapter:
+                assert adapter.triage(title=_TITLE, body=_BODY) == expected
+        stats = httpx.get(f"{url}/stats").json()
+    assert stats["requests"] == stats["ok"] == len(adapters)
+
+
+def test_rate_limits_and_error_bursts_are_retried() -> None:
+    behavior = MockBehavior(
+        rate_limit=0.3, retry_after_s=0.01, error_every=4, error_burst=2, seed=7
+    )
+    server = MockChatServer(behavior)
+    with server.running() as url, _openai(url, retry=_FAST_RETRY) as adapter:
+        for _ in range(5):
+            adapter.triage(title=_TITLE, body=_BODY)
+    assert server.stats["ok"] == 5
+    assert server.stats["errors"] >= 2
+    assert server.stats["rate_limited"] >= 1
+
+
+def test_rate_limit_sends_retry_after() -> None:
+    server = MockChatServer(MockBehavior(rate_limit=1.0, retry_after_s=2.5))
+    with server.running() as url:
+        resp = httpx.post(f"{url}/v1/chat/completions", json={"messages": []})
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "3"
+    assert resp.headers["retry-after-ms"] == "2500"
+
+
+def test_malformed_json_fails_the_call() -> None:
+    server = MockChatServer(MockBehavior(malformed=1.0))
+    no_retry = RetryPolicy(max_retries=0)
+    with server.running() as url, _openai(url, retry=no_retry) as adapter:
+        with pytest.raises(ChatCompletionsError):
+            adapter.triage(title=_TITLE, body=_BODY)
+
+
+def test_fenced_dripped_and_streamed_replies_still_parse() -> None:
+    behavior = MockBehavior(fenced=1.0, slow_drip=1.0, drip_chunk_bytes=64, drip_interval_s=0)
+    server = MockChatServer(behavior)
+    expected = DummyAdapter().triage(title=_TITLE, body=_BODY)
+    with server.running() as url:
+        with _openai(url) as adapter:
+            assert adapter.triage(title=_TITLE, body=_BODY) == expected
+        with _openai(url, stream=True) as adapter:
+            assert adapter.triage(title=_TITLE, body=_BODY) == expected
+    assert server.stats["streamed"] == 1
+    assert server.stats["fenced"] == server.stats["dripped"] == 2
+
+
+def test_packed_prompts_get_one_result_per_issue() -> None:
+    issues = [(_TITLE, _BODY), ("Typo in README", "recieve"), ("How do I configure it?", "")]
+    server = MockChatServer()
+    with server.running() as url, _openai(url) as adapter:
+        results = adapter.triage_batch(issues)
+    assert results == [DummyAdapter().triage(title=t, body=b) for t, b in issues]
+    assert server.stats["requests"] == 1
+
+
+def test_async_adapter_against_running_loop() -> None:
+    async def main() -> None:
+        server = MockChatServer(MockBehavior(latency=Latency("fixed", 0.01)))
+        await server.start()
+        try:
+            adapter = _openai(server.url)
+            await asyncio.gather(*(adapter.atriage(title=_TITLE, body=_BODY) for _ in range(8)))
+            await adapter.aclose()
+        finally:
+            await server.close()
+        assert server.stats["ok"] == 8
+
+    asyncio.run(main())
+
+
+def test_latency_specs() -> None:
+    rng = random.Random(0)
+    assert Latency.parse("fixed:0.25").sample(rng) == 0.25
+    assert 0.1 <= Latency.parse("uniform:0.1,0.2").sample(rng) <= 0.2
+    assert Latency.parse("lognormal:0.3,0.5").sample(rng) > 0
+    with pytest.raises(ValueError):
+        Latency.parse("gamma:1")
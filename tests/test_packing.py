@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.cache import CachedAdapter, ResponseCache
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.adapters.packing import PACK_SYSTEM_PROMPT, parse_pack, plan_packs
+from triage_assistant.schema import TriageOutput
+
+
+def _result(rationale: str, **extra: Any) -> dict[str, Any]:
+    return {"type": "bug", "priority": "p1", "labels": [], "rationale": rationale, **extra}
+
+
+def _reply(content: Any) -> httpx.Response:
+    text = content if isinstance(content, str) else json.dumps(content)
+    return httpx.Response(200, json={"choices": [{"message": {"content": text}}]})
+
+
+class _Provider:
+    """Answers packed requests for every id but "2"; single requests echo the title."""
+
+    def __init__(self) -> None:
+        self.packs: list[list[str]] = []
+        self.singles: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        system, user = (m["content"] for m in json.loads(request.content)["messages"])
+        titles = [
+            line[len("Title: ") :] for line in user.splitlines() if line.startswith("Title: ")
+        ]
+        if system == PACK_SYSTEM_PROMPT:
+            self.packs.append(titles)
+            results = [_result(title, id=str(n)) for n, title in enumerate(titles, 1) if n != 2]
+            return _reply({"results": results})
+        self.singles.extend(titles)
+        return _reply(_result(titles[0]))
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch) -> _Provider:
+    handler = _Provider()
+    real_client = httpx.Client
+    real_async_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, "Client", lambda **kw: real_client(transport=transport, **kw))
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_async_client(transport=transport, **kw)
+    )
+    return handler
+
+
+def _adapter() -> OpenAICompatibleAdapter:
+    return OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+
+
+def test_plan_packs_respects_budget_and_size() -> None:
+    small = ("t", "b" * 40)
+    huge = ("t", "b" * 40_000)
+
+    assert plan_packs([small] * 5, token_budget=8000, max_pack_size=2) == [[0, 1], [2, 3], [4]]
+    assert plan_packs([small, huge, small], token_budget=2000) == [[0], [1], [2]]
+    assert plan_packs([small] * 3, token_budget=2000) == [[0, 1, 2]]
+
+
+def test_parse_pack_accepts_common_shapes_and_drops_invalid_elements() -> None:
+    wrapped = {"results": [_result("a", id="1"), {"id": "2", "type": "nonsense"}]}
+    assert list(parse_pack(json.dumps(wrapped))) == ["1"]
+    assert list(parse_pack("```json\n" + json.dumps([_result("a", id=1)]) + "\n```")) == ["1"]
+    assert list(parse_pack(json.dumps({"7": _result("a")}))) == ["7"]
+    assert parse_pack("Sorry, I cannot help with that.") == {}
+
+
+def test_triage_batch_packs_issues_and_retries_missing_ones(provider: _Provider) -> None:
+    issues = [(f"issue-{i}", "short body") for i in range(5)]
+
+    results = _adapter().triage_batch(issues, max_pack_size=3)
+
+    assert [r.rationale for r in results] == [title for title, _ in issues]
+    assert provider.packs == [["issue-0", "issue-1", "issue-2"], ["issue-3", "issue-4"]]
+    # The second element of each pack was missing from the reply.
+    assert provider.singles == ["issue-1", "issue-4"]
+
+
+def test_atriage_batch_matches_sync_results(provider: _Provider) -> None:
+    issues = [(f"issue-{i}", "short body") for i in range(5)]
+
+    results = asyncio.run(_adapter().atriage_batch(issues, max_pack_size=3))
+
+    assert [r.rationale for r in results] == [title for title, _ in issues]
+    assert len(provider.packs) == 2
+    assert sorted(provider.singles) == ["issue-1", "issue-4"]
+
+
+def test_atriage_batch_caps_requests_in_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        # Pack replies are unusable, so every issue is also retried on its own.
+        system = json.loads(request.content)["messages"][0]["content"]
+        return _reply({"results": []} if system == PACK_SYSTEM_PROMPT else _result("single"))
+
+    real_async_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_async_client(transport=transport, **kw)
+    )
+    issues = [(f"issue-{i}", "short body") for i in range(12)]
+
+    asyncio.run(_adapter().atriage_batch(issues, max_pack_size=2, concurrency=3))
+
+    assert peak == 3
+
+
+def test_failed_pack_retries_only_its_own_issues(monkeypatch: pytest.MonkeyPatch) -> None:
+    singles: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        system, user = (m["content"] for m in json.loads(request.content)["messages"])
+        titles = [line[7:] for line in user.splitlines() if line.startswith("Title: ")]
+        if system == PACK_SYSTEM_PROMPT:
+            if "issue-0" in titles:
+                return httpx.Response(400, json={"error": "bad request"})
+            return _reply({"results": [_result(t, id=str(n)) for n, t in enumerate(titles, 1)]})
+        singles.extend(titles)
+        if titles == ["issue-1"]:
+            return httpx.Response(400, json={"error": "still bad"})
+        return _reply(_result(titles[0]))
+
+    real_async_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_async_client(transport=transport, **kw)
+    )
+    issues = [(f"issue-{i}", "short body") for i in range(4)]
+
+    outcomes = asyncio.run(_adapter().atriage_batch_outcomes(issues, max_pack_size=2))
+
+    # Only the failed pack's issues were sent again, and only issue-1 failed for good.
+    assert sorted(singles) == ["issue-0", "issue-1"]
+    assert isinstance(outcomes[1], Exception)
+    assert [o.rationale for o in outcomes if isinstance(o, TriageOutput)] == [
+        "issue-0",
+        "issue-2",
+        "issue-3",
+    ]
+    with pytest.raises(Exception, match="400"):
+        asyncio.run(_adapter().atriage_batch(issues, max_pack_size=2))
+
+
+def test_cached_adapter_packs_only_cache_misses(tmp_path: Path, provider: _Provider) -> None:
+    adapter = CachedAdapter(inner=_adapter(), cache=ResponseCache(tmp_path / "c.sqlite3"))
+    adapter.triage(title="issue-0", body="short body")
+
+    issues = [(f"issue-{i}", "short body") for i in range(3)]
+    results = adapter.triage_batch(issues)
+
+    assert [r.rationale for r in results] == ["issue-0", "issue-1", "issue-2"]
+    assert provider.packs == [["issue-1", "issue-2"]]
+    assert adapter.triage_batch(issues) == results
+    assert len(provider.packs) == 1
+
+    more = [*issues, ("issue-3", "short body"), ("issue-4", "short body")]
+    assert [r.rationale for r in asyncio.run(adapter.atriage_batch(more))] == [t for t, _ in more]
+    assert provider.packs[1] == ["issue-3", "issue-4"]
+    asyncio.run(adapter.atriage_batch(more))
+    assert len(provider.packs) == 2
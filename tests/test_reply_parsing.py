@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import (
+    ChatCompletionsError,
+    RetryPolicy,
+    extract_json_object,
+    json_object_spans,
+)
+from triage_assistant.adapters.openai_compatible import (
+    OpenAICompatibleAdapter,
+    OpenAICompatibleError,
+)
+
+_VALID = '{"type": "bug", "priority": "p0", "labels": ["crash"], "rationale": "says \\"}\\" {"}'
+
+
+def _objects(text: str) -> list[str]:
+    return [text[start:end] for start, end in json_object_spans(text)]
+
+
+def test_spans_ignore_braces_inside_strings_and_escapes() -> None:
+    text = "Sure! ```json\n" + _VALID + '\n``` and {"a": "\\\\"} then {"open": '
+    assert _objects(text) == [_VALID, '{"a": "\\\\"}']
+
+
+def test_spans_handle_nested_objects() -> None:
+    text = 'Result: {"outer": {"inner": [1, {"x": "}"}]}} done'
+    assert _objects(text) == ['{"outer": {"inner": [1, {"x": "}"}]}}']
+
+
+def test_spans_on_bytes_match_spans_on_str() -> None:
+    text = 'résumé {"k": "履歴書 \\" }"} tail {"b": 1}'
+    encoded = text.encode("utf-8")
+    as_bytes = [encoded[start:end].decode("utf-8") for start, end in json_object_spans(encoded)]
+    assert as_bytes == _objects(text)
+
+
+def test_extract_json_object_returns_first_balanced_object() -> None:
+    assert extract_json_object('```json\n{"a": 1}\n```\nAlso {"b": 2}') == '{"a": 1}'
+    with pytest.raises(ChatCompletionsError):
+        extract_json_object('{"unterminated": ')
+
+
+def _adapter(monkeypatch: pytest.MonkeyPatch, reply: Any) -> OpenAICompatibleAdapter:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if isinstance(reply, bytes):
+            return httpx.Response(200, content=reply)
+        return httpx.Response(200, json=reply)
+
+    real_client = httpx.Client
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, "Client", lambda **kw: real_client(transport=transport, **kw))
+    return OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", retry=RetryPolicy(max_retries=0)
+    )
+
+
+def _completion(content: Any) -> dict[str, Any]:
+    return {"id": "x", "usage": {"total_tokens": 5}, "choices": [{"message": {"content": content}}]}
+
+
+def test_first_schema_valid_object_wins(monkeypatch: pytest.MonkeyPatch) -> None:
+    content = 'For example {"type": "unknown"}. My answer:\n' + _VALID
+    adapter = _adapter(monkeypatch, _completion(content))
+    result = adapter.triage(title="t", body="b")
+    assert result.priority == "p0"
+    assert result.rationale == 'says "}" {'
+
+
+def test_invalid_object_reports_schema_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = _adapter(monkeypatch, _completion('{"type": "unknown"}'))
+    with pytest.raises(OpenAICompatibleError, match="failed schema validation"):
+        adapter.triage(title="t", body="b")
+
+
+def test_content_parts_are_flattened(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Parts are joined with newlines, so split between two JSON tokens.
+    cut = _VALID.index(", ") + 1
+    parts = [{"type": "text", "text": _VALID[:cut]}, {"type": "text", "text": _VALID[cut:]}]
+    adapter = _adapter(monkeypatch, _completion(parts))
+    assert adapter.triage(title="t", body="b").labels == ["crash"]
+
+
+def test_non_json_response_uses_provider_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = _adapter(monkeypatch, b"<html>Bad gateway</html>")
+    with pytest.raises(OpenAICompatibleError, match="non-JSON response"):
+        adapter.triage(title="t", body="b")
+
+
+def test_unexpected_structure_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = _adapter(monkeypatch, {"choices": []})
+    with pytest.raises(ChatCompletionsError, match="Unexpected response structure"):
+        adapter.triage(title="t", body="b")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import (
+    SYSTEM_PROMPT,
+    PooledClientMixin,
+    RequestTemplate,
+    triage_messages,
+)
+from triage_assistant.adapters.foundry import FoundryModelInferenceAdapter
+from triage_assistant.adapters.github_models import GitHubModelsAdapter
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+
+_ADAPTERS = [
+    GitHubModelsAdapter(token="t", org="acme", seed=7),
+    FoundryModelInferenceAdapter(endpoint="https://x.test/models", api_key="k", model="m"),
+    OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m"),
+]
+
+_TITLE = 'Crash in "résumé" upload'
+_BODY = "Steps:\n\t1. upload 履歴書.pdf\n\t2. see \\u0000 and {braces} in the log"
+
+
+@pytest.mark.parametrize("adapter", _ADAPTERS, ids=lambda a: type(a).__name__)
+def test_rendered_request_matches_httpx_json_encoding(adapter: PooledClientMixin) -> None:
+    expected = adapter._build_request(triage_messages(title=_TITLE, body=_BODY))
+
+    rendered = adapter._triage_request(title=_TITLE, body=_BODY)
+
+    assert rendered["url"] == expected["url"]
+    assert rendered.get("params") == expected.get("params")
+    reference = httpx.Request("POST", expected["url"], json=expected["json"])
+    assert rendered["content"] == reference.content
+    assert rendered["headers"]["Content-Type"] == "application/json"
+
+
+def test_stream_template_adds_the_stream_flag() -> None:
+    adapter = _ADAPTERS[2]
+    payload = json.loads(adapter._triage_request(title="t", body="b", stream=True)["content"])
+    assert payload["stream"] is True
+    assert "stream" not in json.loads(adapter._triage_request(title="t", body="b")["content"])
+
+
+def test_template_is_built_once_per_adapter_and_prompt() -> None:
+    adapter = OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+
+    first = adapter._template(SYSTEM_PROMPT)
+    adapter._triage_request(title="a", body="b")
+    adapter._triage_request(title="c", body="d")
+
+    assert adapter._template(SYSTEM_PROMPT) is first
+    assert len(adapter._templates) == 1
+
+
+def test_template_rejects_requests_that_rewrite_messages() -> None:
+    request = {"url": "https://x.test", "headers": {}, "json": {"messages": []}}
+    with pytest.raises(ValueError):
+        RequestTemplate.from_request(request, SYSTEM_PROMPT)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import ChatCompletionsError, RetryPolicy
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+from triage_assistant.schema import IssueType
+
+_OK = {
+    "choices": [
+        {
+            "message": {
+                "content": '{"type": "bug", "priority": "p1", "labels": [], "rationale": "x"}'
+            }
+        }
+    ]
+}
+
+
+def _adapter(
+    monkeypatch: pytest.MonkeyPatch, handler: Any, **kwargs: Any
+) -> OpenAICompatibleAdapter:
+    real_client = httpx.Client
+    real_async_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, "Client", lambda **kw: real_client(transport=transport, **kw))
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_async_client(transport=transport, **kw)
+    )
+    return OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", **kwargs
+    )
+
+
+def _record_sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    sleeps: list[float] = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_retries_rate_limited_request_with_identical_payload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        if len(bodies) < 3:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        return httpx.Response(200, json=_OK)
+
+    sleeps = _record_sleeps(monkeypatch)
+    out = _adapter(monkeypatch, handler).triage(title="Crash", body="boom")
+
+    assert out.type == IssueType.bug
+    assert sleeps == [2.0, 2.0]
+    assert len(bodies) == 3 and len(set(bodies)) == 1
+
+
+def test_gives_up_after_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    sleeps = _record_sleeps(monkeypatch)
+    adapter = _adapter(
+        monkeypatch, handler, retry=RetryPolicy(max_retries=2, base_delay_s=0.1, max_delay_s=1)
+    )
+    with pytest.raises(ChatCompletionsError, match="HTTP 503"):
+        adapter.triage(title="Crash", body="boom")
+
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.1 and 0 <= sleeps[1] <= 0.2
+
+
+def test_does_not_retry_client_errors_or_overlong_waits(monkeypatch: pytest.MonkeyPatch) -> None:
+    statuses = iter([401, 429])
+    headers = {"Retry-After": "3600"}
+    sleeps = _record_sleeps(monkeypatch)
+    adapter = _adapter(monkeypatch, lambda request: httpx.Response(next(statuses), headers=headers))
+
+    with pytest.raises(ChatCompletionsError, match="HTTP 401"):
+        adapter.triage(title="Crash", body="boom")
+    with pytest.raises(ChatCompletionsError, match="HTTP 429"):
+        adapter.triage(title="Crash", body="boom")
+    assert sleeps == []
+
+
+def test_retry_budget_caps_total_wait() -> None:
+    policy = RetryPolicy(max_retries=10, max_delay_s=30, budget_s=5)
+    response = httpx.Response(429, headers={"Retry-After": "2"})
+
+    assert policy.next_delay(0, 0.0, response) == 2.0
+    assert policy.next_delay(1, 4.0, response) is None
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"retry-after-ms": "250"}, 0.25),
+        ({"x-ratelimit-reset-requests": "1m30s", "x-ratelimit-reset-tokens": "250ms"}, 90.0),
+        ({"x-ratelimit-reset": "7"}, 7.0),
+    ],
+)
+def test_honors_provider_wait_headers(headers: dict[str, str], expected: float) -> None:
+    policy = RetryPolicy(max_delay_s=120, budget_s=120)
+    assert policy.next_delay(0, 0.0, httpx.Response(429, headers=headers)) == expected
+
+
+def test_honors_absolute_reset_times() -> None:
+    policy = RetryPolicy()
+    soon = datetime.now(UTC) + timedelta(seconds=10)
+    for headers in (
+        {"Retry-After": format_datetime(soon, usegmt=True)},
+        {"x-ratelimit-reset": str(int(soon.timestamp()))},
+    ):
+        delay = policy.next_delay(0, 0.0, httpx.Response(429, headers=headers))
+        assert delay is not None and 8 <= delay <= 10
+
+
+def test_async_retries_network_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json=_OK)
+
+    adapter = _adapter(monkeypatch, handler, retry=RetryPolicy(base_delay_s=0))
+    out = asyncio.run(adapter.atriage(title="Crash", body="boom"))
+
+    assert out.type == IssueType.bug
+    assert attempts == 2
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.rules import RulesError, RulesFile, load_rules
+from triage_assistant.schema import IssueType, Priority
+
+_RULES = """
+[categories.bug]
+keywords = ["{bug_keyword}"]
+
+[categories.urgent]
+keywords = ["asap"]
+
+[[type]]
+value = "bug"
+has = ["bug"]
+
+[[type]]
+value = "feature"
+
+[[priority]]
+value = "p0"
+has = ["urgent"]
+
+[[priority]]
+value = "p2"
+
+[[labels]]
+label = "triaged-offline"
+
+[rationale]
+type = "Rules say '{{type}}'."
+
+[rationale.labels]
+triaged-offline = "Offline rules were used."
+"""
+
+
+def _write_rules(path: Path, *, bug_keyword: str = "broken") -> None:
+    path.write_text(_RULES.format(bug_keyword=bug_keyword), encoding="utf-8")
+
+
+def test_custom_rules_file_drives_dummy_adapter(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    _write_rules(rules_path)
+
+    adapter = DummyAdapter(rules=load_rules(rules_path))
+    out = adapter.triage(title="Export is BROKEN", body="Please fix asap")
+
+    assert out.type == IssueType.bug
+    assert out.priority == Priority.p0
+    assert out.labels == ["bug", "p0", "triaged-offline"]
+    assert out.rationale == "Rules say 'bug'. Offline rules were used."
+
+
+def test_rules_file_hot_reloads_on_change(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    _write_rules(rules_path, bug_keyword="broken")
+    rules = RulesFile(rules_path, check_interval_s=0.0)
+    adapter = DummyAdapter(rules=rules)
+
+    assert adapter.triage(title="It explodes", body="").type == IssueType.feature
+
+    _write_rules(rules_path, bug_keyword="explodes")
+    stat = rules_path.stat()
+    os.utime(rules_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert adapter.triage(title="It explodes", body="").type == IssueType.bug
+
+
+def test_invalid_reload_keeps_previous_rules(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    _write_rules(rules_path)
+    rules = RulesFile(rules_path, check_interval_s=0.0)
+    before = rules.current()
+
+    rules_path.write_text("[categories.bug]\nkeywords = 42\n", encoding="utf-8")
+
+    assert rules.current() is before
+    assert isinstance(rules.last_error, RulesError)
+
+
+def test_rules_without_default_rule_are_rejected(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    rules_path.write_text(
+        '[categories.bug]\nkeywords = ["bug"]\n'
+        '[[type]]\nvalue = "bug"\nhas = ["bug"]\n'
+        '[[priority]]\nvalue = "p2"\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(RulesError, match="default"):
+        load_rules(rules_path)
+
+
+def test_too_many_labels_are_rejected(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    label_rules = "".join(f'[[labels]]\nlabel = "l{i}"\nhas = ["bug"]\n' for i in range(58))
+    rules_path.write_text(
+        '[categories.bug]\nkeywords = ["bug"]\n'
+        '[[type]]\nvalue = "bug"\n'
+        '[[priority]]\nvalue = "p2"\n' + label_rules,
+        encoding="utf-8",
+    )
+    with pytest.raises(RulesError, match="too many distinct labels"):
+        load_rules(rules_path)
+
+    rules_path.write_text(rules_path.read_text(encoding="utf-8").rsplit("[[labels]]", 1)[0])
+    adapter = DummyAdapter(rules=load_rules(rules_path))
+    columns = adapter.triage_many(["bug"], [""])
+    assert columns.labels[0] >> 63 & 1
+    assert columns.output(0).labels[-1] == "l56"
+
+
+def test_compiled_rules_are_cached_on_disk(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.toml"
+    cache_dir = tmp_path / "cache"
+    _write_rules(rules_path)
+
+    first = load_rules(rules_path, cache_dir=cache_dir)
+    cached = list(cache_dir.glob("rules-*.json"))
+    assert len(cached) == 1
+
+    second = load_rules(rules_path, cache_dir=cache_dir)
+    title, body = "Export is broken", "asap"
+    assert first.classify(title=title, body=body) == second.classify(title=title, body=body)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.cache import CachedAdapter, ResponseCache
+from triage_assistant.adapters.cascade import CascadeAdapter
+from triage_assistant.adapters.chat_completions import ChatCompletionsError
+from triage_assistant.adapters.dummy import DummyAdapter
+from triage_assistant.adapters.failover import FailoverAdapter
+from triage_assistant.schema import TriageOutput
+from triage_assistant.server import MicroBatcher, TriageServer
+
+_TITLE = "App crashes on save"
+_BODY = "Steps to reproduce:\n1. Open\n2. Save\nTraceback: error"
+_RESULT = DummyAdapter().triage(title=_TITLE, body=_BODY)
+
+
+class _Packing:
+    """A packing adapter that records how issues reached it."""
+
+    def __init__(self, *, fail_batches: bool = False) -> None:
+        self.batches: list[int] = []
+        self.singles = 0
+        self.fail_batches = fail_batches
+        self.closed = False
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        self.singles += 1
+        if title == "boom":
+            raise ChatCompletionsError("upstream failed")
+        return DummyAdapter().triage(title=title, body=body)
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:  # pragma: no cover
+        raise AssertionError("the async path should be used")
+
+    async def atriage_batch(self, issues: list[tuple[str, str]]) -> list[TriageOutput]:
+        self.batches.append(len(issues))
+        if self.fail_batches:
+            raise ChatCompletionsError("packed reply was invalid")
+        return [DummyAdapter().triage(title=t, body=b) for t, b in issues]
+
+    def triage_batch(self, issues: list[tuple[str, str]]) -> list[TriageOutput]:  # pragma: no cover
+        raise AssertionError("the async path should be used")
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+async def _with_server(
+    adapter: Any, check: Callable[[httpx.AsyncClient], Awaitable[None]], **options: Any
+) -> TriageServer:
+    server = TriageServer(adapter, **options)
+    await server.start(port=0)
+    try:
+        async with httpx.AsyncClient(base_url=server.address) as client:
+            await check(client)
+    finally:
+        await server.close()
+    return server
+
+
+def test_triage_endpoint_returns_the_adapter_result() -> None:
+    async def check(client: httpx.AsyncClient) -> None:
+        resp = await client.post("/triage", json={"title": _TITLE, "body": _BODY})
+        assert resp.status_code == 200
+        assert TriageOutput.model_validate(resp.json()) == _RESULT
+        health = (await client.get("/healthz")).json()
+        assert health["status"] == "ok"
+        assert health["requests"] == 1
+
+    asyncio.run(_with_server(DummyAdapter(), check))
+
+
+def test_batch_endpoint_keeps_order_and_reports_bad_items() -> None:
+    async def check(client: httpx.AsyncClient) -> None:
+        issues = [
+            {"id": "a", "title": _TITLE, "body": _BODY},
+            {"id": "b", "body": "no title"},
+            {"title": "Typo in README"},
+            {"id": "c", "title": "boom"},
+        ]
+        resp = await client.post("/triage/batch", json={"issues": issues})
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [r["id"] for r in results] == ["a", "b", 2, "c"]
+        assert TriageOutput.model_validate(results[0]["result"]) == _RESULT
+        assert results[1]["error"]["type"] == "invalid_input"
+        assert results[2]["result"]["type"] == "docs"
+        assert results[3]["error"] == {
+            "type": "ChatCompletionsError",
+            "message": "upstream failed",
+        }
+
+    asyncio.run(_with_server(_Packing(fail_batches=True), check))
+
+
+def test_concurrent_requests_are_coalesced_into_one_packed_call() -> None:
+    adapter = _Packing()
+
+    async def check(client: httpx.AsyncClient) -> None:
+        replies = await asyncio.gather(
+            *(client.post("/triage", json={"title": _TITLE, "body": _BODY}) for _ in range(6))
+        )
+        assert all(TriageOutput.model_validate(r.json()) == _RESULT for r in replies)
+
+    server = asyncio.run(_with_server(adapter, check, batch_window_s=0.2, max_batch=6))
+    assert adapter.batches == [6]
+    assert adapter.singles == 0
+    assert server.batcher.batches == 1
+    assert adapter.closed
+
+
+def test_close_reaches_adapters_inside_wrappers(tmp_path: Path) -> None:
+    class _Hosted(_Packing):
+        sync_closed = False
+
+        def cache_key(self, *, title: str, body: str) -> str:
+            return title
+
+        def close(self) -> None:
+            self.sync_closed = True
+
+    first, second = _Hosted(), _Hosted()
+    adapter = CascadeAdapter(
+        CachedAdapter(FailoverAdapter((first, second)), ResponseCache(tmp_path / "c.sqlite3"))
+    )
+
+    async def check(client: httpx.AsyncClient) -> None:
+        assert (await client.get("/healthz")).status_code == 200
+
+    asyncio.run(_with_server(adapter, check))
+    assert first.closed and second.closed
+    assert first.sync_closed and second.sync_closed
+
+
+def test_batches_are_capped_at_max_batch() -> None:
+    adapter = _Packing()
+
+    async def run() -> None:
+        batcher = MicroBatcher(adapter, window_s=0.05, max_batch=4)
+        await asyncio.gather(*(batcher.triage(title=_TITLE, body=_BODY) for _ in range(10)))
+
+    asyncio.run(run())
+    assert adapter.batches == [4, 4, 2]
+
+
+def test_failed_packed_call_falls_back_to_single_issues() -> None:
+    adapter = _Packing(fail_batches=True)
+
+    async def run() -> list[TriageOutput | BaseException]:
+        batcher = MicroBatcher(adapter, window_s=0.05)
+        calls = [batcher.triage(title=t, body="") for t in ("Crash", "boom", "Typo")]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert isinstance(outcomes[1], ChatCompletionsError)
+    assert isinstance(outcomes[0], TriageOutput) and isinstance(outcomes[2], TriageOutput)
+    assert adapter.singles == 3
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "payload", "status"),
+    [
+        ("POST", "/triage", {"body": "missing title"}, 400),
+        ("POST", "/triage/batch", {"issues": "nope"}, 400),
+        ("GET", "/triage", None, 405),
+        ("GET", "/nowhere", None, 404),
+    ],
+)
+def test_error_responses(method: str, path: str, payload: Any, status: int) -> None:
+    async def check(client: httpx.AsyncClient) -> None:
+        resp = await client.request(method, path, json=payload)
+        assert resp.status_code == status
+        assert "message" in resp.json()["error"]
+
+    asyncio.run(_with_server(DummyAdapter(), check))
+
+
+def test_adapter_errors_map_to_bad_gateway() -> None:
+    async def check(client: httpx.AsyncClient) -> None:
+        resp = await client.post("/triage", json={"title": "boom"})
+        assert resp.status_code == 502
+        assert resp.json()["error"]["type"] == "ChatCompletionsError"
+
+    asyncio.run(_with_server(_Packing(), check))
+
+
+def test_oversized_bodies_are_rejected() -> None:
+    async def check(client: httpx.AsyncClient) -> None:
+        resp = await client.post("/triage", json={"title": "x" * 2000})
+        assert resp.status_code == 413
+
+    asyncio.run(_with_server(DummyAdapter(), check, max_body_bytes=1024))
+
+
+def test_unix_socket_transport(tmp_path: Path) -> None:
+    async def run() -> None:
+        server = TriageServer(DummyAdapter())
+        path = tmp_path / "triage.sock"
+        await server.start_unix(path)
+        try:
+            transport = httpx.AsyncHTTPTransport(uds=str(path))
+            async with httpx.AsyncClient(transport=transport, base_url="http://triage") as client:
+                resp = await client.post("/triage", json={"title": _TITLE, "body": _BODY})
+        finally:
+            await server.close()
+        assert TriageOutput.model_validate(resp.json()) == _RESULT
+        assert not path.exists()
+
+    asyncio.run(run())
+
+
+class _ReportingPacking(_Packing):
+    """A packing adapter that reports each issue's outcome itself."""
+
+    async def atriage_batch_outcomes(
+        self, issues: list[tuple[str, str]]
+    ) -> list[TriageOutput | Exception]:
+        self.batches.append(len(issues))
+        return [
+            ChatCompletionsError("upstream failed")
+            if t == "boom"
+            else DummyAdapter().triage(title=t, body=b)
+            for t, b in issues
+        ]
+
+
+def test_per_issue_outcomes_are_not_retried() -> None:
+    adapter = _ReportingPacking()
+
+    async def run() -> list[TriageOutput | BaseException]:
+        batcher = MicroBatcher(adapter, window_s=0.05)
+        calls = [batcher.triage(title=t, body="") for t in ("Crash", "boom", "Typo")]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert isinstance(outcomes[1], ChatCompletionsError)
+    assert isinstance(outcomes[0], TriageOutput) and isinstance(outcomes[2], TriageOutput)
+    assert adapter.batches == [3]
+    assert adapter.singles == 0
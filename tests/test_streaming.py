@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import httpx
+import pytest
+
+from triage_assistant.adapters.chat_completions import (
+    ChatCompletionsError,
+    RetryPolicy,
+    get_streamed_chat_completion_content,
+)
+from triage_assistant.adapters.openai_compatible import OpenAICompatibleAdapter
+
+_RESULT = '{"type": "bug", "priority": "p1", "labels": ["crash"], "rationale": "a {brace} \\""}'
+
+
+def _event(content: str | None = None, **extra: Any) -> str:
+    delta = {} if content is None else {"content": content}
+    return "data: " + json.dumps({"choices": [{"delta": delta}], **extra}) + "\n\n"
+
+
+def _events(text: str, *, size: int = 7, trailing: int = 5) -> list[str]:
+    chunks = [text[i : i + size] for i in range(0, len(text), size)]
+    return [
+        # Azure opens with an event carrying content-filter results and no choices.
+        "data: " + json.dumps({"choices": [], "prompt_filter_results": []}) + "\n\n",
+        *(_event(chunk) for chunk in chunks),
+        *(_event("\n") for _ in range(trailing)),
+        _event(None),
+        "data: [DONE]\n\n",
+    ]
+
+
+def _lines(events: list[str]) -> Iterator[str]:
+    for event in events:
+        yield from event.split("\n")[:-1]
+
+
+def test_stream_content_is_assembled_until_done() -> None:
+    result = get_streamed_chat_completion_content(_lines(_events("hello world")), started=0.0)
+    assert result.content == "hello world" + "\n" * 5
+    assert result.early is False
+    assert result.ttft_s is not None
+
+
+def test_stream_stops_at_first_accepted_object() -> None:
+    lines = _lines(_events("```json\n" + _RESULT + "\n```"))
+    seen: list[str] = []
+
+    def accept(candidate: str) -> bool:
+        seen.append(candidate)
+        return True
+
+    result = get_streamed_chat_completion_content(lines, accept=accept)
+
+    assert result.early is True
+    assert seen == [_RESULT]
+    assert result.content.endswith("}")
+    # The trailing fence, whitespace deltas and [DONE] were never read.
+    assert sum(1 for _ in lines) > 0
+
+
+def test_stream_skips_objects_that_are_not_accepted() -> None:
+    text = 'Example: {"type": "oops"} Answer: ' + _RESULT
+    seen: list[str] = []
+
+    def accept(candidate: str) -> bool:
+        seen.append(candidate)
+        return candidate == _RESULT
+
+    result = get_streamed_chat_completion_content(_lines(_events(text, size=3)), accept=accept)
+
+    assert seen == ['{"type": "oops"}', _RESULT]
+    assert result.early is True
+
+
+def test_stream_error_event_raises() -> None:
+    lines = ['data: {"error": {"message": "overloaded"}}', ""]
+    with pytest.raises(ChatCompletionsError, match="overloaded"):
+        get_streamed_chat_completion_content(lines)
+
+
+def test_stream_without_content_raises() -> None:
+    with pytest.raises(ChatCompletionsError, match="empty content"):
+        get_streamed_chat_completion_content(["data: [DONE]", ""])
+
+
+class _SSEServer:
+    """Streams the reply in small events and records how many were sent."""
+
+    def __init__(self, *, statuses: list[int] | None = None) -> None:
+        self.events = _events(_RESULT)
+        self.sent = 0
+        self.payloads: list[dict[str, Any]] = []
+        self.statuses = statuses or []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.payloads.append(json.loads(request.content))
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers={"retry-after": "0"})
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=self._body()
+        )
+
+    def _body(self) -> Iterator[bytes]:
+        for event in self.events:
+            self.sent += 1
+            yield event.encode()
+
+
+class _AsyncSSEServer(_SSEServer):
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.payloads.append(json.loads(request.content))
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=self._abody()
+        )
+
+    async def _abody(self) -> AsyncIterator[bytes]:
+        for event in self.events:
+            self.sent += 1
+            yield event.encode()
+
+
+def _adapter(**kwargs: Any) -> OpenAICompatibleAdapter:
+    return OpenAICompatibleAdapter(
+        base_url="https://example.test", api_key="k", model="m", stream=True, **kwargs
+    )
+
+
+def _patch(monkeypatch: pytest.MonkeyPatch, handler: Any, name: str = "Client") -> None:
+    real = getattr(httpx, name)
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(httpx, name, lambda **kw: real(transport=transport, **kw))
+
+
+def test_streaming_adapter_closes_stream_after_valid_object(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server = _SSEServer()
+    _patch(monkeypatch, server)
+    adapter = _adapter()
+
+    result = adapter.triage(title="Crash", body="It crashes")
+
+    assert result.labels == ["crash"]
+    assert server.payloads[0]["stream"] is True
+    assert server.sent < len(server.events)
+    assert len(adapter.recent_ttft_s) == 1
+
+
+def test_streaming_adapter_retries_before_the_stream_starts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server = _SSEServer(statuses=[429])
+    _patch(monkeypatch, server)
+    adapter = _adapter(retry=RetryPolicy(max_retries=1))
+
+    assert adapter.triage(title="Crash", body="It crashes").type == "bug"
+    assert len(server.payloads) == 2
+
+
+def test_streaming_adapter_reports_http_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    _patch(monkeypatch, _SSEServer(statuses=[401]))
+    with pytest.raises(ChatCompletionsError, match="401"):
+        _adapter(retry=RetryPolicy(max_retries=0)).triage(title="Crash", body="It crashes")
+
+
+def test_async_streaming_adapter(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = _AsyncSSEServer()
+    _patch(monkeypatch, server, "AsyncClient")
+    adapter = _adapter()
+
+    async def run() -> str:
+        async with adapter:
+            return (await adapter.atriage(title="Crash", body="It crashes")).priority
+
+    assert asyncio.run(run()) == "p1"
+    assert server.sent < len(server.events)
+
+
+def test_stream_flag_does_not_change_cache_key() -> None:
+    streamed = _adapter()
+    plain = OpenAICompatibleAdapter(base_url="https://example.test", api_key="k", model="m")
+    assert streamed.cache_key(title="t", body="b") == plain.cache_key(title="t", body="b")
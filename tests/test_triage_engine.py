@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from triage_assistant.schema import IssueType, Priority, TriageOutput
+from triage_assistant.triage import TriageEngine
+
+
+class _CountingAdapter:
+    def __init__(self, delay_s: float = 0.0, error: Exception | None = None) -> None:
+        self.calls: list[tuple[str, str]] = []
+        self.delay_s = delay_s
+        self.error = error
+        self._lock = threading.Lock()
+
+    def _result(self, title: str, body: str) -> TriageOutput:
+        with self._lock:
+            self.calls.append((title, body))
+        if self.error is not None:
+            raise self.error
+        return TriageOutput(type=IssueType.bug, priority=Priority.p1, rationale=f"{title}/{body}")
+
+    def triage(self, *, title: str, body: str) -> TriageOutput:
+        time.sleep(self.delay_s)
+        return self._result(title, body)
+
+    async def atriage(self, *, title: str, body: str) -> TriageOutput:
+        await asyncio.sleep(self.delay_s)
+        return self._result(title, body)
+
+
+def test_memo_is_a_bounded_lru() -> None:
+    adapter = _CountingAdapter()
+    engine = TriageEngine(adapter, memo_size=2)
+
+    for title in ["a", "b", "a", "c", "a", "b"]:
+        assert engine.triage(title=title, body="x").rationale == f"{title}/x"
+
+    # "b" was evicted by "c" (the memo holds "a" and "c"), so it is fetched again.
+    assert [title for title, _ in adapter.calls] == ["a", "b", "c", "b"]
+
+
+def test_without_memo_or_single_flight_every_call_reaches_the_adapter() -> None:
+    adapter = _CountingAdapter()
+    engine = TriageEngine(adapter, single_flight=False)
+
+    engine.triage(title="a", body="x")
+    engine.triage(title="a", body="x")
+    assert len(adapter.calls) == 2
+
+
+def test_concurrent_identical_calls_share_one_adapter_call() -> None:
+    adapter = _CountingAdapter(delay_s=0.2)
+    engine = TriageEngine(adapter)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(engine.triage, title="a", body="x") for _ in range(5)]
+        results = [f.result() for f in futures]
+
+    assert len(adapter.calls) == 1
+    assert all(r == results[0] for r in results)
+
+    # Nothing is memoized by default: a later call asks the adapter again.
+    engine.triage(title="a", body="x")
+    assert len(adapter.calls) == 2
+
+
+def test_waiters_share_the_adapter_error() -> None:
+    adapter = _CountingAdapter(delay_s=0.2, error=RuntimeError("provider down"))
+    engine = TriageEngine(adapter)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(engine.triage, title="a", body="x") for _ in range(3)]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="provider down"):
+                f.result()
+    assert len(adapter.calls) == 1
+
+
+def test_async_single_flight_and_memo() -> None:
+    adapter = _CountingAdapter(delay_s=0.05)
+    engine = TriageEngine(adapter, memo_size=10)
+
+    async def run() -> list[TriageOutput]:
+        first = await asyncio.gather(
+            *(engine.atriage(title="a", body="x") for _ in range(5)),
+            engine.atriage(title="b", body="x"),
+        )
+        again = await engine.atriage(title="a", body="x")
+        return [*first, again]
+
+    results = asyncio.run(run())
+
+    assert sorted(adapter.calls) == [("a", "x"), ("b", "x")]
+    assert [r.rationale for r in results] == ["a/x"] * 5 + ["b/x", "a/x"]